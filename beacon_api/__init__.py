@@ -2,4 +2,7 @@ from .client import *
 from .table import *
 from .dataset import *
 from .query import *
-from .session import *
\ No newline at end of file
+from .session import *
+from .cache import *
+from .transfer import TransferResult
+from .catalog import CatalogRefresh, DatasetCatalog
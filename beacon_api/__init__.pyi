@@ -3,3 +3,6 @@ from .table import *
 from .dataset import *
 from .query import *
 from .session import *
+from .cache import *
+from .transfer import TransferResult as TransferResult
+from .catalog import CatalogRefresh as CatalogRefresh, DatasetCatalog as DatasetCatalog
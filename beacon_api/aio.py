@@ -0,0 +1,454 @@
+"""Asynchronous Beacon API client for asyncio applications.
+
+:class:`AsyncClient` mirrors the discovery and export helpers of
+:class:`~beacon_api.client.Client` on top of ``httpx.AsyncClient``, so web
+services can run Beacon queries without blocking the event loop or dedicating a
+thread to every request. Queries are built with the regular node classes:
+``AsyncDataTable.query()`` and ``AsyncDataset.query()`` return the same
+:class:`~beacon_api.query.JSONQuery` builder, which is then awaited through the
+client (``await client.to_parquet(query, "out.parquet")``).
+
+The module needs the optional ``httpx`` dependency::
+
+    pip install "beacon-api[async]"
+"""
+
+from __future__ import annotations
+import asyncio
+import contextlib
+import copy
+import io
+import os
+import tempfile
+from typing import Any, AsyncIterator, Literal, Optional, Union
+
+try:
+    import httpx
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError('The async client requires httpx; install it with `pip install "beacon-api[async]"`') from exc
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from packaging.version import Version
+
+from .client import _build_headers
+from .dataset import Dataset
+from .schema import parse_arrow_schema
+from .table import DataTable
+from .query import (
+    CSV,
+    Arrow,
+    BaseQuery,
+    GeoParquet,
+    JSONQuery,
+    NdNetCDF,
+    NetCDF,
+    Odv,
+    Output,
+    Parquet,
+    SQLQuery,
+    _rechunk_batches,
+)
+from .query._from import FromTable
+
+
+class AsyncBeaconSession:
+    """Asynchronous counterpart of :class:`~beacon_api.session.BaseBeaconSession`."""
+
+    def __init__(self, base_url: str, headers: dict[str, str] | None = None, timeout: Optional[float] = None, **client_kwargs: Any):
+        """Create the session; no request is sent until :meth:`connect` is awaited.
+
+        Args:
+            base_url: Base Beacon Node URL.
+            headers: Headers added to every request.
+            timeout: Optional request timeout in seconds. Defaults to no timeout, matching the sync client.
+            **client_kwargs: Extra keyword arguments for ``httpx.AsyncClient`` (e.g. ``limits``, ``http2``).
+        """
+        self.base_url = base_url.rstrip("/") + "/"
+        self.http = httpx.AsyncClient(base_url=self.base_url, headers=headers, timeout=timeout, **client_kwargs)
+        self.beacon_node_version: Version | None = None
+        self.server_info: dict | None = None
+
+    async def connect(self) -> None:
+        """Fetch the Beacon Node version."""
+        self.beacon_node_version = await self.fetch_version()
+
+    async def fetch_version(self) -> Version:
+        """Fetch the beacon node version from the server"""
+        response = await self.get("/api/info")
+        if response.status_code != 200:
+            raise Exception(f"Failed to get server info: {response.text}. Failed to connect to beacon node: {self.base_url}.")
+        self.server_info = response.json()
+        return Version(self.server_info['beacon_version'])
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.http.request(method, url.lstrip("/"), **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    def stream(self, method: str, url: str, **kwargs: Any):
+        """Open a streamed request; use as ``async with session.stream(...) as response``."""
+        return self.http.stream(method, url.lstrip("/"), **kwargs)
+
+    def version_at_least(self, major: int, minor: int = 0, patch: int = 0) -> bool:
+        """Check if the beacon node version is at least the specified version"""
+        if self.beacon_node_version is None:
+            raise Exception("The session is not connected; await AsyncClient.connect() first")
+        return self.beacon_node_version >= Version(f"{major}.{minor}.{patch}")
+
+    async def is_admin(self) -> bool:
+        """Check if the session has admin privileges"""
+        response = await self.get("/api/admin/check")
+        if response.status_code == 401:
+            return False
+        if response.status_code != 200:
+            raise Exception(f"Failed to check admin status: {response.text}")
+        return response.json().get("is_admin", False)
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+
+class AsyncDataTable:
+    """Asynchronous counterpart of :class:`~beacon_api.table.DataTable`.
+
+    Table metadata is fetched on first use; the query builders are shared with the sync class.
+    """
+
+    def __init__(self, http_session: AsyncBeaconSession, table_name: str):
+        self.http_session = http_session
+        self.table_name = table_name
+        self._config: dict | None = None
+
+    async def _table_config(self) -> dict:
+        if self._config is None:
+            response = await self.http_session.get("/api/table-config", params={"table_name": self.table_name})
+            if response.status_code != 200:
+                raise Exception(f"Failed to get table config: {response.text}")
+            self._config = response.json()
+        return self._config
+
+    async def get_table_type(self) -> Union[dict, str]:
+        """Get the type of the table"""
+        return (await self._table_config()).get("table_type", "unknown")
+
+    async def get_table_description(self) -> str:
+        """Get the description of the table"""
+        description = (await self._table_config()).get("description", None)
+        return description if description else "No description available"
+
+    async def get_table_schema_arrow(self) -> pa.Schema:
+        """Get the schema of the table in Arrow format"""
+        response = await self.http_session.get("/api/table-schema", params={"table_name": self.table_name})
+        if response.status_code != 200:
+            raise Exception(f"Failed to get table schema: {response.text}")
+        return parse_arrow_schema(response.json())
+
+    def query(self) -> JSONQuery:
+        """Create a new query for the selected table; execute it through :class:`AsyncClient`."""
+        return JSONQuery(self.http_session, _from=FromTable(self.table_name))  # type: ignore[arg-type]
+
+    subset = DataTable.subset
+
+
+class AsyncDataset(Dataset):
+    """Asynchronous counterpart of :class:`~beacon_api.dataset.Dataset`; only schema lookups touch the network."""
+
+    async def get_schema(self) -> pa.Schema:  # type: ignore[override]
+        """Fetch the dataset schema by calling the Beacon Node.
+
+        Raises:
+            RuntimeError: If the HTTP request fails.
+            ValueError: When the response body is not a JSON object.
+        """
+        response = await self.session.get("/api/dataset-schema", params={"file": self.file_path})
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to get dataset schema: {response.text}")
+
+        try:
+            schema_data = response.json()
+        except ValueError as exc:
+            raise ValueError("Dataset schema response was not valid JSON") from exc
+
+        if not isinstance(schema_data, dict):
+            raise ValueError("Dataset schema response must be a JSON object")
+
+        return parse_arrow_schema(schema_data)
+
+
+class _AsyncBodyReader(io.RawIOBase):
+    """Blocking file-like view over an async byte iterator.
+
+    Meant to be read from a worker thread (e.g. by ``pyarrow.ipc``) while the
+    event loop keeps running; every refill is scheduled back onto the loop.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self._chunks = chunks
+        self._loop = loop
+        self._buffer = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    async def _next_chunk(self) -> bytes:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+            if not chunk:
+                return 0
+            self._buffer = memoryview(chunk)
+        n = min(len(buffer), len(self._buffer))
+        buffer[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+class AsyncClient:
+    """Asynchronous Beacon API client.
+
+    Use it as an async context manager so the connection pool is closed::
+
+        async with AsyncClient("https://beacon.example.com") as client:
+            tables = await client.list_tables()
+            query = tables["default"].query().add_select_column("TEMP")
+            async with contextlib.aclosing(client.iter_batches(query)) as batches:
+                async for batch in batches:
+                    ...
+    """
+
+    def __init__(self, url: str, proxy_headers: dict[str, str] | None = None, jwt_token: str | None = None,
+                 basic_auth: tuple[str, str] | None = None, timeout: Optional[float] = None, **client_kwargs: Any):
+        """Create an async Beacon API client; await :meth:`connect` (or enter the context) before use.
+
+        Args:
+            url: Base Beacon Node URL, e.g. ``"https://beacon-node.example.com"``.
+            proxy_headers: Optional custom headers added to every request.
+            jwt_token: Optional bearer token used for ``Authorization`` header.
+            basic_auth: Optional ``(username, password)`` tuple for HTTP basic auth.
+            timeout: Optional request timeout in seconds. Defaults to no timeout.
+            **client_kwargs: Extra keyword arguments for ``httpx.AsyncClient``.
+
+        Raises:
+            ValueError: If ``basic_auth`` is not a 2-item tuple.
+        """
+        headers = _build_headers(proxy_headers, jwt_token, basic_auth)
+        self.session = AsyncBeaconSession(url, headers=headers, timeout=timeout, **client_kwargs)
+
+    async def connect(self) -> "AsyncClient":
+        """Fetch the server version and verify that the Beacon Node is healthy."""
+        await self.session.connect()
+        await self.check_status()
+        return self
+
+    async def __aenter__(self) -> "AsyncClient":
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self.session.aclose()
+
+    async def check_status(self) -> None:
+        """Verify that the Beacon Node responds to ``/api/health``."""
+        response = await self.session.get("/api/health")
+        if response.status_code != 200:
+            raise Exception(f"Failed to connect to server: {response.text}")
+
+    async def get_server_info(self, refresh: bool = False) -> dict:
+        """Return the server metadata exposed by ``/api/info``.
+
+        Args:
+            refresh: Fetch the metadata again instead of returning the copy from :meth:`connect`. Defaults to False.
+        """
+        if refresh or self.session.server_info is None:
+            self.session.beacon_node_version = await self.session.fetch_version()
+        return self.session.server_info  # type: ignore[return-value]
+
+    async def list_tables(self) -> dict[str, AsyncDataTable]:
+        """Retrieve all logical tables available on the Beacon Node."""
+        response = await self.session.get("/api/tables")
+        if response.status_code != 200:
+            raise Exception(f"Failed to get tables: {response.text}")
+        return {table: AsyncDataTable(self.session, table) for table in response.json()}
+
+    async def list_datasets(self, pattern: str | None = None, limit: int | None = None, offset: int | None = None, force=False) -> dict[str, AsyncDataset]:
+        """Enumerate datasets registered with the Beacon node.
+
+        Raises:
+            Exception: If the Beacon Node version < 1.4.0 or the HTTP call fails.
+        """
+        if not force and not self.session.version_at_least(1, 4, 0):
+            raise Exception("Listing datasets requires Beacon server version 1.4.0 or higher")
+
+        params = {key: value for key, value in {"pattern": pattern, "limit": limit, "offset": offset}.items() if value is not None}
+        response = await self.session.get("/api/list-datasets", params=params)
+        if response.status_code != 200:
+            raise Exception(f"Failed to get datasets: {response.text}")
+        return {
+            dataset['file_path']: AsyncDataset(http_session=self.session, file_path=dataset['file_path'], file_format=dataset['format'])  # type: ignore[arg-type]
+            for dataset in response.json()
+        }
+
+    def sql_query(self, sql: str) -> SQLQuery:
+        """Create a new :class:`SQLQuery`; execute it through this client."""
+        return SQLQuery(http_session=self.session, query=sql)  # type: ignore[arg-type]
+
+    async def execute(self, query: BaseQuery) -> httpx.Response:
+        """Run the query and return the fully read response."""
+        response = await self.session.post("/api/query", content=query.compile_query())
+        if response.status_code != 200:
+            raise Exception(f"Query failed: {response.text}")
+        if len(response.content) == 0:
+            raise Exception("Query returned no content")
+        return response
+
+    async def iter_batches(self, query: BaseQuery, max_rows: int = 65536, columns: Optional[list[str]] = None, force=False) -> AsyncIterator[pa.RecordBatch]:
+        """Execute the query and yield fixed-size Arrow record batches as they arrive.
+
+        Arrow decoding runs on a worker thread so the event loop stays responsive.
+        The request always asks for Arrow output; the output format of ``query``
+        is left untouched.
+
+        The response stays open until the generator finishes. A plain ``break``
+        out of ``async for`` does not finish it, so when stopping early wrap the
+        generator in :func:`contextlib.aclosing` (or await its ``aclose()``) to
+        release the connection right away.
+
+        Args:
+            query: The JSON or SQL query to run.
+            max_rows: Number of rows per yielded batch; only the last batch may be smaller. Defaults to 65536.
+            columns: Result columns to keep, in order. Defaults to all columns.
+            force: Skip the Beacon Node version check. Defaults to False.
+        """
+        if max_rows <= 0:
+            raise ValueError("max_rows must be a positive integer")
+
+        async with self._open_arrow_stream(query, force=force) as stream:
+            batches = _rechunk_batches((batch.select(columns) if columns else batch for batch in stream), max_rows)
+            while True:
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    break
+                yield batch
+
+    @contextlib.asynccontextmanager
+    async def _open_arrow_stream(self, query: BaseQuery, force=False) -> AsyncIterator[ipc.RecordBatchStreamReader]:
+        """Run a copy of the query with Arrow output and open an IPC reader on the streamed body."""
+        if not force and not self.session.version_at_least(1, 5, 0):
+            raise Exception("Streaming queries require the Beacon Node version to be atleast 1.5.0 or higher")
+
+        query = copy.copy(query)
+        query.set_output(Arrow())
+        async with self.session.stream("POST", "/api/query", content=query.compile_query()) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Query failed: {response.text}")
+
+            body = _AsyncBodyReader(response.aiter_bytes(), asyncio.get_running_loop())
+            yield await asyncio.to_thread(ipc.open_stream, body)
+
+    async def to_pandas_dataframe(self, query: BaseQuery, engine: Literal["parquet", "arrow"] = "parquet", dtype_backend: Literal["numpy", "pyarrow"] = "numpy", force=False):
+        """Execute the query and return the results as a pandas DataFrame.
+
+        The output format of ``query`` is left untouched. With the ``"parquet"``
+        engine the body is spooled to a temporary file and decoded from there;
+        ``"arrow"`` decodes the Arrow IPC stream as it arrives (requires Beacon
+        Node >= 1.5.0). Neither keeps the raw response body in memory.
+
+        Args:
+            query: The JSON or SQL query to run.
+            engine: ``"parquet"`` or ``"arrow"``. Defaults to ``"parquet"``.
+            dtype_backend: ``"pyarrow"`` backs the columns with ``pd.ArrowDtype`` instead of numpy dtypes. Defaults to ``"numpy"``.
+            force: Skip the Beacon Node version check of the ``"arrow"`` engine. Defaults to False.
+        """
+        if dtype_backend not in ("numpy", "pyarrow"):
+            raise ValueError(f"Unsupported dtype_backend '{dtype_backend}'. Supported backends: numpy, pyarrow")
+
+        if engine == "parquet":
+            import pyarrow.parquet as pq
+
+            fd, path = tempfile.mkstemp(suffix=".parquet")
+            os.close(fd)
+            try:
+                await self._stream_to_file(query, Parquet(), path, 1024*1024)
+                table = await asyncio.to_thread(pq.read_table, path)
+            finally:
+                os.remove(path)
+        elif engine == "arrow":
+            async with self._open_arrow_stream(query, force=force) as stream:
+                table = await asyncio.to_thread(stream.read_all)
+        else:
+            raise ValueError(f"Unsupported engine '{engine}'. Supported engines: arrow, parquet")
+
+        if dtype_backend == "pyarrow":
+            import pandas as pd
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    async def _stream_to_file(self, query: BaseQuery, output: Output, file_path: str, streaming_chunk_size: int) -> None:
+        """Execute a copy of the query with ``output`` and write the response body to ``file_path`` chunk by chunk."""
+        query = copy.copy(query)
+        query.set_output(output)
+        async with self.session.stream("POST", "/api/query", content=query.compile_query()) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Query failed: {response.text}")
+
+            chunks = response.aiter_bytes(chunk_size=streaming_chunk_size)
+            # Peek at the first chunk so an empty result is rejected before the file is created
+            first_chunk = await anext(chunks, b"")
+            if not first_chunk:
+                raise Exception("Query returned no content")
+            f = await asyncio.to_thread(open, file_path, "wb")
+            try:
+                await asyncio.to_thread(f.write, first_chunk)
+                async for chunk in chunks:
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+
+    async def to_parquet(self, query: BaseQuery, file_path: str, streaming_chunk_size: int = 1024*1024) -> None:
+        """Execute the query and save the results as a Parquet file."""
+        await self._stream_to_file(query, Parquet(), file_path, streaming_chunk_size)
+
+    async def to_geoparquet(self, query: BaseQuery, file_path: str, longitude_column: str, latitude_column: str, streaming_chunk_size: int = 1024*1024) -> None:
+        """Execute the query and save the results as a GeoParquet file."""
+        await self._stream_to_file(query, GeoParquet(longitude_column=longitude_column, latitude_column=latitude_column), file_path, streaming_chunk_size)
+
+    async def to_csv(self, query: BaseQuery, file_path: str, streaming_chunk_size: int = 1024*1024) -> None:
+        """Execute the query and save the results as a CSV file."""
+        await self._stream_to_file(query, CSV(), file_path, streaming_chunk_size)
+
+    async def to_arrow(self, query: BaseQuery, file_path: str, streaming_chunk_size: int = 1024*1024) -> None:
+        """Execute the query and save the results as an Arrow file."""
+        await self._stream_to_file(query, Arrow(), file_path, streaming_chunk_size)
+
+    async def to_netcdf(self, query: BaseQuery, file_path: str, streaming_chunk_size: int = 1024*1024) -> None:
+        """Execute the query and save the server-built NetCDF file."""
+        await self._stream_to_file(query, NetCDF(), file_path, streaming_chunk_size)
+
+    async def to_nd_netcdf(self, query: BaseQuery, file_path: str, dimension_columns: list[str], streaming_chunk_size: int = 1024*1024, force: bool = False) -> None:
+        """Execute the query and save the results as an NdNetCDF file."""
+        if not force and not self.session.version_at_least(1, 5, 0):
+            raise Exception("NdNetCDF output format requires the Beacon Node version to be atleast 1.5.0 or higher")
+        await self._stream_to_file(query, NdNetCDF(dimension_columns=dimension_columns), file_path, streaming_chunk_size)
+
+    async def to_odv(self, query: BaseQuery, odv_output: Odv, file_path: str, streaming_chunk_size: int = 1024*1024) -> None:
+        """Exports the query results to an ODV file."""
+        await self._stream_to_file(query, odv_output, file_path, streaming_chunk_size)
@@ -0,0 +1,68 @@
+import asyncio
+import httpx
+import io
+import pandas as pd
+import pyarrow as pa
+from .dataset import Dataset as Dataset
+from .query import BaseQuery as BaseQuery, JSONQuery as JSONQuery, Odv as Odv, Output as Output, SQLQuery as SQLQuery
+from _typeshed import Incomplete
+from packaging.version import Version
+from typing import Any, AsyncIterator, Callable, Literal
+
+class AsyncBeaconSession:
+    base_url: str
+    http: httpx.AsyncClient
+    beacon_node_version: Version | None
+    server_info: dict | None
+    def __init__(self, base_url: str, headers: dict[str, str] | None = None, timeout: float | None = None, **client_kwargs: Any) -> None: ...
+    async def connect(self) -> None: ...
+    async def fetch_version(self) -> Version: ...
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response: ...
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response: ...
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response: ...
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response: ...
+    def stream(self, method: str, url: str, **kwargs: Any): ...
+    def version_at_least(self, major: int, minor: int = 0, patch: int = 0) -> bool: ...
+    async def is_admin(self) -> bool: ...
+    async def aclose(self) -> None: ...
+
+class AsyncDataTable:
+    http_session: AsyncBeaconSession
+    table_name: str
+    def __init__(self, http_session: AsyncBeaconSession, table_name: str) -> None: ...
+    async def get_table_type(self) -> dict | str: ...
+    async def get_table_description(self) -> str: ...
+    async def get_table_schema_arrow(self) -> pa.Schema: ...
+    def query(self) -> JSONQuery: ...
+    subset: Callable[..., JSONQuery]
+
+class AsyncDataset(Dataset):
+    async def get_schema(self) -> pa.Schema: ...  # type: ignore[override]
+
+class _AsyncBodyReader(io.RawIOBase):
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop) -> None: ...
+    def readable(self) -> bool: ...
+    def readinto(self, buffer) -> int: ...
+
+class AsyncClient:
+    session: AsyncBeaconSession
+    def __init__(self, url: str, proxy_headers: dict[str, str] | None = None, jwt_token: str | None = None, basic_auth: tuple[str, str] | None = None, timeout: float | None = None, **client_kwargs: Any) -> None: ...
+    async def connect(self) -> AsyncClient: ...
+    async def __aenter__(self) -> AsyncClient: ...
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
+    async def aclose(self) -> None: ...
+    async def check_status(self) -> None: ...
+    async def get_server_info(self, refresh: bool = False) -> dict: ...
+    async def list_tables(self) -> dict[str, AsyncDataTable]: ...
+    async def list_datasets(self, pattern: str | None = None, limit: int | None = None, offset: int | None = None, force: bool = False) -> dict[str, AsyncDataset]: ...
+    def sql_query(self, sql: str) -> SQLQuery: ...
+    async def execute(self, query: BaseQuery) -> httpx.Response: ...
+    def iter_batches(self, query: BaseQuery, max_rows: int = 65536, columns: list[str] | None = None, force: bool = False) -> AsyncIterator[pa.RecordBatch]: ...
+    async def to_pandas_dataframe(self, query: BaseQuery, engine: Literal["parquet", "arrow"] = "parquet", dtype_backend: Literal["numpy", "pyarrow"] = "numpy", force: bool = False) -> pd.DataFrame: ...
+    async def to_parquet(self, query: BaseQuery, file_path: str, streaming_chunk_size: int = ...) -> None: ...
+    async def to_geoparquet(self, query: BaseQuery, file_path: str, longitude_column: str, latitude_column: str, streaming_chunk_size: int = ...) -> None: ...
+    async def to_csv(self, query: BaseQuery, file_path: str, streaming_chunk_size: int = ...) -> None: ...
+    async def to_arrow(self, query: BaseQuery, file_path: str, streaming_chunk_size: int = ...) -> None: ...
+    async def to_netcdf(self, query: BaseQuery, file_path: str, streaming_chunk_size: int = ...) -> None: ...
+    async def to_nd_netcdf(self, query: BaseQuery, file_path: str, dimension_columns: list[str], streaming_chunk_size: int = ..., force: bool = False) -> None: ...
+    async def to_odv(self, query: BaseQuery, odv_output: Odv, file_path: str, streaming_chunk_size: int = ...) -> None: ...
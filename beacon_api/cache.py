@@ -0,0 +1,571 @@
+"""Opt-in client-side caches for Beacon query results.
+
+:class:`QueryCache` keeps the raw response bodies produced by the Beacon Node
+(Parquet, Arrow, CSV, NetCDF, ...) in a local directory. Entries are keyed on
+the compiled query, which includes the requested output format, and the server
+version, so an upgraded node never serves stale encodings. The cache is bounded
+by a byte budget with least-recently-used eviction and optional time-to-live.
+
+:class:`ContainmentCache` keeps recent JSON query results in memory as Arrow
+tables and answers narrower queries over the same source locally.
+"""
+
+from __future__ import annotations
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from .query import JSONQuery
+
+
+def default_cache_dir() -> str:
+    """Return the base directory for on-disk caches.
+
+    Uses ``$BEACON_API_CACHE_DIR`` when set, otherwise ``$XDG_CACHE_HOME/beacon_api``
+    (``~/.cache/beacon_api`` by default).
+    """
+    override = os.environ.get("BEACON_API_CACHE_DIR")
+    if override:
+        return override
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg_cache, "beacon_api")
+
+
+def _server_info_path(url: str, directory: Optional[str] = None) -> str:
+    digest = hashlib.sha256(url.rstrip("/").encode("utf-8")).hexdigest()
+    return os.path.join(directory or os.path.join(default_cache_dir(), "server_info"), f"{digest}.json")
+
+
+def load_server_info(url: str, ttl: float, directory: Optional[str] = None) -> Optional[dict]:
+    """Return the ``/api/info`` payload cached for ``url`` if it is younger than ``ttl`` seconds.
+
+    Args:
+        url: Base Beacon Node URL the info was fetched from.
+        ttl: Maximum age of the cached payload in seconds.
+        directory: Cache directory. Defaults to ``server_info`` under :func:`default_cache_dir`.
+    """
+    path = _server_info_path(url, directory)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return info if isinstance(info, dict) and "beacon_version" in info else None
+
+
+def save_server_info(url: str, info: dict, directory: Optional[str] = None) -> None:
+    """Persist the ``/api/info`` payload of ``url`` for :func:`load_server_info`; failures are ignored."""
+    path = _server_info_path(url, directory)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only or full cache directory must never break client construction
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@dataclass
+class CacheStats:
+    """Counters describing the activity and footprint of a :class:`QueryCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class QueryCache:
+    """Persistent on-disk cache of query result bodies with LRU eviction.
+
+    Attach it to a client with ``Client(url, result_cache=QueryCache())``; every
+    ``to_*`` exporter, ``iter_batches`` and ``to_pandas_dataframe`` then serves
+    identical queries from disk instead of re-running them on the server.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 10 * 2**30, ttl: Optional[float] = None):
+        """Create (or reopen) a result cache.
+
+        Args:
+            directory: Directory holding the cached bodies. Defaults to ``results`` under :func:`default_cache_dir`.
+            max_bytes: Total size budget; least recently used entries are evicted beyond it. Defaults to 10 GiB.
+            ttl: Optional lifetime of an entry in seconds. Defaults to no expiry.
+        """
+        self.directory = directory or os.path.join(default_cache_dir(), "results")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(query_body: str, server_version: object) -> str:
+        """Return the cache key for a compiled query body on a given server version."""
+        digest = hashlib.sha256()
+        digest.update(str(server_version).encode())
+        digest.update(b"\0")
+        digest.update(query_body.encode())
+        return digest.hexdigest()
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.body")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the path of the cached body for ``key``, or ``None`` on a miss.
+
+        A hit refreshes the entry's position in the LRU order.
+        """
+        body_path = self._body_path(key)
+        try:
+            with open(self._meta_path(key)) as f:
+                metadata = json.load(f)
+            expired = self.ttl is not None and time.time() - metadata["created_at"] > self.ttl
+            if expired:
+                self._remove(key)
+            else:
+                # The body's mtime doubles as the last access time for LRU eviction
+                os.utime(body_path)
+                with self._lock:
+                    self._stats.hits += 1
+                return body_path
+        except (OSError, ValueError, KeyError):
+            pass
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    def writer(self, key: str, query_body: str) -> "CacheEntryWriter":
+        """Start writing the body of a new entry; it becomes visible once committed."""
+        return CacheEntryWriter(self, key, query_body)
+
+    def put(self, key: str, query_body: str, content: bytes) -> None:
+        """Store a fully buffered body."""
+        with self.writer(key, query_body) as entry:
+            entry.write(content)
+
+    def _commit(self, key: str, tmp_path: str, query_body: str, size: int) -> None:
+        os.replace(tmp_path, self._body_path(key))
+        meta_tmp_path = f"{self._meta_path(key)}.{uuid.uuid4().hex}.tmp"
+        with open(meta_tmp_path, "w") as f:
+            json.dump({"created_at": time.time(), "size": size, "query": query_body}, f)
+        os.replace(meta_tmp_path, self._meta_path(key))
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        for path in (self._meta_path(key), self._body_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """Return ``(last_access, size, key)`` for every committed entry."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".body"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.name[: -len(".body")]))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            with self._lock:
+                self._stats.evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss counters of this process and the current size of the cache."""
+        entries = self._entries()
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(entries),
+                size_bytes=sum(size for _, size, _ in entries),
+            )
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for _, _, key in self._entries():
+            self._remove(key)
+
+
+class CacheEntryWriter:
+    """Incrementally written cache entry; committed on a clean exit, discarded otherwise."""
+
+    def __init__(self, cache: QueryCache, key: str, query_body: str):
+        self.cache = cache
+        self.key = key
+        self.query_body = query_body
+        self.size = 0
+        self._tmp_path = os.path.join(cache.directory, f"{key}.{uuid.uuid4().hex}.tmp")
+        self._file: Optional[io.BufferedWriter] = open(self._tmp_path, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        assert self._file is not None, "cache entry already finished"
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self.cache._commit(self.key, self._tmp_path, self.query_body, self.size)
+
+    def discard(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "CacheEntryWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+class CachingReader(io.RawIOBase):
+    """Readable stream that copies everything it reads into a cache entry.
+
+    The entry is committed when the underlying stream reaches EOF and discarded
+    if the reader is closed before that, e.g. when a consumer stops early.
+    """
+
+    _TAIL_BYTES = 64 * 1024
+
+    def __init__(self, raw: io.IOBase, entry: CacheEntryWriter, on_close=None):
+        super().__init__()
+        self._raw = raw
+        self._entry = entry
+        self._on_close = on_close
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._raw.read(len(buffer))
+        if not data:
+            self._entry.commit()
+            return 0
+        buffer[: len(data)] = data
+        self._entry.write(data)
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            # Readers such as Arrow stop at the end-of-stream marker without observing
+            # EOF, so drain a small tail to tell a complete body from an abandoned one
+            tail = self._raw.read(self._TAIL_BYTES)
+            if tail:
+                self._entry.write(tail)
+            if self._raw.read(1) == b"":
+                self._entry.commit()
+            self._entry.discard()
+            if self._on_close is not None:
+                self._on_close()
+        super().close()
+
+
+class ContainmentCache:
+    """In-memory cache that answers narrower JSON queries from cached superset results.
+
+    A cached result can serve a new :class:`~beacon_api.query.JSONQuery` when both
+    read the same source with the same selects, and the new filters narrow the
+    cached ones: tighter ``RangeFilter``/``ExclusiveRangeFilter`` bounds, an
+    ``EqualsFilter`` inside a cached range, or a smaller bounding box. On a hit the
+    new filter tree is evaluated locally with ``pyarrow.compute`` instead of
+    issuing another request.
+
+    Results are stored by the materializing helpers (``to_pandas_dataframe``,
+    ``execute_partitioned``, ``to_dask_dataframe`` partitions); ``iter_batches``
+    reads from the cache but never fills it, to keep its memory use constant.
+    """
+
+    def __init__(self, max_bytes: int = 2 * 2**30):
+        """Create an empty containment cache.
+
+        Args:
+            max_bytes: Memory budget for cached Arrow tables; least recently used tables are dropped beyond it. Defaults to 2 GiB.
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, tuple[JSONQuery, pa.Table]]" = OrderedDict()
+        self._next_id = 0
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @staticmethod
+    def _same_shape(cached: "JSONQuery", query: "JSONQuery") -> bool:
+        """Whether ``query`` reads the same rows and columns as ``cached`` before filtering"""
+        return (
+            cached._from == query._from
+            and cached.selects == query.selects
+            and (not query.sorts or cached.sorts == query.sorts)
+        )
+
+    def lookup(self, query: "JSONQuery") -> Optional["pa.Table"]:
+        """Return the result of ``query`` evaluated against a cached superset, or ``None`` on a miss."""
+        import pyarrow as pa
+        from .query._local import UnsupportedFilter, filter_columns, filter_table, implies
+
+        candidates = []
+        if query.distinct is None:
+            try:
+                columns = filter_columns(query.filters)
+            except UnsupportedFilter:
+                columns = None
+            if columns is not None:
+                with self._lock:
+                    candidates = list(reversed(self._entries.items()))
+
+        for entry_id, (cached, table) in candidates:
+            if not self._same_shape(cached, query) or not columns.issubset(table.column_names):
+                continue
+            if not implies(query.filters, cached.filters):
+                continue
+            try:
+                result = filter_table(table, query.filters)
+            except (UnsupportedFilter, pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                continue
+            if query.offset or query.limit is not None:
+                offset = query.offset or 0
+                length = query.limit if query.limit is not None else result.num_rows
+                result = result.slice(offset, length)
+            with self._lock:
+                if entry_id in self._entries:
+                    self._entries.move_to_end(entry_id)
+                self._stats.hits += 1
+            return result
+
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    def store(self, query: "JSONQuery", table: "pa.Table") -> None:
+        """Cache the complete result of ``query``; truncated or deduplicated results are ignored."""
+        if query.limit is not None or query.offset is not None or query.distinct is not None:
+            return
+        nbytes = table.nbytes
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            self._entries[self._next_id] = (query._copy(), table)
+            self._next_id += 1
+            self._size_bytes += nbytes
+            while self._size_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted.nbytes
+                self._stats.evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss counters and the current footprint of the cache."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop every cached table."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+
+class SchemaCache:
+    """Cache of table and dataset schemas shared by :class:`~beacon_api.table.DataTable` and :class:`~beacon_api.dataset.Dataset`.
+
+    Attach it with ``Client(url, schema_cache=SchemaCache())``. Schemas are keyed
+    on the node URL and the table name or dataset path. A fresh entry is served
+    without a request. Once ``ttl`` has passed, the entry is revalidated with
+    ``If-None-Match`` when the server sent an ``ETag``; a ``304 Not Modified``
+    answer renews the entry without parsing the schema again. With a
+    ``directory`` the entries also survive process restarts.
+    """
+
+    def __init__(self, ttl: Optional[float] = 300, directory: Optional[str] = None, revalidate: bool = True):
+        """Create a schema cache.
+
+        Args:
+            ttl: Seconds an entry is served without contacting the server; ``None`` never expires. Defaults to 300.
+            directory: Optional directory that persists entries across processes, e.g.
+                ``os.path.join(default_cache_dir(), "schemas")``. Defaults to memory only.
+            revalidate: Send ``If-None-Match`` for expired entries that carry an ``ETag``. Defaults to True.
+        """
+        self.ttl = ttl
+        self.directory = directory
+        self.revalidate = revalidate
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._entries: dict[str, tuple["pa.Schema", Optional[str], float]] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(base_url: str, endpoint: str, params: dict) -> str:
+        """Return the cache key of a schema request."""
+        return json.dumps([base_url, endpoint.lstrip("/"), sorted(params.items())])
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json")  # type: ignore[arg-type]
+
+    def _load(self, key: str) -> Optional[tuple["pa.Schema", Optional[str], float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None or self.directory is None:
+            return entry
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        try:
+            with open(self._path(key)) as f:
+                data = json.load(f)
+            schema = ipc.read_schema(pa.py_buffer(bytes.fromhex(data["schema"])))
+            entry = (schema, data["etag"], data["validated_at"])
+        except (OSError, ValueError, KeyError, pa.ArrowInvalid):
+            return None
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def _store(self, key: str, schema: "pa.Schema", etag: Optional[str]) -> None:
+        entry = (schema, etag, time.time())
+        with self._lock:
+            self._entries[key] = entry
+        if self.directory is None:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"schema": schema.serialize().to_pybytes().hex(), "etag": etag, "validated_at": entry[2]}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def fetch(self, session, endpoint: str, params: dict, parse: Callable[[Any], "pa.Schema"]) -> "pa.Schema":
+        """Return the schema served by ``endpoint``, from the cache when possible.
+
+        Args:
+            session: The session used to (re)validate the entry.
+            endpoint: The schema endpoint, e.g. ``"/api/table-schema"``.
+            params: Query parameters identifying the table or dataset.
+            parse: Turns a schema response into a ``pyarrow.Schema``, raising on failures.
+        """
+        key = self.key(session.base_url, endpoint, params)
+        entry = self._load(key)
+        if entry is not None:
+            schema, etag, validated_at = entry
+            if self.ttl is None or time.time() - validated_at <= self.ttl:
+                with self._lock:
+                    self._stats.hits += 1
+                return schema
+            if self.revalidate and etag:
+                response = session.get(endpoint, params=params, headers={"If-None-Match": etag})
+                if response.status_code == 304:
+                    self._store(key, schema, etag)
+                    with self._lock:
+                        self._stats.hits += 1
+                    return schema
+            else:
+                response = session.get(endpoint, params=params)
+        else:
+            response = session.get(endpoint, params=params)
+
+        with self._lock:
+            self._stats.misses += 1
+        schema = parse(response)
+        self._store(key, schema, response.headers.get("ETag"))
+        return schema
+
+    def invalidate(self, base_url: str, endpoint: str, params: dict) -> None:
+        """Forget the schema of a single table or dataset."""
+        key = self.key(base_url, endpoint, params)
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.directory is not None:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss counters and the number of schemas held in memory."""
+        with self._lock:
+            return CacheStats(hits=self._stats.hits, misses=self._stats.misses, entries=len(self._entries))
+
+    def clear(self) -> None:
+        """Drop every cached schema, including the on-disk copies."""
+        with self._lock:
+            self._entries.clear()
+        if self.directory is not None:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        os.remove(entry.path)
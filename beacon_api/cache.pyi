@@ -0,0 +1,70 @@
+import io
+import pyarrow as pa
+from .query import JSONQuery
+from dataclasses import dataclass
+from typing import Any, Callable
+
+def default_cache_dir() -> str: ...
+def load_server_info(url: str, ttl: float, directory: str | None = None) -> dict | None: ...
+def save_server_info(url: str, info: dict, directory: str | None = None) -> None: ...
+
+@dataclass
+class CacheStats:
+    hits: int = ...
+    misses: int = ...
+    evictions: int = ...
+    entries: int = ...
+    size_bytes: int = ...
+    @property
+    def hit_rate(self) -> float: ...
+
+class QueryCache:
+    directory: str
+    max_bytes: int
+    ttl: float | None
+    def __init__(self, directory: str | None = None, max_bytes: int = ..., ttl: float | None = None) -> None: ...
+    @staticmethod
+    def key(query_body: str, server_version: object) -> str: ...
+    def get(self, key: str) -> str | None: ...
+    def writer(self, key: str, query_body: str) -> CacheEntryWriter: ...
+    def put(self, key: str, query_body: str, content: bytes) -> None: ...
+    def stats(self) -> CacheStats: ...
+    def clear(self) -> None: ...
+
+class CacheEntryWriter:
+    cache: QueryCache
+    key: str
+    query_body: str
+    size: int
+    def __init__(self, cache: QueryCache, key: str, query_body: str) -> None: ...
+    def write(self, chunk: bytes) -> None: ...
+    def commit(self) -> None: ...
+    def discard(self) -> None: ...
+    def __enter__(self) -> CacheEntryWriter: ...
+    def __exit__(self, exc_type, exc, tb) -> None: ...
+
+class CachingReader(io.RawIOBase):
+    def __init__(self, raw: io.IOBase, entry: CacheEntryWriter, on_close=None) -> None: ...
+    def readable(self) -> bool: ...
+    def readinto(self, buffer) -> int: ...
+    def close(self) -> None: ...
+
+class ContainmentCache:
+    max_bytes: int
+    def __init__(self, max_bytes: int = ...) -> None: ...
+    def lookup(self, query: JSONQuery) -> pa.Table | None: ...
+    def store(self, query: JSONQuery, table: pa.Table) -> None: ...
+    def stats(self) -> CacheStats: ...
+    def clear(self) -> None: ...
+
+class SchemaCache:
+    ttl: float | None
+    directory: str | None
+    revalidate: bool
+    def __init__(self, ttl: float | None = 300, directory: str | None = None, revalidate: bool = True) -> None: ...
+    @staticmethod
+    def key(base_url: str, endpoint: str, params: dict) -> str: ...
+    def fetch(self, session, endpoint: str, params: dict, parse: Callable[[Any], pa.Schema]) -> pa.Schema: ...
+    def invalidate(self, base_url: str, endpoint: str, params: dict) -> None: ...
+    def stats(self) -> CacheStats: ...
+    def clear(self) -> None: ...
@@ -0,0 +1,248 @@
+"""Locally persisted index of the datasets on a Beacon Node and their columns.
+
+Answering "which datasets contain column X" against the node means one
+``/api/dataset-schema`` request per file. :class:`DatasetCatalog` does that work
+once: it lists the datasets, fetches their schemas concurrently and stores path,
+format, column names and types and a schema fingerprint in a Parquet file.
+Later refreshes only fetch schemas of new datasets; a full refresh fetches every
+schema and compares fingerprints to tell changed datasets from unchanged ones.
+Lookups are served from an in-memory column index.
+"""
+
+from __future__ import annotations
+import fnmatch
+import functools
+import hashlib
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+import pyarrow as pa
+
+from .cache import default_cache_dir
+from .dataset import Dataset, dataset_from
+from .query import JSONQuery
+from .query import _parallel
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SCHEMA = pa.schema([
+    ("file_path", pa.string()),
+    ("format", pa.string()),
+    ("column_names", pa.list_(pa.string())),
+    ("column_types", pa.list_(pa.string())),
+    ("fingerprint", pa.string()),
+    ("error", pa.string()),
+])
+
+
+def schema_fingerprint(schema: pa.Schema) -> str:
+    """Return a short digest of the column names and types of ``schema``, independent of metadata."""
+    digest = hashlib.sha256()
+    for field in schema:
+        digest.update(f"{field.name}\0{field.type}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class CatalogRefresh:
+    """Summary of a :meth:`DatasetCatalog.refresh` run."""
+
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+
+class DatasetCatalog:
+    """Parquet-backed index of dataset paths, formats and columns for one Beacon Node.
+
+    Build or update it with :meth:`refresh`, then look datasets up with
+    :meth:`find` or query all matches at once with :meth:`query`.
+    """
+
+    def __init__(self, client: "Client", path: Optional[str] = None):
+        """Open the catalog of ``client``'s node, loading an existing index from disk.
+
+        Args:
+            client: Client connected to the Beacon Node.
+            path: Parquet file holding the index. Defaults to a file per node URL under
+                ``catalog`` in :func:`~beacon_api.cache.default_cache_dir`.
+        """
+        self.client = client
+        if path is None:
+            node = hashlib.sha256(client.session.base_url.encode()).hexdigest()[:16]
+            path = os.path.join(default_cache_dir(), "catalog", f"{node}.parquet")
+        self.path = path
+        self._table = CATALOG_SCHEMA.empty_table()
+        if os.path.exists(path):
+            from pyarrow import parquet as pq
+            self._table = pq.read_table(path, schema=CATALOG_SCHEMA)
+        self._index: Optional[dict[str, list[int]]] = None
+
+    @property
+    def table(self) -> pa.Table:
+        """The full index as an Arrow table."""
+        return self._table
+
+    def __len__(self) -> int:
+        return self._table.num_rows
+
+    def _fetch_entry(self, file_path: str, file_format: str) -> dict[str, Any]:
+        """Fetch one dataset schema and turn it into an index row"""
+        row: dict[str, Any] = {"file_path": file_path, "format": file_format, "column_names": None, "column_types": None, "fingerprint": None, "error": None}
+        try:
+            schema = Dataset(self.client.session, file_path, file_format).get_schema()  # type: ignore[arg-type]
+        except Exception as exc:
+            row["error"] = str(exc)
+            return row
+        row["column_names"] = schema.names
+        row["column_types"] = [str(field.type) for field in schema]
+        row["fingerprint"] = schema_fingerprint(schema)
+        return row
+
+    def refresh(self, pattern: Optional[str] = None, page_size: int = 1000, max_workers: int = 8, full: bool = False) -> CatalogRefresh:
+        """Bring the index up to date with the datasets listed by the node and save it.
+
+        Only datasets that are new, changed format or failed before are fetched,
+        unless ``full`` is set. The listing carries no modification time, so a
+        schema that changed in place is only noticed by a ``full`` refresh: it
+        fetches every schema again and compares its fingerprint with the indexed
+        one. Datasets no longer listed are dropped; with a ``pattern`` this only
+        applies to indexed paths matching it.
+
+        Args:
+            pattern: Optional glob-like filter applied by the server.
+            page_size: Number of datasets listed per request. Defaults to 1000.
+            max_workers: Number of concurrent schema requests. Defaults to 8.
+            full: Fetch every schema again and re-index those whose fingerprint changed. Defaults to False.
+
+        Returns:
+            CatalogRefresh: Counts of added, removed, changed, unchanged and failed datasets.
+        """
+        listing = self.client.iter_datasets(pattern=pattern, page_size=page_size, as_arrow=True)
+        listed = dict(zip(listing["file_path"].to_pylist(), listing["format"].to_pylist()))
+
+        existing = self._table.to_pylist()
+        in_scope = (lambda p: True) if pattern is None else (lambda p: fnmatch.fnmatchcase(p, pattern))
+        summary = CatalogRefresh()
+        kept = []
+        # Indexed entries that are fetched again, to tell changed schemas from unchanged ones
+        previous: dict[str, dict[str, Any]] = {}
+        for row in existing:
+            path = row["file_path"]
+            if path not in listed:
+                if in_scope(path):
+                    summary.removed += 1
+                    continue
+                kept.append(row)
+            elif not full and row["error"] is None and row["format"] == listed[path]:
+                kept.append(row)
+                summary.unchanged += 1
+            elif row["error"] is None:
+                previous[path] = row
+        known = {row["file_path"] for row in kept}
+
+        pending = [(path, file_format) for path, file_format in listed.items() if path not in known]
+        if pending:
+            tasks = (functools.partial(self._fetch_entry, path, file_format) for path, file_format in pending)
+            for row in _parallel.iter_in_order(tasks, max_workers):
+                old = previous.get(row["file_path"])
+                if row["error"] is not None:
+                    summary.failed += 1
+                    logger.warning("Failed to index %s: %s", row["file_path"], row["error"])
+                elif old is None:
+                    summary.added += 1
+                elif old["fingerprint"] == row["fingerprint"] and old["format"] == row["format"]:
+                    summary.unchanged += 1
+                else:
+                    summary.changed += 1
+                    logger.info("Schema of %s changed; re-indexed", row["file_path"])
+                kept.append(row)
+
+        kept.sort(key=lambda row: row["file_path"])
+        self._table = pa.Table.from_pylist(kept, schema=CATALOG_SCHEMA)
+        self._index = None
+        self.save()
+        return summary
+
+    def save(self) -> None:
+        """Write the index to :attr:`path` atomically."""
+        from pyarrow import parquet as pq
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        try:
+            pq.write_table(self._table, tmp_path)
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _column_index(self) -> dict[str, list[int]]:
+        """Map every column name to the rows of the datasets containing it"""
+        if self._index is None:
+            index: dict[str, list[int]] = {}
+            for row, names in enumerate(self._table["column_names"].to_pylist()):
+                for name in names or ():
+                    index.setdefault(name, []).append(row)
+            self._index = index
+        return self._index
+
+    def find(self, columns: Sequence[str] | str | None = None, file_format: Optional[str] = None, pattern: Optional[str] = None) -> pa.Table:
+        """Return the index rows of datasets matching every given criterion.
+
+        Args:
+            columns: Column name, or names that must all be present.
+            file_format: Only datasets of this format.
+            pattern: Only paths matching this ``fnmatch`` pattern.
+
+        Returns:
+            pa.Table: Matching rows, with the same columns as :attr:`table`.
+        """
+        if isinstance(columns, str):
+            columns = [columns]
+        if columns:
+            index = self._column_index()
+            rows = set(index.get(columns[0], ()))
+            for column in columns[1:]:
+                rows &= set(index.get(column, ()))
+            matches = self._table.take(sorted(rows))
+        else:
+            matches = self._table
+        if file_format is not None:
+            import pyarrow.compute as pc
+            matches = matches.filter(pc.equal(pc.utf8_lower(matches["format"]), file_format.lower()))
+        if pattern is not None:
+            keep = [fnmatch.fnmatchcase(path, pattern) for path in matches["file_path"].to_pylist()]
+            matches = matches.filter(pa.array(keep, type=pa.bool_()))
+        return matches
+
+    def query(self, columns: Sequence[str] | str, file_format: Optional[str] = None, pattern: Optional[str] = None, **options: Any) -> JSONQuery:
+        """Build a single :class:`~beacon_api.query.JSONQuery` over every dataset containing ``columns``.
+
+        The matching paths are scanned by one ``From*Dataset`` node, e.g.
+        ``FromParquetDataset(paths=[...])``.
+
+        Args:
+            columns: Column name, or names that must all be present.
+            file_format: Format to query; required when the matches span several formats.
+            pattern: Only paths matching this ``fnmatch`` pattern.
+            **options: Format-specific options, e.g. ``delimiter`` for CSV.
+
+        Raises:
+            ValueError: If nothing matches or the matches span several formats.
+        """
+        matches = self.find(columns, file_format=file_format, pattern=pattern)
+        if matches.num_rows == 0:
+            raise ValueError(f"No indexed dataset contains the columns {columns!r}")
+        formats = sorted(set(matches["format"].to_pylist()))
+        if len(formats) > 1:
+            raise ValueError(f"Matching datasets span several formats ({', '.join(formats)}); pass file_format to pick one")
+        return JSONQuery(http_session=self.client.session, _from=dataset_from(formats[0], matches["file_path"].to_pylist(), options))
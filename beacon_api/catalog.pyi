@@ -0,0 +1,31 @@
+import pyarrow as pa
+from .client import Client as Client
+from .query import JSONQuery as JSONQuery
+from _typeshed import Incomplete
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+logger: Incomplete
+CATALOG_SCHEMA: pa.Schema
+
+def schema_fingerprint(schema: pa.Schema) -> str: ...
+
+@dataclass
+class CatalogRefresh:
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+class DatasetCatalog:
+    client: Client
+    path: str
+    def __init__(self, client: Client, path: str | None = None) -> None: ...
+    @property
+    def table(self) -> pa.Table: ...
+    def __len__(self) -> int: ...
+    def refresh(self, pattern: str | None = None, page_size: int = 1000, max_workers: int = 8, full: bool = False) -> CatalogRefresh: ...
+    def save(self) -> None: ...
+    def find(self, columns: Sequence[str] | str | None = None, file_format: str | None = None, pattern: str | None = None) -> pa.Table: ...
+    def query(self, columns: Sequence[str] | str, file_format: str | None = None, pattern: str | None = None, **options: Any) -> JSONQuery: ...
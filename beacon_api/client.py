@@ -8,14 +8,43 @@ SDK documentation style so IDEs surface helpful call hints.
 
 from __future__ import annotations
 import datetime
+import functools
+import logging
+import os
+import pyarrow as pa
 import requests
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Literal, Optional, Union, overload
 from deprecated import deprecated
 
 from .session import BaseBeaconSession
+from .cache import ContainmentCache, QueryCache, SchemaCache, load_server_info, save_server_info
 from .table import DataTable
 from .dataset import Dataset
 from .query import JSONQuery, SQLQuery, FromTable
+from .query import _parallel
+from . import transfer
+
+if TYPE_CHECKING:
+    from .catalog import DatasetCatalog
+
+def _build_headers(proxy_headers: dict[str,str] | None, jwt_token: str | None, basic_auth: tuple[str, str] | None) -> dict[str,str]:
+    """Combine custom headers with the JSON content headers and the optional credentials"""
+    if proxy_headers is None:
+        proxy_headers = {}
+    # Set JSON headers
+    proxy_headers['Content-Type'] = 'application/json'
+    proxy_headers['Accept'] = 'application/json'
+    if jwt_token:
+        proxy_headers['Authorization'] = f'Bearer {jwt_token}'
+        
+    if basic_auth:
+        if not isinstance(basic_auth, tuple) or len(basic_auth) != 2:
+            raise ValueError("Basic auth must be a tuple of (username, password)")
+        proxy_headers['Authorization'] = f'{requests.auth._basic_auth_str(*basic_auth)}' # type: ignore
+    return proxy_headers
+
+logger = logging.getLogger(__name__)
 
 class Client:
     """
@@ -23,59 +52,98 @@ class Client:
     discovering tables/datasets before building JSON or SQL queries.
     """
 
-    def __init__(self, url: str, proxy_headers: dict[str,str] | None = None, jwt_token: str | None = None, basic_auth: tuple[str, str] | None = None):
+    def __init__(self, url: str, proxy_headers: dict[str,str] | None = None, jwt_token: str | None = None, basic_auth: tuple[str, str] | None = None,
+                 result_cache: QueryCache | None = None, containment_cache: ContainmentCache | None = None,
+                 schema_cache: SchemaCache | None = None, fast_start: bool = False, server_info: dict | None = None, server_info_ttl: float | None = None):
         """Create a Beacon API client.
 
+        By default the client fetches ``/api/info`` and checks ``/api/health``. With
+        ``fast_start`` the health check is skipped, so construction costs a single
+        request, or none when ``server_info`` is injected or a fresh copy is cached locally.
+
         Args:
             url: Base Beacon Node URL, e.g. ``"https://beacon-node.example.com"``.
             proxy_headers: Optional custom headers added to every request.
             jwt_token: Optional bearer token used for ``Authorization`` header.
             basic_auth: Optional ``(username, password)`` tuple for HTTP basic auth.
+            result_cache: Optional :class:`~beacon_api.cache.QueryCache` that serves repeated queries from disk.
+            containment_cache: Optional :class:`~beacon_api.cache.ContainmentCache` that answers narrower
+                JSON queries from cached superset results without another request.
+            schema_cache: Optional :class:`~beacon_api.cache.SchemaCache` shared by every table and dataset
+                schema lookup.
+            fast_start: Skip the ``/api/health`` round trip; a successful ``/api/info`` already proves
+                the node is reachable. Defaults to False.
+            server_info: Optional ``/api/info`` payload (e.g. from :meth:`get_server_info` of another client)
+                used instead of contacting the server.
+            server_info_ttl: Optional lifetime in seconds of a server info copy cached under
+                :func:`~beacon_api.cache.default_cache_dir`. Fresh copies are reused across processes.
 
         Raises:
             ValueError: If ``basic_auth`` is not a 2-item tuple.
             Exception: When the Beacon Node health endpoint cannot be reached.
         """
-        if proxy_headers is None:
-            proxy_headers = {}
-        # Set JSON headers
-        proxy_headers['Content-Type'] = 'application/json'
-        proxy_headers['Accept'] = 'application/json'
-        if jwt_token:
-            proxy_headers['Authorization'] = f'Bearer {jwt_token}'
-            
-        if basic_auth:
-            if not isinstance(basic_auth, tuple) or len(basic_auth) != 2:
-                raise ValueError("Basic auth must be a tuple of (username, password)")
-            proxy_headers['Authorization'] = f'{requests.auth._basic_auth_str(*basic_auth)}' # type: ignore
+        proxy_headers = _build_headers(proxy_headers, jwt_token, basic_auth)
+
+        cached_info = False
+        if server_info is None and server_info_ttl is not None:
+            server_info = load_server_info(url, server_info_ttl)
+            cached_info = server_info is not None
         
-        self.session = BaseBeaconSession(url, proxy_headers=proxy_headers)
+        self.session = BaseBeaconSession(url, proxy_headers=proxy_headers, server_info=server_info)
+        self.session.result_cache = result_cache
+        self.session.containment_cache = containment_cache
+        self.session.schema_cache = schema_cache
+
+        if server_info_ttl is not None and not cached_info:
+            save_server_info(url, self.session.server_info)
         
-        if self.check_status():
-            raise Exception("Failed to connect to server")
+        if not fast_start:
+            self.check_status()
         
     def check_status(self):
         """Verify that the Beacon Node responds to ``/api/health``.
 
-        Returns:
-            None. The method prints diagnostic information on success.
-
         Raises:
             Exception: If the Beacon Node returns a non-200 response.
         """
         response = self.session.get("api/health")
         if response.status_code != 200:
             raise Exception(f"Failed to connect to server: {response.text}")
-        else:
-            print("Connected to: {} server successfully".format(self.session.base_url))
-            print("Beacon Version:", self.get_server_info()['beacon_version'])
+        logger.info("Connected to Beacon Node %s (version %s)", self.session.base_url, self.session.beacon_node_version)
             
-    def get_server_info(self) -> dict:
-        """Return the server metadata exposed by ``/api/info``."""
-        response = self.session.get("/api/info")
-        if response.status_code != 200:
-            raise Exception(f"Failed to get server info: {response.text}")
-        return response.json()
+    def get_server_info(self, refresh: bool = False) -> dict:
+        """Return the server metadata exposed by ``/api/info``.
+
+        Args:
+            refresh: Fetch the metadata again instead of returning the copy from the handshake. Defaults to False.
+        """
+        if refresh:
+            self.session.beacon_node_version = self.session.fetch_version()
+            # A redeployed node may expose different capabilities
+            self.session.invalidate_capabilities()
+        return self.session.server_info
+
+    def set_credentials(self, jwt_token: str | None = None, basic_auth: tuple[str, str] | None = None) -> None:
+        """Replace the credentials sent with every request and forget capabilities checked with the old ones.
+
+        Args:
+            jwt_token: Optional bearer token used for ``Authorization`` header.
+            basic_auth: Optional ``(username, password)`` tuple for HTTP basic auth.
+
+        Raises:
+            ValueError: If ``basic_auth`` is not a 2-item tuple.
+        """
+        headers = _build_headers(None, jwt_token, basic_auth)
+        if "Authorization" in headers:
+            self.session.headers["Authorization"] = headers["Authorization"]
+        else:
+            self.session.headers.pop("Authorization", None)
+        self.session.invalidate_capabilities()
+
+    def _invalidate_schema(self, endpoint: str, params: dict) -> None:
+        """Drop a cached schema after an admin operation changed the underlying table or dataset"""
+        if self.session.schema_cache is not None:
+            self.session.schema_cache.invalidate(self.session.base_url, endpoint, params)
 
     @deprecated(version="1.1.0",reason="Use list_tables() to get available tables. From there you can find the available columns for each table. This method will be removed in future versions.")
     def available_columns(self) -> list[str]:
@@ -94,9 +162,17 @@ class Client:
         table = tables['default']
         return table.get_table_schema()
     
-    def list_tables(self) -> dict[str,DataTable]:
+    def list_tables(self, prefetch_config: bool = False, max_workers: int = 8) -> dict[str,DataTable]:
         """Retrieve all logical tables available on the Beacon Node.
 
+        Table type and description are fetched lazily on first access, so listing
+        costs a single request regardless of the number of tables.
+
+        Args:
+            prefetch_config: Fetch every table config up front, concurrently. Useful when
+                the type or description of all tables will be read anyway. Defaults to False.
+            max_workers: Maximum number of concurrent config requests when prefetching. Defaults to 8.
+
         Returns:
             dict[str, DataTable]: Mapping of table name to :class:`DataTable` helper.
         """
@@ -111,6 +187,11 @@ class Client:
                 http_session=self.session,
                 table_name=table,
             )
+
+        if prefetch_config:
+            # Drain the ordered pool; each DataTable keeps its own config
+            for _ in _parallel.iter_in_order((table.load_config for table in data_tables.values()), max_workers):
+                pass
         
         return data_tables
     
@@ -132,14 +213,7 @@ class Client:
         if not force and not self.session.version_at_least(1,4,0):
             raise Exception("Listing datasets requires Beacon server version 1.4.0 or higher")
         
-        response = self.session.get("/api/list-datasets", params={
-            "pattern": pattern,
-            "limit": limit,
-            "offset": offset
-        })
-        if response.status_code != 200:
-            raise Exception(f"Failed to get datasets: {response.text}")
-        datasets = response.json()
+        datasets = self._fetch_dataset_page(pattern, limit, offset)
         dataset_objects = {}
         for dataset in datasets:
             file_path = dataset['file_path']
@@ -151,7 +225,90 @@ class Client:
                 file_format=file_format
             )
         return dataset_objects
+
+    def _fetch_dataset_page(self, pattern: str | None, limit: int | None, offset: int | None) -> list[dict]:
+        """Fetch one page of the raw ``/api/list-datasets`` payload"""
+        response = self.session.get("/api/list-datasets", params={
+            "pattern": pattern,
+            "limit": limit,
+            "offset": offset
+        })
+        if response.status_code != 200:
+            raise Exception(f"Failed to get datasets: {response.text}")
+        return response.json()
+
+    def _iter_dataset_pages(self, pattern: str | None, page_size: int) -> Iterator[list[dict]]:
+        """Yield raw dataset pages while the next page is fetched in the background"""
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            offset = 0
+            pending = pool.submit(self._fetch_dataset_page, pattern, page_size, offset)
+            try:
+                while pending is not None:
+                    page = pending.result()
+                    offset += page_size
+                    # A short page is the last one
+                    pending = pool.submit(self._fetch_dataset_page, pattern, page_size, offset) if len(page) >= page_size else None
+                    yield page
+            finally:
+                if pending is not None:
+                    pending.cancel()
+
+    @overload
+    def iter_datasets(self, pattern: str | None = ..., page_size: int = ..., as_arrow: Literal[False] = ..., force: bool = ...) -> Iterator[Dataset]: ...
+    @overload
+    def iter_datasets(self, pattern: str | None = ..., page_size: int = ..., *, as_arrow: Literal[True], force: bool = ...) -> pa.Table: ...
+
+    def iter_datasets(self, pattern: str | None = None, page_size: int = 1000, as_arrow: bool = False, force=False) -> Union[Iterator[Dataset], pa.Table]:
+        """Walk the full dataset catalog page by page.
+
+        The next page is requested while the caller consumes the current one, so the
+        iteration is bounded by the slower of the two instead of their sum.
+
+        Args:
+            pattern: Optional glob-like filter applied by the server.
+            page_size: Number of datasets requested per page. Defaults to 1000.
+            as_arrow: Return the whole catalog as a ``pyarrow.Table`` with ``file_path`` and
+                ``format`` columns instead of yielding :class:`Dataset` helpers. Defaults to False.
+
+        Returns:
+            Iterator[Dataset] | pa.Table: A lazy iterator of datasets, or the catalog table when ``as_arrow`` is set.
+
+        Raises:
+            Exception: If the Beacon Node version < 1.4.0 or an HTTP call fails.
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be a positive integer")
+        if not force and not self.session.version_at_least(1,4,0):
+            raise Exception("Listing datasets requires Beacon server version 1.4.0 or higher")
+
+        if as_arrow:
+            schema = pa.schema([("file_path", pa.string()), ("format", pa.string())])
+            batches = [
+                pa.RecordBatch.from_pydict({
+                    "file_path": [dataset['file_path'] for dataset in page],
+                    "format": [dataset['format'] for dataset in page],
+                }, schema=schema)
+                for page in self._iter_dataset_pages(pattern, page_size)
+            ]
+            return pa.Table.from_batches(batches, schema=schema)
+
+        return (
+            Dataset(http_session=self.session, file_path=dataset['file_path'], file_format=dataset['format'])
+            for page in self._iter_dataset_pages(pattern, page_size)
+            for dataset in page
+        )
     
+    def dataset_catalog(self, path: str | None = None) -> "DatasetCatalog":
+        """Open the local :class:`~beacon_api.catalog.DatasetCatalog` of this Beacon Node.
+
+        Call :meth:`DatasetCatalog.refresh` to build or update it.
+
+        Args:
+            path: Optional Parquet file holding the index. Defaults to a file per node under the cache directory.
+        """
+        from .catalog import DatasetCatalog
+        return DatasetCatalog(self, path)
+
     def sql_query(self, sql: str) -> SQLQuery:
         """Create a new :class:`SQLQuery` for direct SQL execution.
 
@@ -238,32 +395,81 @@ class Client:
         if not self.session.is_admin():
             raise Exception("Uploading datasets requires admin privileges")
         
-        # We use requests directly here to support multipart/form-data 
-        auth_headers = {
-            "Authorization": self.session.headers.get("Authorization", "")
-        }
-        url = f"{self.session.base_url}/api/admin/upload-file"
-        
-        # Upload the file using a multipart/form-data POST request
-        # the first part should be the prefix of the destination path eg. /data/datasets/ of /data/datasets/myfile.parquet
-        prefix = '/'.join(destination_path.split('/')[:-1])
-        # File name is the last part
-        file_name = destination_path.split('/')[-1]
-        payload = {'prefix': prefix }
-        files=[
-            ('file',(file_name,open(file_path,'rb'),'application/octet-stream'))
-        ]
-        response = requests.request("POST", url, headers=auth_headers, data=payload, files=files)
-        if response.status_code != 200:
-            raise Exception(f"Failed to upload dataset: {response.text}")        
+        transfer.upload_file(self.session, file_path, destination_path)
+        self._invalidate_schema("/api/dataset-schema", {"file": destination_path})
             
 
-    def download_dataset(self, dataset_path: str, local_path: str, force=False) -> None:
+    def upload_datasets(self, local_dir_or_glob: str, destination_prefix: str, max_workers: int = 4,
+                        manifest_path: str | None = None, raise_on_error: bool = True, force=False) -> list[transfer.TransferResult]:
+        """Upload many local files concurrently, skipping files that are unchanged since the last run.
+
+        Files are streamed as multipart bodies over the client's pooled session. Their
+        size and SHA-256 are recorded in a JSON manifest after each successful upload,
+        and files whose size and checksum match the manifest are skipped.
+
+        Args:
+            local_dir_or_glob: A directory (uploaded recursively) or a glob such as ``"data/**/*.parquet"``.
+            destination_prefix: Destination directory on the Beacon Node; relative paths below the
+                directory (or below the glob's first wildcard) are preserved.
+            max_workers: Number of concurrent uploads. Defaults to 4.
+            manifest_path: Location of the manifest. Defaults to ``.beacon_upload_manifest.json`` inside the
+                directory or glob root. Pass ``""`` to upload every file without change detection.
+            raise_on_error: Raise after all files were attempted if any upload failed. Defaults to True.
+
+        Returns:
+            list[TransferResult]: One result per file, in path order, with size, duration and throughput.
+
+        Raises:
+            Exception: If the Beacon Node version < 1.5.0, the session is not an admin, or
+                (with ``raise_on_error``) any upload failed.
+        """
+        # Require Beacon server version >= 1.5.0
+        if not force and not self.session.version_at_least(1,5,0):
+            raise Exception("Uploading datasets requires Beacon server version 1.5.0 or higher")
+        
+        # Requires admin privileges
+        if not self.session.is_admin():
+            raise Exception("Uploading datasets requires admin privileges")
+
+        files = transfer.collect_files(local_dir_or_glob)
+        if manifest_path is None:
+            manifest_path = transfer.default_manifest_path(local_dir_or_glob)
+        manifest = transfer.UploadManifest(manifest_path) if manifest_path else None
+        if manifest_path:
+            files = [(path, relative) for path, relative in files if os.path.abspath(path) != os.path.abspath(manifest_path)]
+
+        prefix = destination_prefix.rstrip("/")
+        transfer.ensure_pool_size(self.session, max_workers)
+        tasks = (
+            functools.partial(transfer.upload_with_manifest, self.session, manifest, path, f"{prefix}/{relative}")
+            for path, relative in files
+        )
+        results = []
+        try:
+            for result in _parallel.iter_in_order(tasks, max_workers):
+                if not result.skipped and result.ok:
+                    self._invalidate_schema("/api/dataset-schema", {"file": result.remote_path})
+                results.append(result)
+        finally:
+            # Keep the progress of interrupted runs
+            if manifest is not None:
+                manifest.save()
+
+        failed = [result for result in results if not result.ok]
+        if failed and raise_on_error:
+            raise Exception(f"Failed to upload {len(failed)} of {len(results)} datasets, first error: {failed[0].local_path}: {failed[0].error}")
+        return results
+
+    def download_dataset(self, dataset_path: str, local_path: str, force=False, chunk_size: int = 1024*1024) -> None:
         """Download a dataset file from the Beacon Node to a local path.
 
+        The file is written to ``local_path + ".part"`` and renamed once its size is
+        verified; an interrupted download is resumed with an HTTP ``Range`` request.
+
         Args:
             dataset_path: Path to the dataset file on the Beacon Node.
             local_path: Local path where the file will be saved.
+            chunk_size: Number of bytes written per chunk. Defaults to 1 MiB.
         Raises:
             Exception: If the download fails.
         """
@@ -275,15 +481,52 @@ class Client:
         if not self.session.is_admin():
             raise Exception("Downloading datasets requires admin privileges")
         
-        response = self.session.get("/api/admin/download-file", params={
-            "file_path": dataset_path
-        }, stream=True)
-        if response.status_code != 200:
-            raise Exception(f"Failed to download dataset: {response.text}")
+        transfer.download_file(self.session, dataset_path, local_path, chunk_size=chunk_size)
+
+    def download_datasets(self, paths: list[str], local_dir: str, max_workers: int = 4, relative_to: str | None = None,
+                          chunk_size: int = 8*1024*1024, skip_existing: bool = False, raise_on_error: bool = True, force=False) -> list[transfer.TransferResult]:
+        """Download many dataset files concurrently into ``local_dir``.
+
+        Every file is written to a ``.part`` file, resumed with HTTP ``Range`` requests
+        after broken connections or on the next run, and only renamed into place once
+        its size matches the size announced by the server.
+
+        Args:
+            paths: Dataset paths on the Beacon Node, e.g. the keys of :meth:`list_datasets`.
+            local_dir: Local directory receiving the files; the remote directory structure is kept.
+            max_workers: Number of concurrent downloads. Defaults to 4.
+            relative_to: Optional remote prefix stripped from every path before it is placed below ``local_dir``.
+            chunk_size: Number of bytes written per chunk. Defaults to 8 MiB.
+            skip_existing: Skip files that already exist locally. Defaults to False.
+            raise_on_error: Raise after all files were attempted if any download failed. Defaults to True.
+
+        Returns:
+            list[TransferResult]: One result per path, in input order, with size, duration and throughput.
+
+        Raises:
+            Exception: If the Beacon Node version < 1.5.0, the session is not an admin, or
+                (with ``raise_on_error``) any download failed.
+        """
+        # Require Beacon server version >= 1.5.0
+        if not force and not self.session.version_at_least(1,5,0):
+            raise Exception("Downloading datasets requires Beacon server version 1.5.0 or higher")
         
-        with open(local_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Requires admin privileges
+        if not self.session.is_admin():
+            raise Exception("Downloading datasets requires admin privileges")
+
+        targets = [(path, transfer.local_target(path, local_dir, relative_to)) for path in paths]
+        transfer.ensure_pool_size(self.session, max_workers)
+        tasks = (
+            functools.partial(transfer.download_to, self.session, path, target, chunk_size, skip_existing)
+            for path, target in targets
+        )
+        results = list(_parallel.iter_in_order(tasks, max_workers))
+
+        failed = [result for result in results if not result.ok]
+        if failed and raise_on_error:
+            raise Exception(f"Failed to download {len(failed)} of {len(results)} datasets, first error: {failed[0].remote_path}: {failed[0].error}")
+        return results
 
     def delete_dataset(self, dataset_path: str, force=False) -> None:
         """Delete a dataset file from the Beacon Node.
@@ -308,6 +551,7 @@ class Client:
         })
         if response.status_code != 200:
             raise Exception(f"Failed to delete dataset: {response.text}")
+        self._invalidate_schema("/api/dataset-schema", {"file": dataset_path})
         
     def create_logical_table(self, table_name: str, dataset_glob_paths: list[str], file_format: str, description: str | None = None, force=False, **kwargs) -> None:
         """Create a new logical table on the Beacon Node.
@@ -346,6 +590,7 @@ class Client:
         response = self.session.post("/api/admin/create-table", json=json_data)
         if response.status_code != 200:
             raise Exception(f"Failed to create table: {response.text}")
+        self._invalidate_schema("/api/table-schema", {"table_name": table_name})
         
     def delete_table(self, table_name: str, force=False) -> None:
         """Delete a logical table from the Beacon Node.
@@ -368,4 +613,5 @@ class Client:
             "table_name": table_name
         })
         if response.status_code != 200:
-            raise Exception(f"Failed to delete table: {response.text}")
\ No newline at end of file
+            raise Exception(f"Failed to delete table: {response.text}")
+        self._invalidate_schema("/api/table-schema", {"table_name": table_name})
\ No newline at end of file
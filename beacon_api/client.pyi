@@ -1,24 +1,39 @@
 import datetime
+import pyarrow as pa
+from typing import Iterator, Literal, overload
+from .cache import ContainmentCache as ContainmentCache, QueryCache as QueryCache, SchemaCache as SchemaCache
+from .catalog import DatasetCatalog as DatasetCatalog
 from .dataset import Dataset as Dataset
 from .query import FromTable as FromTable, JSONQuery as JSONQuery, SQLQuery as SQLQuery
 from .session import BaseBeaconSession as BaseBeaconSession
 from .table import DataTable as DataTable
+from .transfer import TransferResult as TransferResult
 from _typeshed import Incomplete
 
+logger: Incomplete
+
 class Client:
     session: Incomplete
-    def __init__(self, url: str, proxy_headers: dict[str, str] | None = None, jwt_token: str | None = None, basic_auth: tuple[str, str] | None = None) -> None: ...
+    def __init__(self, url: str, proxy_headers: dict[str, str] | None = None, jwt_token: str | None = None, basic_auth: tuple[str, str] | None = None, result_cache: QueryCache | None = None, containment_cache: ContainmentCache | None = None, schema_cache: SchemaCache | None = None, fast_start: bool = False, server_info: dict | None = None, server_info_ttl: float | None = None) -> None: ...
     def check_status(self) -> None: ...
-    def get_server_info(self) -> dict: ...
+    def get_server_info(self, refresh: bool = False) -> dict: ...
+    def set_credentials(self, jwt_token: str | None = None, basic_auth: tuple[str, str] | None = None) -> None: ...
     def available_columns(self) -> list[str]: ...
     def available_columns_with_data_type(self) -> dict[str, type]: ...
-    def list_tables(self) -> dict[str, DataTable]: ...
+    def list_tables(self, prefetch_config: bool = False, max_workers: int = 8) -> dict[str, DataTable]: ...
     def list_datasets(self, pattern: str | None = None, limit: int | None = None, offset: int | None = None, force: bool = False) -> dict[str, Dataset]: ...
+    @overload
+    def iter_datasets(self, pattern: str | None = ..., page_size: int = ..., as_arrow: Literal[False] = ..., force: bool = ...) -> Iterator[Dataset]: ...
+    @overload
+    def iter_datasets(self, pattern: str | None = ..., page_size: int = ..., *, as_arrow: Literal[True], force: bool = ...) -> pa.Table: ...
+    def dataset_catalog(self, path: str | None = None) -> DatasetCatalog: ...
     def sql_query(self, sql: str) -> SQLQuery: ...
     def query(self) -> JSONQuery: ...
     def subset(self, longitude_column: str, latitude_column: str, time_column: str, depth_column: str, columns: list[str], bbox: tuple[float, float, float, float] | None = None, depth_range: tuple[float, float] | None = None, time_range: tuple[datetime.datetime, datetime.datetime] | None = None) -> JSONQuery: ...
     def upload_dataset(self, file_path: str, destination_path: str, force: bool = False) -> None: ...
-    def download_dataset(self, dataset_path: str, local_path: str, force: bool = False) -> None: ...
+    def upload_datasets(self, local_dir_or_glob: str, destination_prefix: str, max_workers: int = 4, manifest_path: str | None = None, raise_on_error: bool = True, force: bool = False) -> list[TransferResult]: ...
+    def download_dataset(self, dataset_path: str, local_path: str, force: bool = False, chunk_size: int = ...) -> None: ...
+    def download_datasets(self, paths: list[str], local_dir: str, max_workers: int = 4, relative_to: str | None = None, chunk_size: int = ..., skip_existing: bool = False, raise_on_error: bool = True, force: bool = False) -> list[TransferResult]: ...
     def delete_dataset(self, dataset_path: str, force: bool = False) -> None: ...
     def create_logical_table(self, table_name: str, dataset_glob_paths: list[str], file_format: str, description: str | None = None, force: bool = False, **kwargs) -> None: ...
     def delete_table(self, table_name: str, force: bool = False) -> None: ...
@@ -8,11 +8,13 @@ same narrative found in the docs site.
 """
 
 from __future__ import annotations
+import functools
 import pyarrow as pa
 import os
-from typing import Any, Callable, Dict, Generic, Literal, Sequence, TypeVar, overload
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Iterable, Iterator, Literal, Optional, Sequence, TypeVar, Union, overload
 
 from .session import BaseBeaconSession
+from .schema import fetch_schema, parse_arrow_schema
 from .query import (
     JSONQuery,
     From,
@@ -22,7 +24,12 @@ from .query import (
     FromNetCDFDataset,
     FromParquetDataset,
     FromZarrDataset,
+    _rechunk_batches,
 )
+from .query import _parallel
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 SchemaType = dict[str, Any]
 """Alias describing the JSON payload returned by ``/api/dataset-schema``."""
@@ -30,18 +37,39 @@ SchemaType = dict[str, Any]
 DatasetFormatLiteral = Literal["arrow", "bbf", "csv", "netcdf", "parquet", "zarr"]
 """Literal union of dataset formats supported by the Beacon Node."""
 _FormatT = TypeVar("_FormatT", bound=DatasetFormatLiteral)
-FromFactory = Callable[[str, dict[str, Any]], From]
+FromFactory = Callable[[list[str], dict[str, Any]], From]
 
 _DATASET_FROM_FACTORIES: Dict[str, FromFactory] = {
-    "csv": lambda path, options: FromCSVDataset(paths=[path], delimiter=options.get("delimiter", ",")),
-    "parquet": lambda path, _: FromParquetDataset(paths=[path]),
-    "arrow": lambda path, _: FromArrowDataset(paths=[path]),
-    "netcdf": lambda path, _: FromNetCDFDataset(paths=[path]),
-    "zarr": lambda path, options: FromZarrDataset(paths=[path], statistics_columns=options.get("statistics_columns")),
-    "bbf": lambda path, _: FromBBFDataset(paths=[path]),
+    "csv": lambda paths, options: FromCSVDataset(paths=paths, delimiter=options.get("delimiter", ",")),
+    "parquet": lambda paths, _: FromParquetDataset(paths=paths),
+    "arrow": lambda paths, _: FromArrowDataset(paths=paths),
+    "netcdf": lambda paths, _: FromNetCDFDataset(paths=paths),
+    "zarr": lambda paths, options: FromZarrDataset(paths=paths, statistics_columns=options.get("statistics_columns")),
+    "bbf": lambda paths, _: FromBBFDataset(paths=paths),
 }
 
 
+def dataset_from(file_format: str, paths: Sequence[str], options: dict[str, Any] | None = None) -> From:
+    """Build the ``From*Dataset`` node that scans ``paths`` of a single format in one query.
+
+    Args:
+        file_format: Dataset format supported by Beacon (e.g. ``"parquet"``).
+        paths: Dataset paths or glob patterns on the Beacon Node.
+        options: Format-specific options such as ``delimiter`` (CSV) or ``statistics_columns`` (Zarr).
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    file_format_str = file_format.lower()
+    builder = _DATASET_FROM_FACTORIES.get(file_format_str)
+
+    if builder is None:
+        supported = ", ".join(sorted(_DATASET_FROM_FACTORIES))
+        raise ValueError(f"Unsupported dataset format '{file_format_str}'. Supported formats: {supported}")
+
+    return builder(list(paths), options or {})
+
+
 class Dataset(Generic[_FormatT]):
     """File or object-store resource that Beacon can scan directly.
 
@@ -92,7 +120,10 @@ class Dataset(Generic[_FormatT]):
             Exception: For unsupported field types surfaced by Beacon.
         """
 
-        response = self.session.get("/api/dataset-schema", params={"file": self.file_path})
+        return fetch_schema(self.session, "/api/dataset-schema", {"file": self.file_path}, self._parse_schema_response)
+
+    @staticmethod
+    def _parse_schema_response(response) -> pa.Schema:
         if response.status_code != 200:
             raise RuntimeError(f"Failed to get dataset schema: {response.text}")
 
@@ -104,27 +135,7 @@ class Dataset(Generic[_FormatT]):
         if not isinstance(schema_data, dict):
             raise ValueError("Dataset schema response must be a JSON object")
 
-        fields = []
-        
-        for field in schema_data['fields']:
-            field_type = field['data_type']
-            
-            if isinstance(field_type, str):
-                fields.append(pa.field(field['name'], field_type))
-            
-            elif isinstance(field_type, dict) and field_type.get("Timestamp") == ["Second", None]:
-                fields.append(pa.field(field['name'], pa.timestamp('s')))
-            elif isinstance(field_type, dict) and field_type.get("Timestamp") == ["Millisecond", None]:
-                fields.append(pa.field(field['name'], pa.timestamp('ms')))
-            elif isinstance(field_type, dict) and field_type.get("Timestamp") == ["Microsecond", None]:
-                fields.append(pa.field(field['name'], pa.timestamp('us')))
-            elif isinstance(field_type, dict) and field_type.get("Timestamp") == ["Nanosecond", None]:
-                fields.append(pa.field(field['name'], pa.timestamp('ns')))
-            
-            else:
-                raise Exception(f"Unsupported data type for field {field['name']}: {field_type}")
-        
-        return pa.schema(fields)
+        return parse_arrow_schema(schema_data)
 
     def get_file_extension(self) -> str:
         """Return the lowercase file extension without the leading dot."""
@@ -174,9 +185,7 @@ class Dataset(Generic[_FormatT]):
         """
 
         file_format_str = self.get_file_format().lower()
-        builder = _DATASET_FROM_FACTORIES.get(file_format_str)
-
-        if builder is None:
+        if file_format_str not in _DATASET_FROM_FACTORIES:
             supported = ", ".join(sorted(_DATASET_FROM_FACTORIES))
             raise ValueError(f"Unsupported dataset format '{file_format_str}'. Supported formats: {supported}")
 
@@ -192,5 +201,166 @@ class Dataset(Generic[_FormatT]):
                 raise ValueError("The 'statistics_columns' option is only supported for Zarr datasets.")
             builder_options["statistics_columns"] = list(statistics_columns)
 
-        _from = builder(self.file_path, builder_options)
-        return JSONQuery(http_session=self.session, _from=_from)
\ No newline at end of file
+        _from = dataset_from(file_format_str, [self.file_path], builder_options)
+        return JSONQuery(http_session=self.session, _from=_from)
+
+
+def query_datasets(datasets: Iterable[Dataset], **options: Any) -> Union[JSONQuery, "MultiDatasetQuery"]:
+    """Build one query over many datasets.
+
+    Datasets sharing a format are scanned by a single ``From*Dataset(paths=[...])``
+    node. When all datasets share a format the result is a plain
+    :class:`~beacon_api.query.JSONQuery`; mixed formats yield a
+    :class:`MultiDatasetQuery` that runs one query per format concurrently and
+    merges the results client-side.
+
+    Args:
+        datasets: The datasets to scan, e.g. the values of :meth:`Client.list_datasets`.
+        **options: Format-specific options such as ``delimiter`` (CSV) or ``statistics_columns`` (Zarr).
+
+    Raises:
+        ValueError: If no datasets are given or a format is not supported.
+    """
+    groups: dict[str, list[str]] = {}
+    session = None
+    for dataset in datasets:
+        session = session or dataset.session
+        groups.setdefault(dataset.get_file_format().lower(), []).append(dataset.file_path)
+    if session is None:
+        raise ValueError("query_datasets() needs at least one dataset")
+
+    queries = [JSONQuery(http_session=session, _from=dataset_from(file_format, paths, options)) for file_format, paths in groups.items()]
+    if len(queries) == 1:
+        return queries[0]
+    return MultiDatasetQuery(queries)
+
+
+def _conform_batch(batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """Cast ``batch`` to ``schema``, filling columns it lacks with nulls"""
+    columns = []
+    for field in schema:
+        index = batch.schema.get_field_index(field.name)
+        if index < 0:
+            columns.append(pa.nulls(batch.num_rows, type=field.type))
+        else:
+            columns.append(batch.column(index).cast(field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+class MultiDatasetQuery:
+    """Union of one :class:`~beacon_api.query.JSONQuery` per dataset format.
+
+    This is not a :class:`~beacon_api.query.JSONQuery`. Builder calls whose names
+    start with ``add_``, such as ``add_select_column`` or ``add_range_filter``, and
+    ``set_limit`` are applied to every sub-query. Sorting, distinct and offsets
+    cannot be combined across formats and are rejected; a limit is applied to the
+    merged result. Results are available through :meth:`iter_batches`,
+    :meth:`to_arrow_table`, :meth:`to_pandas_dataframe`, :meth:`to_parquet` and
+    :meth:`to_arrow`; any other attribute raises :class:`AttributeError`.
+
+    Execution runs the sub-queries concurrently and merges their Arrow streams
+    into one, unifying the schemas: columns missing from a format are filled with
+    nulls and types are promoted where needed.
+    """
+
+    _UNSUPPORTED = ("add_sort", "set_distinct", "set_offset")
+
+    def __init__(self, queries: Sequence[JSONQuery]):
+        self.queries = list(queries)
+        self.limit: Optional[int] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._UNSUPPORTED:
+            raise ValueError(f"{name}() cannot be applied across datasets of different formats")
+        if not (name.startswith("add_") or name == "set_limit"):
+            raise AttributeError(f"{type(self).__name__} has no attribute {name!r}")
+
+        def apply_to_all(*args: Any, **kwargs: Any) -> "MultiDatasetQuery":
+            for query in self.queries:
+                getattr(query, name)(*args, **kwargs)
+            if name == "set_limit":
+                # Every sub-query contributes at most `limit` rows; the merged result is truncated
+                self.limit = args[0] if args else kwargs["limit"]
+            return self
+
+        return apply_to_all
+
+    def _unified_schema(self, schemas: Sequence[pa.Schema]) -> pa.Schema:
+        return pa.unify_schemas(list(schemas), promote_options="permissive")
+
+    def _open_merged(self, max_rows: int, max_workers: int, max_buffered: int, force: bool) -> tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+        """Return the unified schema and an iterator over the merged, conformed batches"""
+        if max_rows <= 0:
+            raise ValueError("max_rows must be a positive integer")
+
+        # The schemas are needed before the first batch is conformed, so they are probed up front
+        probes = (functools.partial(query._arrow_schema, force=force) for query in self.queries)
+        schema = self._unified_schema(list(_parallel.iter_in_order(probes, max_workers)))
+
+        def merged() -> Iterator[pa.RecordBatch]:
+            streams = (functools.partial(query.iter_batches, max_rows=max_rows, force=force) for query in self.queries)
+            batches = (_conform_batch(batch, schema) for batch in _parallel.iter_streams_in_order(streams, max_workers, max_buffered))
+            remaining = self.limit
+            for batch in _rechunk_batches(batches, max_rows):
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    batch = batch.slice(0, remaining)
+                    remaining -= batch.num_rows
+                yield batch
+
+        return schema, merged()
+
+    def iter_batches(self, max_rows: int = 65536, max_workers: int = 4, max_buffered: int = 4, force=False) -> Iterator[pa.RecordBatch]:
+        """Execute all sub-queries and yield the merged results as Arrow record batches of a fixed size.
+
+        The result schemas are probed first with zero-row queries. Then at most
+        ``max_workers`` sub-queries stream at a time, each reading up to
+        ``max_buffered`` batches of ``max_rows`` rows ahead of the consumer before
+        it pauses, so memory stays around ``max_workers * max_buffered * max_rows``
+        rows. A sub-query is only sent once it is among the next ``max_workers`` to
+        be read.
+
+        Args:
+            max_rows: Number of rows per yielded batch; only the last batch may be smaller. Defaults to 65536.
+            max_workers: Number of sub-queries streaming at the same time. Defaults to 4.
+            max_buffered: Number of batches read ahead per open sub-query. Defaults to 4.
+            force: Skip the Beacon Node version check. Defaults to False.
+        """
+        _, batches = self._open_merged(max_rows, max_workers, max_buffered, force)
+        yield from batches
+
+    def to_parquet(self, file_path: str, max_rows: int = 65536, max_workers: int = 4, max_buffered: int = 4, force=False) -> None:
+        """Execute all sub-queries and write the merged results to a Parquet file batch by batch.
+
+        Memory is bounded as in :meth:`iter_batches`, whose arguments are accepted here.
+        """
+        from pyarrow import parquet as pq
+
+        schema, batches = self._open_merged(max_rows, max_workers, max_buffered, force)
+        with pq.ParquetWriter(file_path, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+
+    def to_arrow(self, file_path: str, max_rows: int = 65536, max_workers: int = 4, max_buffered: int = 4, force=False) -> None:
+        """Execute all sub-queries and write the merged results to an Arrow IPC stream file batch by batch.
+
+        Memory is bounded as in :meth:`iter_batches`, whose arguments are accepted here.
+        """
+        schema, batches = self._open_merged(max_rows, max_workers, max_buffered, force)
+        with pa.OSFile(file_path, "wb") as sink, pa.ipc.new_stream(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+
+    def to_arrow_table(self, max_workers: int = 4, force=False) -> pa.Table:
+        """Execute all sub-queries concurrently and return the merged results as one Arrow table."""
+        tasks = (functools.partial(query._read_arrow_table, force=force) for query in self.queries)
+        tables = list(_parallel.iter_in_order(tasks, max_workers))
+        schema = self._unified_schema([table.schema for table in tables])
+        batches = [_conform_batch(batch, schema) for table in tables for batch in table.to_batches()]
+        merged = pa.Table.from_batches(batches, schema=schema)
+        return merged.slice(0, self.limit) if self.limit is not None else merged
+
+    def to_pandas_dataframe(self, max_workers: int = 4, force=False) -> "pd.DataFrame":
+        """Execute all sub-queries concurrently and return the merged results as a pandas DataFrame."""
+        return self.to_arrow_table(max_workers=max_workers, force=force).to_pandas()
@@ -1,11 +1,15 @@
 from .query import From as From, FromArrowDataset as FromArrowDataset, FromBBFDataset as FromBBFDataset, FromCSVDataset as FromCSVDataset, FromNetCDFDataset as FromNetCDFDataset, FromParquetDataset as FromParquetDataset, FromZarrDataset as FromZarrDataset, JSONQuery as JSONQuery
 from .session import BaseBeaconSession as BaseBeaconSession
 from _typeshed import Incomplete
-from typing import Any, Callable, Generic, Sequence, overload
+import pandas as pd
+import pyarrow as pa
+from typing import Any, Callable, Generic, Iterable, Iterator, Sequence, overload
 
 SchemaType = dict[str, Any]
 DatasetFormatLiteral: Incomplete
-FromFactory = Callable[[str, dict[str, Any]], From]
+FromFactory = Callable[[list[str], dict[str, Any]], From]
+
+def dataset_from(file_format: str, paths: Sequence[str], options: dict[str, Any] | None = None) -> From: ...
 
 class Dataset(Generic[_FormatT]):
     session: Incomplete
@@ -23,3 +27,16 @@ class Dataset(Generic[_FormatT]):
     def query(self, *, statistics_columns: Sequence[str] | None = None, **kwargs: Any) -> JSONQuery: ...
     @overload
     def query(self, **kwargs: Any) -> JSONQuery: ...
+
+def query_datasets(datasets: Iterable[Dataset], **options: Any) -> JSONQuery | MultiDatasetQuery: ...
+
+class MultiDatasetQuery:
+    queries: list[JSONQuery]
+    limit: int | None
+    def __init__(self, queries: Sequence[JSONQuery]) -> None: ...
+    def __getattr__(self, name: str) -> Callable[..., MultiDatasetQuery]: ...
+    def iter_batches(self, max_rows: int = 65536, max_workers: int = 4, max_buffered: int = 4, force: bool = False) -> Iterator[pa.RecordBatch]: ...
+    def to_parquet(self, file_path: str, max_rows: int = 65536, max_workers: int = 4, max_buffered: int = 4, force: bool = False) -> None: ...
+    def to_arrow(self, file_path: str, max_rows: int = 65536, max_workers: int = 4, max_buffered: int = 4, force: bool = False) -> None: ...
+    def to_arrow_table(self, max_workers: int = 4, force: bool = False) -> pa.Table: ...
+    def to_pandas_dataframe(self, max_workers: int = 4, force: bool = False) -> pd.DataFrame: ...
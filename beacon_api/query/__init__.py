@@ -1,29 +1,41 @@
+from __future__ import annotations
 import atexit
+import contextlib
+import copy
+import functools
+import itertools
 import json
+import logging
 import os
+import shutil
 import tempfile
-from typing import Generator, Iterator
-import pandas as pd
-import geopandas as gpd
-import xarray as xr
-import dask.dataframe as dd
-import fsspec
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, Iterable, Iterator, Sequence
 from io import BytesIO
 from abc import abstractmethod
 from requests import Response
-from pyarrow import parquet as pq
 import pyarrow as pa
 import pyarrow.ipc as ipc
 
 from datetime import datetime
 
+# pandas, geopandas, xarray, dask and pyarrow.parquet take seconds to import and are only
+# needed by the materialization helpers, so they are imported where they are used
+if TYPE_CHECKING:
+    import dask.dataframe as dd
+    import geopandas as gpd
+    import pandas as pd
+    import xarray as xr
+
 try:
+    from typing import Literal
     from typing import Optional
     from typing import List
     from typing import Self
     from typing import Union
     from typing import Tuple
 except ImportError:
+    from typing_extensions import Literal
     from typing_extensions import Optional
     from typing_extensions import List
     from typing_extensions import Self
@@ -38,7 +50,45 @@ from .select import *
 from .filter import *
 from .distinct import *
 from .sort import *
+from . import _parallel
 from ..session import BaseBeaconSession
+from ..cache import CachingReader, QueryCache
+
+logger = logging.getLogger(__name__)
+
+def _concat_batches(batches: List[pa.RecordBatch]) -> pa.RecordBatch:
+    """Concatenate record batches sharing a schema into a single contiguous batch"""
+    if len(batches) == 1:
+        return batches[0]
+    return pa.Table.from_batches(batches).combine_chunks().to_batches()[0]
+
+def _rechunk_batches(batches: Iterable[pa.RecordBatch], max_rows: int) -> Iterator[pa.RecordBatch]:
+    """Re-slice a stream of record batches into batches of exactly ``max_rows`` rows (except the last)"""
+    pending: List[pa.RecordBatch] = []
+    pending_rows = 0
+    for batch in batches:
+        offset = 0
+        while offset < batch.num_rows:
+            length = min(max_rows - pending_rows, batch.num_rows - offset)
+            pending.append(batch.slice(offset, length))
+            pending_rows += length
+            offset += length
+            if pending_rows == max_rows:
+                yield _concat_batches(pending)
+                pending, pending_rows = [], 0
+    if pending:
+        yield _concat_batches(pending)
+
+def _part_path(file_path: str, index: int) -> str:
+    """Name of part ``index`` of a split export, from a ``{part}`` placeholder or a suffix"""
+    if "{part}" in file_path:
+        return file_path.format(part=index)
+    root, ext = os.path.splitext(file_path)
+    return f"{root}_{index:03d}{ext}"
+
+def _read_partition(query: "BaseQuery", force: bool = False) -> pd.DataFrame:
+    """Execute one partition of a Dask collection; module-level so it pickles onto workers"""
+    return query._read_arrow_table(force=force).to_pandas()
 
 class BaseQuery:
     def __init__(self, http_session: BaseBeaconSession):
@@ -80,43 +130,225 @@ class BaseQuery:
         return response.json()
 
     def execute(self, stream=False) -> Response:
-        """Run the query and return the response"""
+        """Run the query and return the response.
+
+        When ``stream`` is true the response body is left unread, so the emptiness
+        check is deferred to the consumer (see :meth:`_stream_to_file`).
+        """
         query_body = self.compile_query()
-        print(f"Running query: {query_body}")
+        logger.debug("Running query: %s", query_body)
         response = self.http_session.post("/api/query", data=query_body, stream=stream)
         if response.status_code != 200:
             raise Exception(f"Query failed: {response.text}")
-        if len(response.content) == 0:
+        if not stream and len(response.content) == 0:
             raise Exception("Query returned no content")
         return response
+
+    def _result_cache(self) -> Optional[Tuple[QueryCache, str, str]]:
+        """Return ``(cache, key, query_body)`` when a result cache is attached to the session"""
+        cache = getattr(self.http_session, "result_cache", None)
+        if cache is None:
+            return None
+        query_body = self.compile_query()
+        return cache, cache.key(query_body, self.http_session.beacon_node_version), query_body
+
+    def _read_body(self) -> bytes:
+        """Execute the query and return the complete response body, served from the result cache when possible"""
+        cached = self._result_cache()
+        if cached is not None:
+            cache, key, query_body = cached
+            cached_path = cache.get(key)
+            if cached_path is not None:
+                with open(cached_path, "rb") as f:
+                    return f.read()
+
+        response = self.execute()
+        if cached is not None:
+            cache.put(key, query_body, response.content)
+        return response.content
+
+    def _stream_to_file(self, file_path: str, streaming_chunk_size: int = 1024*1024, on_chunk: Optional[Callable[[int], None]] = None) -> None:
+        """Execute the query and write the response body to ``file_path`` chunk by chunk.
+
+        ``on_chunk`` is called with the size of every chunk written.
+        """
+        cached = self._result_cache()
+        entry = None
+        if cached is not None:
+            cache, key, query_body = cached
+            cached_path = cache.get(key)
+            if cached_path is not None:
+                shutil.copyfile(cached_path, file_path)
+                if on_chunk is not None:
+                    on_chunk(os.path.getsize(file_path))
+                return
+
+        response = self.execute(stream=True)
+        if cached is not None:
+            entry = cache.writer(key, query_body)
+        with response, entry or contextlib.nullcontext():
+            # skip keep-alive chunks
+            chunks = (chunk for chunk in response.iter_content(chunk_size=streaming_chunk_size) if chunk)
+            # Peek at the first chunk so an empty result is rejected before the file is created
+            first_chunk = next(chunks, None)
+            if first_chunk is None:
+                raise Exception("Query returned no content")
+            with open(file_path, "wb") as f:
+                for chunk in itertools.chain([first_chunk], chunks):
+                    f.write(chunk)
+                    if entry is not None:
+                        entry.write(chunk)
+                    if on_chunk is not None:
+                        on_chunk(len(chunk))
     
-    def execute_streaming(self, force=False) -> pa.RecordBatchStreamReader:
-        """Run the query and return the response as a streaming response"""
+    def _open_ipc_stream(self, force=False) -> Tuple[Any, pa.RecordBatchStreamReader]:
+        """Run the query and open an Arrow IPC reader on the unread response body.
+
+        Returns the closeable body (response, cached file or caching reader) next to the reader.
+        The request always asks for Arrow output; the output format of this query is left untouched.
+        """
         if not force and not self.http_session.version_at_least(1, 5, 0):
             raise Exception("Streaming queries require the Beacon Node version to be atleast 1.5.0 or higher")
-        
-        query_body = self.compile_query()
-        print(f"Running query: {query_body}")
-        response = self.http_session.post("/api/query", data=query_body, stream=True)
 
-        stream = ipc.open_stream(response.raw)
+        query = copy.copy(self)
+        query.set_output(Arrow())
+        cached = query._result_cache()
+        if cached is not None:
+            cache, key, query_body = cached
+            cached_path = cache.get(key)
+            if cached_path is not None:
+                body = open(cached_path, "rb")
+                try:
+                    return body, ipc.open_stream(body)
+                except Exception:
+                    body.close()
+                    raise
+
+        response = query.execute(stream=True)
+        # Let urllib3 undo any content-encoding before Arrow parses the raw body
+        response.raw.decode_content = True
+        body = response
+        source = response.raw
+        if cached is not None:
+            # Copy the stream into the cache as it is read; abandoned streams are discarded
+            body = source = CachingReader(response.raw, cache.writer(key, query_body), on_close=response.close)
+        try:
+            stream = ipc.open_stream(source)
+        except Exception:
+            body.close()
+            raise
+        return body, stream
 
+    def execute_streaming(self, force=False) -> pa.RecordBatchStreamReader:
+        """Run the query and return the response as a streaming response"""
+        _, stream = self._open_ipc_stream(force=force)
         return stream
+
+    def _cached_superset(self) -> Optional[pa.Table]:
+        """Return the result computed locally from a cached superset, if the query supports it"""
+        return None
+
+    def _remember(self, table: pa.Table) -> None:
+        """Offer a complete result to the containment cache, if the query supports it"""
+
+    def _read_parquet_table(self) -> pa.Table:
+        """Execute the query with Parquet output and decode the body into a table"""
+        table = self._cached_superset()
+        if table is None:
+            from pyarrow import parquet as pq
+            self.set_output(Parquet())
+            table = pq.read_table(BytesIO(self._read_body()))
+            self._remember(table)
+        return table
+
+    def _read_arrow_table(self, force=False) -> pa.Table:
+        """Execute the query and read the full Arrow IPC stream into a table"""
+        table = self._cached_superset()
+        if table is not None:
+            return table
+        body, stream = self._open_ipc_stream(force=force)
+        with body:
+            table = stream.read_all()
+        self._remember(table)
+        return table
+
+    def iter_batches(self, max_rows: int = 65536, columns: Optional[List[str]] = None, force=False) -> Iterator[pa.RecordBatch]:
+        """Execute the query and yield the results as Arrow record batches of a fixed size.
+
+        The Arrow IPC stream is decoded incrementally, so memory use is bounded by
+        ``max_rows`` rather than by the size of the result. The HTTP connection is
+        released when the generator is exhausted, closed or garbage collected, which
+        includes consumers that stop iterating early.
+
+        Args:
+            max_rows (int, optional): Number of rows per yielded batch; only the last batch may be smaller. Defaults to 65536.
+            columns (list[str] | None, optional): Result columns to keep, in order. Defaults to all columns.
+            force (bool, optional): Skip the Beacon Node version check. Defaults to False.
+
+        Yields:
+            pa.RecordBatch: Record batches of ``max_rows`` rows.
+        """
+        if max_rows <= 0:
+            raise ValueError("max_rows must be a positive integer")
+
+        table = self._cached_superset()
+        if table is not None:
+            batches = (batch.select(columns) if columns else batch for batch in table.to_batches())
+            yield from _rechunk_batches(batches, max_rows)
+            return
+
+        body, stream = self._open_ipc_stream(force=force)
+        try:
+            batches = (batch.select(columns) if columns else batch for batch in stream)
+            yield from _rechunk_batches(batches, max_rows)
+        finally:
+            body.close()
     
-    def to_xarray_dataset(self, dimension_columns: List[str], chunks: Union[dict, None] = None, auto_cleanup=True, force=False) -> xr.Dataset:
+    def to_xarray_dataset(self, dimension_columns: List[str], chunks: Union[dict, None] = None, auto_cleanup=True, force=False, engine: Literal["netcdf", "arrow", "beacon"] = "netcdf") -> xr.Dataset:
         """Converts the query results to an xarray Dataset with n-dimensional structure.
 
         Args:
             dimension_columns (list[str]): The list of columns to use as dimensions in the xarray Dataset.
+            chunks (dict, optional): Dask chunks passed to ``xarray.open_dataset``.
+            auto_cleanup (bool, optional): Remove the temporary NetCDF file at exit (``"netcdf"`` engine only).
+            force (bool, optional): Skip the Beacon Node version check.
+            engine (str, optional): ``"netcdf"`` downloads the full result as an NdNetCDF file and opens it.
+                ``"arrow"`` pivots the streamed Arrow response straight into in-memory arrays
+                without a file round trip (see :mod:`beacon_api.query._gridding`). JSON queries of
+                plain columns without limit or offset fetch the coordinates with one distinct query
+                per dimension and fill the grid batch by batch; other queries hold the complete
+                result table in memory next to the grid.
+                ``"beacon"`` only fetches the dimension coordinates up front and runs a filtered
+                sub-query per accessed window or dask chunk (see :mod:`beacon_api.xarray_backend`).
+                Defaults to ``"netcdf"``.
 
         Returns:
             xarray.Dataset: The query results as an xarray Dataset.
         """
+        import xarray as xr
+
+        if engine == "beacon":
+            if not isinstance(self, JSONQuery):
+                raise ValueError(f"The beacon engine requires a JSONQuery, not {type(self).__name__}")
+            from ..xarray_backend import BeaconBackendEntrypoint
+            return xr.open_dataset(self, engine=BeaconBackendEntrypoint, dimension_columns=dimension_columns, chunks=chunks, force=force)
+        if engine == "arrow":
+            from ._gridding import grid_batches, grid_table
+            coords = self._grid_coordinates(dimension_columns, force=force) if dimension_columns else None
+            if coords is None:
+                ds = grid_table(self._read_arrow_table(force=force), dimension_columns)
+            else:
+                ds = grid_batches(self.iter_batches(force=force), dimension_columns, coords)
+            return ds.chunk(chunks) if chunks is not None else ds
+        if engine != "netcdf":
+            raise ValueError(f"Unsupported engine '{engine}'. Supported engines: netcdf, arrow, beacon")
+
         if not force and not self.http_session.version_at_least(1, 5, 0):
             raise Exception("xarray dataset output requires the Beacon Node version to be atleast 1.5.0 or higher")
         
         # create tempfile for the netcdf file
         fd, path = tempfile.mkstemp(suffix=".nc")
+        os.close(fd)
         self.to_nd_netcdf(file_path=path, dimension_columns=dimension_columns,force=force)
 
         ds = xr.open_dataset(path, chunks=chunks)
@@ -126,30 +358,134 @@ class BaseQuery:
         
         return ds
 
-    def to_pandas_dataframe(self) -> pd.DataFrame:
-        """Execute the query and return the results as a pandas DataFrame"""
-        self.set_output(Parquet())
-        response = self.execute()
-        bytes_io = BytesIO(response.content)
-        return pd.read_parquet(bytes_io)
+    def to_pandas_dataframe(self, engine: Literal["parquet", "arrow"] = "parquet", dtype_backend: Literal["numpy", "pyarrow"] = "numpy", force=False) -> pd.DataFrame:
+        """Execute the query and return the results as a pandas DataFrame.
+
+        Args:
+            engine (str, optional): ``"parquet"`` requests a Parquet body and decodes it in memory.
+                ``"arrow"`` decodes the Arrow IPC stream as it arrives and converts it without
+                intermediate copies, keeping peak memory close to the size of the final frame
+                (requires Beacon Node >= 1.5.0). Defaults to ``"parquet"``.
+            dtype_backend (str, optional): ``"pyarrow"`` backs the columns with ``pd.ArrowDtype``
+                (zero-copy) instead of numpy dtypes. Defaults to ``"numpy"``.
+            force (bool, optional): Skip the Beacon Node version check of the ``"arrow"`` engine. Defaults to False.
+
+        Returns:
+            pd.DataFrame: The query results.
+        """
+        if dtype_backend not in ("numpy", "pyarrow"):
+            raise ValueError(f"Unsupported dtype_backend '{dtype_backend}'. Supported backends: numpy, pyarrow")
+
+        if engine == "parquet":
+            table = self._read_parquet_table()
+        elif engine == "arrow":
+            table = self._read_arrow_table(force=force)
+        else:
+            raise ValueError(f"Unsupported engine '{engine}'. Supported engines: arrow, parquet")
+
+        if dtype_backend == "pyarrow":
+            import pandas as pd
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        if getattr(self.http_session, "containment_cache", None) is not None:
+            # The table may be shared with the containment cache and must stay intact
+            return table.to_pandas()
+        # Release every Arrow column as soon as it has been converted to a pandas block
+        return table.to_pandas(split_blocks=True, self_destruct=True)
     
-    def to_geo_pandas_dataframe(self, longitude_column: str, latitude_column: str, crs: str = "EPSG:4326") -> gpd.GeoDataFrame:
+    def _arrow_schema(self, force=False) -> Optional[pa.Schema]:
+        """Return the Arrow schema of the query results without fetching them, if it can be derived"""
+        return None
+
+    def _grid_coordinates(self, dimension_columns: List[str], force=False) -> Optional[Dict[str, pa.Array]]:
+        """Return the coordinates of ``dimension_columns`` without fetching the results, if they can be probed"""
+        return None
+
+    def _split_by_key(self, key_column: str, n_files: Optional[int] = None, rows_per_file: Optional[int] = None, force=False) -> List["BaseQuery"]:
+        """Split the query into sub-queries over disjoint ranges of ``key_column`` values"""
+        raise ValueError(f"{type(self).__name__} cannot be split into several files; use a JSONQuery")
+
+    def _resume_from(self, rows: int) -> Tuple["BaseQuery", int]:
+        """Return a query for the results after the first ``rows`` rows, and how many of its rows to skip locally"""
+        return self, rows
+
+    def _dask_partitions(self, partition_by: Optional[str], npartitions: int, bounds=None) -> List["BaseQuery"]:
+        """Split the query into the sub-queries backing a Dask collection"""
+        if partition_by is not None:
+            raise ValueError(f"{type(self).__name__} cannot be partitioned; use a JSONQuery to partition by a column")
+        return [self]
+
+    def to_dask_dataframe(
+        self,
+        partition_by: Optional[str] = None,
+        npartitions: int = 8,
+        bounds: Optional[Tuple[Union[str, int, float, datetime], Union[str, int, float, datetime]]] = None,
+        force=False,
+        meta: Union[pd.DataFrame, pa.Schema, None] = None,
+    ) -> dd.DataFrame:
+        """Converts the query results to a lazy Dask DataFrame.
+
+        Each partition is a range sub-query on ``partition_by`` (see
+        :meth:`JSONQuery.partition_by_range`) that only runs when the partition is
+        computed, so results larger than memory can be processed out-of-core or on a
+        Dask cluster. The partition metadata comes from the table schema where possible,
+        and otherwise from a zero-row probe of the query; no partition runs up front.
+
+        Args:
+            partition_by (str | None, optional): The numeric or timestamp column to partition on.
+                Defaults to None, which yields a single lazily executed partition.
+            npartitions (int, optional): The number of partitions when ``partition_by`` is set. Defaults to 8.
+            bounds (tuple, optional): The ``(lower, upper)`` values of ``partition_by`` to split.
+            force (bool, optional): Skip the Beacon Node version check. Defaults to False.
+            meta (pd.DataFrame | pa.Schema, optional): The columns and dtypes of the result, skipping
+                the schema lookup.
+
+        Returns:
+            dd.DataFrame: The lazy Dask DataFrame.
+
+        Raises:
+            ValueError: If ``meta`` is not given and the result schema cannot be derived.
+        """
+        import dask.dataframe as dd
+
+        queries = self._dask_partitions(partition_by, npartitions, bounds=bounds)
+        if meta is None:
+            meta = self._arrow_schema(force=force)
+            if meta is None:
+                # Letting dask infer meta would execute a whole partition right here
+                raise ValueError(f"Cannot derive the result schema of this {type(self).__name__}; pass meta=")
+        if isinstance(meta, pa.Schema):
+            meta = meta.empty_table().to_pandas()
+        # Nullable integer columns come back as floats when a partition contains nulls,
+        # so partitions are not forced to match the schema-derived dtypes exactly
+        return dd.from_map(_read_partition, queries, meta=meta, label="beacon-query", enforce_metadata=False, force=force)
+
+    def __dask_tokenize__(self):
+        # Identical queries against the same node share Dask task names
+        return type(self).__name__, self.http_session.base_url, self.compile_query()
+
+    def to_geo_pandas_dataframe(self, longitude_column: str, latitude_column: str, crs: str = "EPSG:4326", spatial_sort: Optional[Literal["hilbert", "zorder"]] = None) -> gpd.GeoDataFrame:
         """Converts the query results to a GeoPandas GeoDataFrame.
 
         Args:
             longitude_column (str): The name of the column representing longitude.
             latitude_column (str): The name of the column representing latitude.
             crs (str, optional): The coordinate reference system to use. Defaults to "EPSG:4326".
+            spatial_sort (str, optional): ``"hilbert"`` or ``"zorder"`` to order the rows along a
+                space-filling curve of their coordinates instead of server order. Defaults to None.
 
         Returns:
             gpd.GeoDataFrame: The query results as a GeoPandas GeoDataFrame.
         """
-        
+        import geopandas as gpd
+        from pyarrow import parquet as pq
+
         self.set_output(GeoParquet(longitude_column=longitude_column, latitude_column=latitude_column))
-        response = self.execute()
-        bytes_io = BytesIO(response.content)
+        bytes_io = BytesIO(self._read_body())
         # Read into parquet arrow table 
         table = pq.read_table(bytes_io)
+        if spatial_sort is not None:
+            from ._geoparquet import spatial_order
+            table = table.take(spatial_order(table[longitude_column], table[latitude_column], spatial_sort))
         
         gdf = gpd.GeoDataFrame.from_arrow(table)
         gdf.set_crs(crs, inplace=True)
@@ -158,89 +494,259 @@ class BaseQuery:
     def to_parquet(self, file_path: str, streaming_chunk_size: int = 1024*1024):
         """Execute the query and save the results as a Parquet file"""
         self.set_output(Parquet())
-        response = self.execute()
-        with open(file_path, "wb") as f:
-            # Write the content of the response to a file
-            for chunk in response.iter_content(chunk_size=streaming_chunk_size):
-                if chunk:  # skip keep-alive chunks
-                    f.write(chunk)
+        self._stream_to_file(file_path, streaming_chunk_size)
                     
-    def to_geoparquet(self, file_path: str, longitude_column: str, latitude_column: str, streaming_chunk_size: int = 1024*1024):
-        """Execute the query and save the results as a GeoParquet file"""
-        self.set_output(GeoParquet(longitude_column=longitude_column, latitude_column=latitude_column))
-        response = self.execute()
-        with open(file_path, "wb") as f:
-            # Write the content of the response to a file
-            for chunk in response.iter_content(chunk_size=streaming_chunk_size):
-                if chunk:  # skip keep-alive chunks
-                    f.write(chunk)
+    def to_parquet_dataset(
+        self,
+        root: str,
+        partition_cols: Optional[List[str]] = None,
+        time_column: Optional[str] = None,
+        time_parts: Sequence[Literal["year", "month", "day", "hour"]] = ("year", "month"),
+        row_group_size: int = 131072,
+        compression: str = "zstd",
+        max_open_files: int = 64,
+        max_rows_per_file: int = 0,
+        existing_data_behavior: Literal["error", "overwrite_or_ignore", "delete_matching"] = "error",
+        batch_rows: int = 65536,
+        force: bool = False,
+    ) -> None:
+        """Stream the query results into a hive-partitioned Parquet dataset.
+
+        Arrow record batches are written as they arrive with ``pyarrow.dataset.write_dataset``,
+        e.g. into ``root/year=2021/month=3/platform=6901234/part-0.parquet``, so engines can
+        prune partitions instead of scanning one large file.
+
+        Args:
+            root (str): The directory of the dataset.
+            partition_cols (list[str], optional): Result columns to partition by, outermost first.
+            time_column (str, optional): Timestamp column to derive ``time_parts`` partition columns from;
+                they come before ``partition_cols``.
+            time_parts (Sequence[str], optional): Parts of ``time_column`` to partition by. Defaults to year and month.
+            row_group_size (int, optional): Rows per Parquet row group. Defaults to 131072.
+            compression (str, optional): Parquet compression codec. Defaults to ``"zstd"``.
+            max_open_files (int, optional): Maximum number of files kept open at once; the least recently
+                used file is closed when more partitions are active. Defaults to 64.
+            max_rows_per_file (int, optional): Start a new file after this many rows; 0 means unlimited.
+            existing_data_behavior (str, optional): What to do with data already under ``root``,
+                as in ``pyarrow.dataset.write_dataset``. Defaults to ``"error"``.
+            batch_rows (int, optional): Rows per streamed batch. Defaults to 65536.
+            force (bool, optional): Skip the Beacon Node version check. Defaults to False.
+        """
+        from ._writers import write_parquet_dataset
+        write_parquet_dataset(
+            self,
+            root,
+            partition_cols=partition_cols,
+            time_column=time_column,
+            time_parts=time_parts,
+            row_group_size=row_group_size,
+            compression=compression,
+            max_open_files=max_open_files,
+            max_rows_per_file=max_rows_per_file,
+            existing_data_behavior=existing_data_behavior,
+            batch_rows=batch_rows,
+            force=force,
+        )
+
+    def to_geoparquet(
+        self,
+        file_path: str,
+        longitude_column: str,
+        latitude_column: str,
+        streaming_chunk_size: int = 1024*1024,
+        spatial_sort: Optional[Literal["hilbert", "zorder"]] = None,
+        row_group_size: int = 65536,
+        compression: str = "zstd",
+        max_sort_rows: int = 2_000_000,
+        force: bool = False,
+    ):
+        """Execute the query and save the results as a GeoParquet file.
+
+        By default the file is written exactly as the server encodes it. With
+        ``spatial_sort`` the Arrow stream is written locally instead. Rows are
+        ordered along a Hilbert or Z-order curve of their coordinates and split into
+        row groups of ``row_group_size``. A ``bbox`` covering column is added, so
+        readers can skip row groups outside a bounding box. The sort runs out of core:
+        the stream is spilled next to ``file_path`` and sorted in buckets of about
+        ``max_sort_rows`` rows, so memory stays bounded by the bucket size.
+
+        Args:
+            file_path (str): The path of the GeoParquet file.
+            longitude_column (str): The name of the column representing longitude.
+            latitude_column (str): The name of the column representing latitude.
+            streaming_chunk_size (int, optional): Size of the chunks written to disk when the server
+                builds the file. Defaults to 1 MiB.
+            spatial_sort (str, optional): ``"hilbert"`` or ``"zorder"`` to build a spatially clustered
+                file locally (requires Beacon Node >= 1.5.0). Defaults to None.
+            row_group_size (int, optional): Rows per row group of a locally built file. Defaults to 65536.
+            compression (str, optional): Parquet compression of a locally built file. Defaults to ``"zstd"``.
+            max_sort_rows (int, optional): Rows sorted in memory at a time when building the file
+                locally. Defaults to 2,000,000.
+            force (bool, optional): Skip the Beacon Node version check. Defaults to False.
+        """
+        if spatial_sort is None:
+            self.set_output(GeoParquet(longitude_column=longitude_column, latitude_column=latitude_column))
+            self._stream_to_file(file_path, streaming_chunk_size)
+            return
+
+        from ._geoparquet import write_sorted_geoparquet
+        options = dict(curve=spatial_sort, row_group_size=row_group_size, compression=compression, max_sort_rows=max_sort_rows)
+        table = self._cached_superset()
+        if table is not None:
+            write_sorted_geoparquet(table.schema, table.to_batches(), file_path, longitude_column, latitude_column, **options)
+            return
+        body, stream = self._open_ipc_stream(force=force)
+        with body:
+            write_sorted_geoparquet(stream.schema, stream, file_path, longitude_column, latitude_column, **options)
                     
     def to_csv(self, file_path: str, streaming_chunk_size: int = 1024*1024):
         """Execute the query and save the results as a CSV file"""
         self.set_output(CSV())
-        response = self.execute()
-        with open(file_path, "wb") as f:
-            # Write the content of the response to a file
-            for chunk in response.iter_content(chunk_size=streaming_chunk_size):
-                if chunk:  # skip keep-alive chunks
-                    f.write(chunk)
+        self._stream_to_file(file_path, streaming_chunk_size)
                     
     def to_arrow(self, file_path: str, streaming_chunk_size: int = 1024*1024):
         """Execute the query and save the results as an Arrow file"""
         self.set_output(Arrow())
-        response = self.execute()
-        with open(file_path, "wb") as f:
-            # Write the content of the response to a file
-            for chunk in response.iter_content(chunk_size=streaming_chunk_size):
-                if chunk:  # skip keep-alive chunks
-                    f.write(chunk)
+        self._stream_to_file(file_path, streaming_chunk_size)
     
-    def to_netcdf(self, file_path: str, build_nc_local:bool = True, streaming_chunk_size: int = 1024*1024):
-        """Execute the query and save the results as an NetCDF file"""
-        if build_nc_local:
-            df = self.to_pandas_dataframe()
-            xdf = df.to_xarray()
-            xdf.to_netcdf(file_path, mode="w")
+    def to_netcdf(
+        self,
+        file_path: str,
+        build_nc_local:bool = True,
+        streaming_chunk_size: int = 1024*1024,
+        dimension_columns: Optional[List[str]] = None,
+        stream: bool = False,
+        batch_rows: int = 65536,
+        encoding: Optional[dict] = None,
+        force: bool = False,
+    ):
+        """Execute the query and save the results as an NetCDF file.
+
+        Args:
+            file_path (str): The path of the NetCDF file.
+            build_nc_local (bool, optional): Build the file locally from the query results instead of
+                having the server encode it. Defaults to True.
+            streaming_chunk_size (int, optional): Size of the chunks written to disk when the server
+                builds the file. Defaults to 1 MiB.
+            dimension_columns (list[str], optional): Columns to grid the results by when building
+                locally. Without them the variables share a single ``index`` dimension.
+            stream (bool, optional): Build the file locally by appending every Arrow batch to an
+                unlimited ``index`` dimension, keeping peak memory to about one batch
+                (requires Beacon Node >= 1.5.0). Defaults to False.
+            batch_rows (int, optional): Rows per appended batch and default chunk size when streaming. Defaults to 65536.
+            encoding (dict, optional): Per-variable ``netCDF4.Dataset.createVariable`` options when streaming,
+                keyed by column name, e.g. ``{"TEMP": {"complevel": 9, "chunksizes": (4096,)}}``.
+                Streamed string columns write their nulls as their ``_FillValue``, ``""`` unless
+                ``fill_value`` is given here, so an empty string also reads back as missing.
+            force (bool, optional): Skip the Beacon Node version check when streaming. Defaults to False.
+        """
+        if build_nc_local and stream:
+            if dimension_columns:
+                raise ValueError("dimension_columns cannot be combined with stream=True; streamed files use a single unlimited index dimension")
+            from ._writers import write_netcdf
+            write_netcdf(self, file_path, batch_rows=batch_rows, encoding=encoding, force=force)
+        elif build_nc_local:
+            from ._gridding import grid_table
+            ds = grid_table(self._read_parquet_table(), dimension_columns)
+            ds.to_netcdf(file_path, mode="w")
         else:
             self.set_output(NetCDF())  # Specify dimension columns as needed
-            response = self.execute()
-            with open(file_path, "wb") as f:
-                # Write the content of the response to a file
-                for chunk in response.iter_content(chunk_size=streaming_chunk_size):
-                    if chunk:  # skip keep-alive chunks
-                        f.write(chunk)
+            self._stream_to_file(file_path, streaming_chunk_size)
                         
     def to_nd_netcdf(self, file_path: str, dimension_columns: list[str], streaming_chunk_size: int = 1024*1024, force: bool = False):
         """Execute the query and save the results as an NdNetCDF file"""
         if not force and not self.http_session.version_at_least(1, 5, 0):
             raise Exception("NdNetCDF output format requires the Beacon Node version to be atleast 1.5.0 or higher")
         self.set_output(NdNetCDF(dimension_columns=dimension_columns))
-        response = self.execute()
-        with open(file_path, "wb") as f:
-            # Write the content of the response to a file
-            for chunk in response.iter_content(chunk_size=streaming_chunk_size):
-                if chunk:  # skip keep-alive chunks
-                    f.write(chunk)
+        self._stream_to_file(file_path, streaming_chunk_size)
         
-    def to_zarr(self, file_path: str):
-        # Read to pandas dataframe first
-        df = self.to_pandas_dataframe()
-        # Convert to Zarr format
-        xdf = df.to_xarray()
-        xdf.to_zarr(file_path, mode="w")
+    def to_zarr(self, file_path: str, chunk_rows: int = 65536, compressor: Any = None, encoding: Optional[dict] = None, resume: bool = False, force: bool = False) -> int:
+        """Stream the query results into a Zarr store along an ``index`` dimension.
+
+        Arrow record batches are appended one chunk-aligned region at a time, so
+        memory stays bounded by ``chunk_rows``. Integer and boolean columns are stored
+        as ``float64`` so that every region shares one dtype whether or not it holds nulls.
+
+        Args:
+            file_path (str): The path of the Zarr store.
+            chunk_rows (int, optional): Rows per Zarr chunk and per written region. Defaults to 65536.
+            compressor (optional): Compressor applied to every variable: a numcodecs codec such as
+                ``numcodecs.Blosc()`` on zarr 2, a bytes-to-bytes codec such as ``zarr.codecs.BloscCodec()``
+                (or a list of them) on zarr 3.
+            encoding (dict, optional): Extra per-variable Zarr encoding, keyed by column name.
+            resume (bool, optional): Continue an interrupted export of the same query after its last
+                completed region instead of overwriting the store. Needs a stable row order,
+                e.g. a sorted query. Defaults to False.
+            force (bool, optional): Skip the Beacon Node version check. Defaults to False.
+
+        Returns:
+            int: The number of rows in the store.
+        """
+        from ._writers import write_zarr
+        return write_zarr(self, file_path, chunk_rows=chunk_rows, compressor=compressor, encoding=encoding, resume=resume, force=force)
         
-    def to_odv(self, odv_output: Odv, file_path: str):
-        """Exports the query results to an ODV file.
+    def to_odv(
+        self,
+        odv_output: Odv,
+        file_path: str,
+        streaming_chunk_size: int = 1024*1024,
+        progress: Optional[Callable[[int], None]] = None,
+        n_files: Optional[int] = None,
+        rows_per_file: Optional[int] = None,
+        max_workers: int = 4,
+        force: bool = False,
+    ) -> List[str]:
+        """Exports the query results to an ODV file, or to several files produced concurrently.
+
+        With ``n_files`` or ``rows_per_file`` the export is split on ``odv_output.key_column``:
+        the sorted key values are divided into contiguous ranges, so every station or cruise
+        ends up whole in exactly one file. The parts are named after ``file_path`` with a
+        ``_000``-style suffix before the extension, or by formatting a ``{part}`` placeholder
+        in ``file_path``. Splitting is only supported by :class:`JSONQuery`.
 
         Args:
             odv_output (Odv): The ODV output format to use.
             file_path (str): The path to the file where the ODV data will be saved.
+            streaming_chunk_size (int, optional): Size of the chunks written to disk. Defaults to 1 MiB.
+            progress (Callable[[int], None], optional): Called with the total number of bytes written
+                so far, across all files, after every chunk.
+            n_files (int, optional): Split into this many files with about the same number of keys each.
+            rows_per_file (int, optional): Split into files of about this many rows; a key is never split,
+                so a file may hold more rows when one key exceeds the target. Counting the rows per key
+                streams the key column of every result row once before the export; only one count per
+                distinct key is kept in memory. ``n_files`` only fetches the distinct keys.
+            max_workers (int, optional): Maximum number of parts exported concurrently. Defaults to 4.
+            force (bool, optional): Skip the Beacon Node version check of the key lookup. Defaults to False.
+
+        Returns:
+            list[str]: The paths of the written files.
         """
-        self.set_output(odv_output)
-        response = self.execute()
-        with open(file_path, "wb") as f:
-            # Write the content of the response to a file
-            f.write(response.content)
+        on_chunk = None
+        if progress is not None:
+            lock = threading.Lock()
+            written = [0]
+
+            def on_chunk(size: int) -> None:
+                with lock:
+                    written[0] += size
+                    total = written[0]
+                progress(total)
+
+        if n_files is None and rows_per_file is None:
+            self.set_output(odv_output)
+            self._stream_to_file(file_path, streaming_chunk_size, on_chunk=on_chunk)
+            return [file_path]
+
+        parts = self._split_by_key(odv_output.key_column, n_files=n_files, rows_per_file=rows_per_file, force=force)
+        paths = [_part_path(file_path, index) for index in range(len(parts))]
+
+        def export(part: "BaseQuery", path: str) -> str:
+            part.set_output(odv_output)
+            part._stream_to_file(path, streaming_chunk_size, on_chunk=on_chunk)
+            return path
+
+        tasks = (functools.partial(export, part, path) for part, path in zip(parts, paths))
+        return list(_parallel.iter_in_order(tasks, max_workers))
         
 class SQLQuery(BaseQuery):
     def __init__(self, http_session: BaseBeaconSession, query: str):
@@ -250,9 +756,13 @@ class SQLQuery(BaseQuery):
     def compile(self) -> dict:
         return {"sql": self.query}
 
+    def _arrow_schema(self, force=False) -> Optional[pa.Schema]:
+        # The schema message of an empty result of the wrapped statement
+        probe = SQLQuery(self.http_session, f"SELECT * FROM ({self.query.strip().rstrip(';')}) AS schema_probe LIMIT 0")
+        return probe._read_arrow_table(force=force).schema
+
 class JSONQuery(BaseQuery):
     def __init__(self, http_session: BaseBeaconSession, _from: From):
-        print(f"Creating JSONQuery with from: {_from}")
         super().__init__(http_session)
         self._from = _from
         self.selects = []
@@ -273,6 +783,227 @@ class JSONQuery(BaseQuery):
             **self._from.to_dict(),
         }
     
+    def _copy(self) -> "JSONQuery":
+        """Return a copy whose clause lists can be modified without affecting this query"""
+        query = copy.copy(self)
+        query.selects = list(self.selects)
+        query.filters = list(self.filters)
+        query.sorts = list(self.sorts)
+        return query
+
+    def _split_by_key(self, key_column: str, n_files: Optional[int] = None, rows_per_file: Optional[int] = None, force=False) -> List["JSONQuery"]:
+        if (n_files is None) == (rows_per_file is None):
+            raise ValueError("Pass exactly one of n_files and rows_per_file")
+        if (n_files is not None and n_files <= 0) or (rows_per_file is not None and rows_per_file <= 0):
+            raise ValueError("n_files and rows_per_file must be positive integers")
+        if self.limit is not None or self.offset is not None:
+            raise ValueError("Queries with a limit or offset cannot be split")
+        import pyarrow.compute as pc
+
+        probe = self._copy()
+        probe.selects = [SelectColumn(column=key_column)]
+        probe.sorts = []
+        probe.distinct = None
+        if n_files is not None:
+            # Only the distinct keys are needed to balance files by key
+            probe.set_distinct([key_column])
+            probe.add_sort(key_column)
+            keys = probe._read_arrow_table(force=force).column(0)
+            has_nulls = keys.null_count > 0
+            keys = pc.drop_null(keys)
+            values = keys.take(pc.sort_indices(keys)).to_pylist()
+        else:
+            # Row counts per key need the key of every row; stream them and keep one count per key
+            counts: Dict[Any, int] = {}
+            has_nulls = False
+            for batch in probe.iter_batches(force=force):
+                column = batch.column(0)
+                has_nulls = has_nulls or column.null_count > 0
+                batch_counts = pc.value_counts(pc.drop_null(column))
+                for value, count in zip(batch_counts.field("values").to_pylist(), batch_counts.field("counts").to_pylist()):
+                    counts[value] = counts.get(value, 0) + count
+            values = sorted(counts)
+            rows = [counts[value] for value in values]
+
+        groups: List[Tuple[Any, Any]] = []
+        if n_files is not None:
+            size, extra = divmod(len(values), n_files)
+            start = 0
+            for index in range(min(n_files, len(values))):
+                stop = start + size + (1 if index < extra else 0)
+                groups.append((values[start], values[stop - 1]))
+                start = stop
+        else:
+            first, total = None, 0
+            for value, count in zip(values, rows):
+                if first is None:
+                    first = value
+                total += count
+                if total >= rows_per_file:
+                    groups.append((first, value))
+                    first, total = None, 0
+            if first is not None:
+                groups.append((first, values[-1]))
+
+        parts = []
+        for lower, upper in groups:
+            part = self._copy()
+            part.filters.append(RangeFilter(column=key_column, gt_eq=lower, lt_eq=upper))
+            parts.append(part)
+        if has_nulls:
+            part = self._copy()
+            part.filters.append(FilterIsNull(column=key_column))
+            parts.append(part)
+        return parts
+
+    def _resume_from(self, rows: int) -> Tuple["JSONQuery", int]:
+        if rows == 0:
+            return self, 0
+        # Let the server skip the rows that were already written
+        query = self._copy()
+        query.offset = (self.offset or 0) + rows
+        if self.limit is not None:
+            query.limit = max(self.limit - rows, 0)
+        return query, 0
+
+    def _fetch_column_bounds(self, column: str) -> Tuple[_parallel.Bound, _parallel.Bound]:
+        """Ask the server for the minimum and maximum of ``column`` under the current filters"""
+        from pyarrow import parquet as pq
+
+        bounds = []
+        for ascending in (True, False):
+            query = self._copy()
+            query.selects = [SelectColumn(column=column)]
+            query.filters.append(IsNotNullFilter(column=column))
+            query.sorts = [SortColumn(column=column, ascending=ascending)]
+            query.distinct = None
+            query.limit = 1
+            query.set_output(Parquet())
+            table = pq.read_table(BytesIO(query._read_body()))
+            if table.num_rows == 0:
+                raise Exception(f"Cannot determine partition bounds: column '{column}' has no values")
+            bounds.append(_parallel.coerce_bound(table.column(0)[0].as_py()))
+        return bounds[0], bounds[1]
+
+    def _cached_superset(self) -> Optional[pa.Table]:
+        cache = getattr(self.http_session, "containment_cache", None)
+        return cache.lookup(self) if cache is not None else None
+
+    def _remember(self, table: pa.Table) -> None:
+        cache = getattr(self.http_session, "containment_cache", None)
+        if cache is not None:
+            cache.store(self, table)
+
+    def _arrow_schema(self, force=False) -> Optional[pa.Schema]:
+        if isinstance(self._from, FromTable) and all(isinstance(s, SelectColumn) for s in self.selects):
+            # Plain column projections of a table can be typed from the table schema
+            from ..table import DataTable
+            table_schema = DataTable(self.http_session, self._from.table).get_table_schema_arrow()
+            if not self.selects:
+                return table_schema
+            if all(table_schema.get_field_index(s.column) >= 0 for s in self.selects):
+                return pa.schema([table_schema.field(s.column).with_name(s.alias or s.column) for s in self.selects])
+
+        # Fall back to the schema message of an empty result
+        probe = self._copy()
+        probe.limit = 0
+        probe.offset = None
+        return probe._read_arrow_table(force=force).schema
+
+    def _grid_coordinates(self, dimension_columns: List[str], force=False) -> Optional[Dict[str, pa.Array]]:
+        # A distinct probe per dimension only matches the rows when nothing is computed or truncated
+        if self.limit is not None or self.offset is not None or not all(isinstance(s, SelectColumn) for s in self.selects):
+            return None
+        from ..xarray_backend import _source_columns, fetch_coordinates
+        # Rows with a null in any dimension are dropped, so they contribute no coordinates either
+        probe = self._copy()
+        probe.filters.extend(IsNotNullFilter(column=source) for source in _source_columns(self, dimension_columns).values())
+        return fetch_coordinates(probe, dimension_columns, force=force)
+
+    def _dask_partitions(self, partition_by: Optional[str], npartitions: int, bounds=None) -> List["BaseQuery"]:
+        if partition_by is None:
+            return [self]
+        return self.partition_by_range(partition_by, npartitions, bounds=bounds)
+
+    def partition_by_range(
+        self,
+        partition_column: str,
+        n_partitions: int,
+        bounds: Optional[Tuple[Union[str, int, float, datetime], Union[str, int, float, datetime]]] = None,
+    ) -> List["JSONQuery"]:
+        """Splits the query into disjoint sub-queries over value ranges of a numeric or time column.
+
+        Every sub-query keeps the selects, filters and sorts of this query and adds a range
+        filter on ``partition_column``; together they return exactly the rows of this query.
+
+        Args:
+            partition_column (str): The numeric or timestamp column to split on.
+            n_partitions (int): The number of ranges to create. Narrow integer ranges may produce fewer.
+            bounds (tuple, optional): The ``(lower, upper)`` values of ``partition_column`` to split.
+                Defaults to the bounds of the existing range filters on the column, or the column's
+                minimum and maximum as reported by the server.
+
+        Returns:
+            list[JSONQuery]: The sub-queries, ordered by ascending range.
+        """
+        if self.limit is not None or self.offset is not None:
+            raise ValueError("Queries with a limit or offset cannot be partitioned")
+        if self.distinct is not None and partition_column not in self.distinct.columns:
+            raise ValueError(f"Partition column '{partition_column}' must be one of the distinct columns")
+
+        if bounds is not None:
+            lower, upper = _parallel.coerce_bound(bounds[0]), _parallel.coerce_bound(bounds[1])
+        else:
+            lower, upper = _parallel.infer_bounds(self.filters, partition_column) or self._fetch_column_bounds(partition_column)
+
+        edges = _parallel.split_range(lower, upper, n_partitions)
+        queries = []
+        for range_filter in _parallel.range_partition_filters(partition_column, edges):
+            query = self._copy()
+            query.filters.append(range_filter)
+            queries.append(query)
+        return queries
+
+    def execute_partitioned(
+        self,
+        partition_column: str,
+        n_partitions: int = 8,
+        max_workers: int = 4,
+        bounds: Optional[Tuple[Union[str, int, float, datetime], Union[str, int, float, datetime]]] = None,
+        max_rows: int = 65536,
+        max_buffered: int = 4,
+        force=False,
+    ) -> Iterator[pa.RecordBatch]:
+        """Executes the query as concurrent range partitions and streams the merged Arrow batches.
+
+        The query is split with :meth:`partition_by_range` and the sub-queries run on a thread
+        pool with at most ``max_workers`` requests in flight. Batches are yielded partition by
+        partition in ascending range order, so the output order is deterministic; sorts are
+        applied per partition.
+
+        Every open partition decodes its Arrow stream into a queue of at most ``max_buffered``
+        batches of ``max_rows`` rows and then stops reading until the consumer catches up, so
+        peak memory is about ``max_workers * max_buffered * max_rows`` rows regardless of the
+        partition sizes.
+
+        Args:
+            partition_column (str): The numeric or timestamp column to split on.
+            n_partitions (int, optional): The number of sub-queries. Defaults to 8.
+            max_workers (int, optional): The maximum number of concurrent requests. Defaults to 4.
+            bounds (tuple, optional): The ``(lower, upper)`` values of ``partition_column`` to split.
+            max_rows (int, optional): Number of rows per yielded batch. Defaults to 65536.
+            max_buffered (int, optional): Number of batches read ahead per open partition. Defaults to 4.
+            force (bool, optional): Skip the Beacon Node version check. Defaults to False.
+
+        Yields:
+            pa.RecordBatch: The record batches of all partitions.
+        """
+        if max_rows <= 0:
+            raise ValueError("max_rows must be a positive integer")
+        queries = self.partition_by_range(partition_column, n_partitions, bounds=bounds)
+        streams = (functools.partial(query.iter_batches, max_rows=max_rows, force=force) for query in queries)
+        yield from _parallel.iter_streams_in_order(streams, max_workers, max_buffered)
+
     def select(self, selects: List[Select]) -> Self:
         self.selects = selects
         return self
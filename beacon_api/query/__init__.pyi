@@ -7,6 +7,7 @@ from .filter import *
 from .distinct import *
 from .sort import *
 import abc
+import dask.dataframe as dd
 import geopandas as gpd
 import pandas as pd
 import pyarrow as pa
@@ -16,8 +17,8 @@ from _typeshed import Incomplete
 from abc import abstractmethod
 from datetime import datetime
 from requests import Response as Response
-from typing import Iterator
-from typing_extensions import Optional, Self, Union
+from typing import Any, Callable, Iterator, Sequence
+from typing_extensions import Literal, Optional, Self, Union
 
 class BaseQuery(metaclass=abc.ABCMeta):
     http_session: Incomplete
@@ -31,17 +32,20 @@ class BaseQuery(metaclass=abc.ABCMeta):
     def explain(self) -> dict: ...
     def execute(self, stream: bool = False) -> Response: ...
     def execute_streaming(self, force: bool = False) -> pa.RecordBatchStreamReader: ...
-    def to_xarray_dataset(self, dimension_columns: list[str], chunks: Union[dict, None] = None, auto_cleanup: bool = True, force: bool = False) -> xr.Dataset: ...
-    def to_pandas_dataframe(self) -> pd.DataFrame: ...
-    def to_geo_pandas_dataframe(self, longitude_column: str, latitude_column: str, crs: str = 'EPSG:4326') -> gpd.GeoDataFrame: ...
+    def iter_batches(self, max_rows: int = 65536, columns: Optional[list[str]] = None, force: bool = False) -> Iterator[pa.RecordBatch]: ...
+    def to_xarray_dataset(self, dimension_columns: list[str], chunks: Union[dict, None] = None, auto_cleanup: bool = True, force: bool = False, engine: Literal["netcdf", "arrow", "beacon"] = "netcdf") -> xr.Dataset: ...
+    def to_dask_dataframe(self, partition_by: Optional[str] = None, npartitions: int = 8, bounds: Optional[tuple[Union[str, int, float, datetime], Union[str, int, float, datetime]]] = None, force: bool = False, meta: Union[pd.DataFrame, pa.Schema, None] = None) -> dd.DataFrame: ...
+    def to_pandas_dataframe(self, engine: Literal['parquet', 'arrow'] = 'parquet', dtype_backend: Literal['numpy', 'pyarrow'] = 'numpy', force: bool = False) -> pd.DataFrame: ...
+    def to_geo_pandas_dataframe(self, longitude_column: str, latitude_column: str, crs: str = 'EPSG:4326', spatial_sort: Literal['hilbert', 'zorder'] | None = None) -> gpd.GeoDataFrame: ...
     def to_parquet(self, file_path: str, streaming_chunk_size: int = ...): ...
-    def to_geoparquet(self, file_path: str, longitude_column: str, latitude_column: str, streaming_chunk_size: int = ...): ...
+    def to_parquet_dataset(self, root: str, partition_cols: list[str] | None = None, time_column: str | None = None, time_parts: Sequence[Literal['year', 'month', 'day', 'hour']] = ..., row_group_size: int = 131072, compression: str = 'zstd', max_open_files: int = 64, max_rows_per_file: int = 0, existing_data_behavior: Literal['error', 'overwrite_or_ignore', 'delete_matching'] = 'error', batch_rows: int = 65536, force: bool = False) -> None: ...
+    def to_geoparquet(self, file_path: str, longitude_column: str, latitude_column: str, streaming_chunk_size: int = ..., spatial_sort: Literal['hilbert', 'zorder'] | None = None, row_group_size: int = 65536, compression: str = 'zstd', max_sort_rows: int = 2000000, force: bool = False): ...
     def to_csv(self, file_path: str, streaming_chunk_size: int = ...): ...
     def to_arrow(self, file_path: str, streaming_chunk_size: int = ...): ...
-    def to_netcdf(self, file_path: str, build_nc_local: bool = True, streaming_chunk_size: int = ...): ...
+    def to_netcdf(self, file_path: str, build_nc_local: bool = True, streaming_chunk_size: int = ..., dimension_columns: list[str] | None = None, stream: bool = False, batch_rows: int = 65536, encoding: dict | None = None, force: bool = False): ...
     def to_nd_netcdf(self, file_path: str, dimension_columns: list[str], streaming_chunk_size: int = ..., force: bool = False): ...
-    def to_zarr(self, file_path: str): ...
-    def to_odv(self, odv_output: Odv, file_path: str): ...
+    def to_zarr(self, file_path: str, chunk_rows: int = 65536, compressor: Any = None, encoding: dict | None = None, resume: bool = False, force: bool = False) -> int: ...
+    def to_odv(self, odv_output: Odv, file_path: str, streaming_chunk_size: int = ..., progress: Callable[[int], None] | None = None, n_files: int | None = None, rows_per_file: int | None = None, max_workers: int = 4, force: bool = False) -> list[str]: ...
 
 class SQLQuery(BaseQuery):
     query: Incomplete
@@ -57,6 +61,8 @@ class JSONQuery(BaseQuery):
     offset: Incomplete
     def __init__(self, http_session: BaseBeaconSession, _from: From) -> None: ...
     def compile(self) -> dict: ...
+    def partition_by_range(self, partition_column: str, n_partitions: int, bounds: Optional[tuple[Union[str, int, float, datetime], Union[str, int, float, datetime]]] = None) -> list[JSONQuery]: ...
+    def execute_partitioned(self, partition_column: str, n_partitions: int = 8, max_workers: int = 4, bounds: Optional[tuple[Union[str, int, float, datetime], Union[str, int, float, datetime]]] = None, max_rows: int = 65536, max_buffered: int = 4, force: bool = False) -> Iterator[pa.RecordBatch]: ...
     def select(self, selects: list[Select]) -> Self: ...
     def add_select(self, select: Select) -> Self: ...
     def add_selects(self, selects: list[Select]) -> Self: ...
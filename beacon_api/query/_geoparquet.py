@@ -0,0 +1,306 @@
+"""Local GeoParquet writer that clusters rows along a space-filling curve.
+
+Rows are ordered by the Hilbert or Z-order index of their longitude/latitude,
+quantized to a 2^16 x 2^16 grid over the extent of the data, so every row
+group covers a compact area. Next to a WKB point ``geometry`` column the file
+gets a ``bbox`` struct column declared as the GeoParquet 1.1 bbox covering: its
+Parquet statistics give each row group's bounding box, which lets spatial
+readers skip row groups outside their query window.
+
+The writer consumes a stream of record batches and sorts out of core: rows
+are spilled to disk, split into buckets of consecutive curve keys, and each
+bucket is sorted in memory on its own, so peak memory is bounded by the
+bucket size rather than by the size of the result.
+"""
+
+import json
+import os
+import tempfile
+from typing import Iterable, List, Literal, Optional, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+CurveLiteral = Literal["hilbert", "zorder"]
+ArrowColumn = Union[pa.Array, pa.ChunkedArray]
+
+_ORDER = 16
+_MAX_BINARY_BYTES = np.iinfo(np.int32).max
+_WKB_POINT = np.dtype([("byte_order", "u1"), ("geometry_type", "<u4"), ("x", "<f8"), ("y", "<f8")], align=False)
+
+
+def hilbert_index(x: np.ndarray, y: np.ndarray, order: int = _ORDER) -> np.ndarray:
+    """Return the Hilbert curve distance of integer grid cells ``(x, y)`` on a ``2**order`` grid"""
+    n = 1 << order
+    x = x.astype(np.int64)
+    y = y.astype(np.int64)
+    d = np.zeros(len(x), dtype=np.uint64)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += np.uint64(s * s) * ((3 * rx.astype(np.uint64)) ^ ry.astype(np.uint64))
+        # Rotate the quadrant so the curve stays continuous
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return d
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    v = v.astype(np.uint64) & np.uint64(0xFFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x33333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x55555555)
+    return v
+
+
+def zorder_index(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Return the Morton (Z-order) code of 16-bit integer grid cells ``(x, y)``"""
+    return _spread_bits(x) | (_spread_bits(y) << np.uint64(1))
+
+
+Extent = Tuple[float, float, float, float]
+
+
+def _coordinates(longitude: ArrowColumn, latitude: ArrowColumn) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return longitude and latitude as float64 arrays and the mask of rows with finite coordinates"""
+    lon = np.asarray(pc.cast(longitude, pa.float64()).to_numpy(zero_copy_only=False), dtype=np.float64)
+    lat = np.asarray(pc.cast(latitude, pa.float64()).to_numpy(zero_copy_only=False), dtype=np.float64)
+    return lon, lat, np.isfinite(lon) & np.isfinite(lat)
+
+
+def curve_keys(lon: np.ndarray, lat: np.ndarray, valid: np.ndarray, extent: Extent, curve: CurveLiteral = "hilbert") -> np.ndarray:
+    """Return the ``curve`` index of every point on a 2^16 grid over ``extent``; invalid points get the largest key"""
+    cells = (1 << _ORDER) - 1
+    grid = []
+    for values, low, high in ((lon, extent[0], extent[2]), (lat, extent[1], extent[3])):
+        scale = cells / (high - low) if high > low else 0.0
+        cell = np.round((np.where(valid, values, low) - low) * scale)
+        grid.append(np.where(valid, np.clip(cell, 0, cells), 0).astype(np.int64))
+    key = hilbert_index(*grid) if curve == "hilbert" else zorder_index(*grid)
+    key[~valid] = np.iinfo(np.uint64).max
+    return key
+
+
+def _check_curve(curve: str) -> None:
+    if curve not in ("hilbert", "zorder"):
+        raise ValueError(f"Unsupported curve '{curve}'. Supported curves: hilbert, zorder")
+
+
+def spatial_order(longitude: pa.ChunkedArray, latitude: pa.ChunkedArray, curve: CurveLiteral = "hilbert") -> np.ndarray:
+    """Return the row order that sorts points along ``curve``; rows without coordinates come last"""
+    _check_curve(curve)
+    lon, lat, valid = _coordinates(longitude, latitude)
+    if not valid.any():
+        return np.arange(len(lon))
+    extent = (lon[valid].min(), lat[valid].min(), lon[valid].max(), lat[valid].max())
+    return np.argsort(curve_keys(lon, lat, valid, extent, curve), kind="stable")
+
+
+def point_columns(longitude: ArrowColumn, latitude: ArrowColumn) -> Tuple[pa.Array, pa.Array]:
+    """Build the WKB point ``geometry`` column and its ``bbox`` covering column"""
+    lon_array = pc.cast(longitude, pa.float64()).combine_chunks()
+    lat_array = pc.cast(latitude, pa.float64()).combine_chunks()
+    valid = pc.and_(pc.is_valid(lon_array), pc.is_valid(lat_array))
+    lon = lon_array.to_numpy(zero_copy_only=False)
+    lat = lat_array.to_numpy(zero_copy_only=False)
+
+    points = np.empty(len(lon), dtype=_WKB_POINT)
+    points["byte_order"] = 1
+    points["geometry_type"] = 1
+    points["x"] = lon
+    points["y"] = lat
+    # 32-bit offsets address at most 2 GiB of WKB, about 102M points
+    size = _WKB_POINT.itemsize * len(lon)
+    binary_type, offset_dtype = (pa.binary(), np.int32) if size <= _MAX_BINARY_BYTES else (pa.large_binary(), np.int64)
+    offsets = np.arange(0, size + 1, _WKB_POINT.itemsize, dtype=offset_dtype)
+    wkb = pa.Array.from_buffers(binary_type, len(lon), [None, pa.py_buffer(offsets), pa.py_buffer(points.tobytes())])
+    geometry = pc.if_else(valid, wkb, pa.nulls(len(lon), binary_type))
+
+    x = pc.if_else(valid, lon_array, pa.nulls(len(lon), pa.float64()))
+    y = pc.if_else(valid, lat_array, pa.nulls(len(lon), pa.float64()))
+    bbox = pa.StructArray.from_arrays([x, y, x, y], names=["xmin", "ymin", "xmax", "ymax"], mask=pc.invert(valid))
+    return geometry, bbox
+
+
+def geo_metadata(extent: Optional[Extent]) -> dict:
+    """GeoParquet 1.1 metadata for a WKB point column with a bbox covering; ``extent`` is None without points"""
+    column = {
+        "encoding": "WKB",
+        "geometry_types": ["Point"],
+        "covering": {"bbox": {key: ["bbox", key] for key in ("xmin", "ymin", "xmax", "ymax")}},
+    }
+    if extent is not None:
+        column["bbox"] = [float(value) for value in extent]
+    return {"version": "1.1.0", "primary_column": "geometry", "columns": {"geometry": column}}
+
+
+_BBOX_TYPE = pa.struct([(key, pa.float64()) for key in ("xmin", "ymin", "xmax", "ymax")])
+_SAMPLE_SIZE = 65536
+
+
+class _Sample:
+    """Evenly spaced sample of a stream of points, thinned as the stream grows"""
+
+    def __init__(self, size: int = _SAMPLE_SIZE):
+        self.size = size
+        self.stride = 1
+        self.seen = 0
+        self.lon: List[np.ndarray] = []
+        self.lat: List[np.ndarray] = []
+
+    def add(self, lon: np.ndarray, lat: np.ndarray) -> None:
+        take = np.arange((-self.seen) % self.stride, len(lon), self.stride)
+        self.seen += len(lon)
+        self.lon.append(lon[take])
+        self.lat.append(lat[take])
+        if sum(len(part) for part in self.lon) > 2 * self.size:
+            self.lon, self.lat = [np.concatenate(self.lon)[::2]], [np.concatenate(self.lat)[::2]]
+            self.stride *= 2
+
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.lon:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(self.lon), np.concatenate(self.lat)
+
+
+def _bucket_edges(sample: _Sample, extent: Extent, curve: CurveLiteral, n_buckets: int) -> np.ndarray:
+    """Curve keys splitting the sampled points into ``n_buckets`` groups of similar size"""
+    lon, lat = sample.points()
+    keys = np.sort(curve_keys(lon, lat, np.ones(len(lon), dtype=bool), extent, curve))
+    positions = (np.arange(1, n_buckets) * len(keys)) // n_buckets
+    return np.unique(keys[positions])
+
+
+def write_sorted_geoparquet(
+    schema: pa.Schema,
+    batches: Iterable[pa.RecordBatch],
+    file_path: str,
+    longitude_column: str,
+    latitude_column: str,
+    curve: CurveLiteral = "hilbert",
+    row_group_size: int = 65536,
+    compression: str = "zstd",
+    max_sort_rows: int = 2_000_000,
+    spill_dir: Optional[str] = None,
+) -> None:
+    """Write a stream of ``batches`` as GeoParquet with rows clustered along ``curve``.
+
+    The sort runs out of core in bounded memory. The batches are first spilled to
+    an Arrow file while the extent of the coordinates is measured and a sample of
+    points is kept. The sampled curve keys then split the rows into buckets of
+    about ``max_sort_rows`` rows, each spilled to its own file. Every bucket is
+    read back, sorted in memory and written as row groups of ``row_group_size``.
+    Peak memory is about one bucket plus one row group; disk use is about twice
+    the Arrow size of the result, under ``spill_dir`` (the output directory by
+    default).
+
+    Raises:
+        ValueError: If a coordinate column is missing or the result already has a
+            ``geometry`` or ``bbox`` column.
+    """
+    from pyarrow import parquet as pq
+
+    _check_curve(curve)
+    for name in (longitude_column, latitude_column):
+        if schema.get_field_index(name) < 0:
+            raise ValueError(f"Column {name} is not part of the query result")
+    for name in ("geometry", "bbox"):
+        if schema.get_field_index(name) >= 0:
+            raise ValueError(f"The query result already has a '{name}' column")
+    if row_group_size <= 0 or max_sort_rows <= 0:
+        raise ValueError("row_group_size and max_sort_rows must be positive integers")
+    if row_group_size * _WKB_POINT.itemsize > _MAX_BINARY_BYTES:
+        raise ValueError(f"row_group_size must stay below {_MAX_BINARY_BYTES // _WKB_POINT.itemsize} rows")
+
+    spill_dir = spill_dir or os.path.dirname(os.path.abspath(file_path))
+    with tempfile.TemporaryDirectory(prefix=".geoparquet-", dir=spill_dir) as tmp_dir:
+        # Pass 1: spill the stream, measure the extent and sample the points
+        spill_path = os.path.join(tmp_dir, "result.arrow")
+        sample = _Sample()
+        low, high = np.array([np.inf, np.inf]), np.array([-np.inf, -np.inf])
+        rows = valid_rows = 0
+        with pa.OSFile(spill_path, "wb") as sink, pa.ipc.new_file(sink, schema) as spill:
+            for batch in batches:
+                spill.write_batch(batch)
+                rows += batch.num_rows
+                lon, lat, valid = _coordinates(batch.column(longitude_column), batch.column(latitude_column))
+                if valid.any():
+                    lon, lat = lon[valid], lat[valid]
+                    low = np.minimum(low, [lon.min(), lat.min()])
+                    high = np.maximum(high, [lon.max(), lat.max()])
+                    sample.add(lon, lat)
+                    valid_rows += len(lon)
+        extent: Optional[Extent] = (float(low[0]), float(low[1]), float(high[0]), float(high[1])) if valid_rows else None
+
+        # Pass 2: split the rows into buckets of consecutive curve keys, as (path, needs sorting)
+        if extent is None or rows <= max_sort_rows:
+            buckets = [(spill_path, extent is not None)]
+        else:
+            edges = _bucket_edges(sample, extent, curve, -(-valid_rows // max_sort_rows))
+            paths = [os.path.join(tmp_dir, f"bucket-{index:05d}.arrow") for index in range(len(edges) + 2)]
+            writers: dict = {}
+            try:
+                with pa.memory_map(spill_path) as source:
+                    reader = pa.ipc.open_file(source)
+                    for index in range(reader.num_record_batches):
+                        batch = reader.get_batch(index)
+                        lon, lat, valid = _coordinates(batch.column(longitude_column), batch.column(latitude_column))
+                        # Rows without coordinates form the last bucket
+                        bucket = np.where(valid, np.searchsorted(edges, curve_keys(lon, lat, valid, extent, curve), side="right"), len(edges) + 1)
+                        order = np.argsort(bucket, kind="stable")
+                        bounds = np.searchsorted(bucket[order], np.arange(len(paths) + 1))
+                        for target in np.flatnonzero(np.diff(bounds)).tolist():
+                            if target not in writers:
+                                writers[target] = pa.ipc.new_file(paths[target], schema)
+                            writers[target].write_batch(batch.take(pa.array(order[bounds[target]:bounds[target + 1]])))
+            finally:
+                for writer in writers.values():
+                    writer.close()
+            os.remove(spill_path)
+            buckets = [(path, index <= len(edges)) for index, path in enumerate(paths) if index in writers]
+
+        # Pass 3: sort every bucket and write it in row groups
+        metadata = dict(schema.metadata or {})
+        metadata[b"geo"] = json.dumps(geo_metadata(extent)).encode()
+        out_schema = schema.append(pa.field("geometry", pa.binary())).append(pa.field("bbox", _BBOX_TYPE)).with_metadata(metadata)
+        tmp_path = f"{file_path}.part"
+        try:
+            with pq.ParquetWriter(tmp_path, out_schema, compression=compression) as writer:
+                pending = schema.empty_table()
+
+                def write_row_group(rows: pa.Table) -> None:
+                    geometry, bbox = point_columns(rows[longitude_column], rows[latitude_column])
+                    rows = rows.append_column("geometry", geometry).append_column("bbox", bbox)
+                    writer.write_table(rows.cast(out_schema), row_group_size=row_group_size)
+
+                for path, needs_sorting in buckets:
+                    with pa.memory_map(path) as source:
+                        reader = pa.ipc.open_file(source)
+                        if needs_sorting:
+                            table = reader.read_all()
+                            lon, lat, valid = _coordinates(table[longitude_column], table[latitude_column])
+                            parts = [table.take(np.argsort(curve_keys(lon, lat, valid, extent, curve), kind="stable"))]
+                            del table
+                        else:
+                            parts = (pa.Table.from_batches([reader.get_batch(index)]) for index in range(reader.num_record_batches))
+                        for part in parts:
+                            pending = pa.concat_tables([pending, part])
+                            start = 0
+                            while pending.num_rows - start >= row_group_size:
+                                write_row_group(pending.slice(start, row_group_size))
+                                start += row_group_size
+                            # Copy the remainder so it does not keep the whole bucket alive
+                            remainder = pending.slice(start)
+                            pending = remainder.take(np.arange(remainder.num_rows))
+                if pending.num_rows:
+                    write_row_group(pending)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
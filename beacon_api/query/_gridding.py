@@ -0,0 +1,200 @@
+"""Pivot long-format Arrow results into N-dimensional xarray datasets.
+
+Every dimension column is factorized with ``pyarrow.compute`` into sorted
+coordinates and integer codes, which give each row a flat position in the grid.
+When the rows cover every cell exactly once the columns are reshaped as they are
+(the *dense* case, keeping their dtype); otherwise they are scattered into
+preallocated arrays filled with missing values (the *sparse* case).
+
+:func:`grid_table` needs the complete result in memory next to the grid.
+:func:`grid_batches` instead takes the coordinates up front (e.g. from
+:func:`beacon_api.xarray_backend.fetch_coordinates`) and scatters a stream of
+record batches into the grid as they arrive, so only the grid and one batch are
+held at a time.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import xarray as xr
+
+logger = logging.getLogger(__name__)
+
+ArrowColumn = Union[pa.Array, pa.ChunkedArray]
+
+
+def fill_dtype(data_type: pa.DataType) -> Tuple[np.dtype, Any]:
+    """Return the numpy dtype and fill value holding ``data_type`` next to missing cells"""
+    if pa.types.is_floating(data_type):
+        return np.dtype(data_type.to_pandas_dtype()), np.nan
+    if pa.types.is_integer(data_type) or pa.types.is_boolean(data_type):
+        # Integers and booleans have no missing value of their own
+        return np.dtype("float64"), np.nan
+    if pa.types.is_timestamp(data_type) or pa.types.is_date(data_type):
+        return np.dtype("datetime64[ns]"), np.datetime64("NaT")
+    return np.dtype(object), None
+
+
+def to_numpy(column: ArrowColumn, dtype: Optional[np.dtype] = None) -> np.ndarray:
+    """Convert an Arrow column to numpy, as ``dtype`` or its own type when it has no nulls"""
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    data_type = column.type
+    if dtype is None:
+        if column.null_count == 0 and (pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_boolean(data_type)):
+            return column.to_numpy(zero_copy_only=False)
+        dtype = fill_dtype(data_type)[0]
+    if dtype == np.dtype("datetime64[ns]"):
+        return column.cast(pa.timestamp("ns")).to_numpy(zero_copy_only=False)
+    if dtype.kind == "f":
+        return column.cast(pa.float64()).fill_null(np.nan).to_numpy(zero_copy_only=False).astype(dtype, copy=False)
+    return np.asarray(column.to_pylist(), dtype=object)
+
+
+def factorize(column: ArrowColumn) -> Tuple[pa.Array, np.ndarray]:
+    """Return the sorted distinct values of a null-free column and every row's position among them"""
+    values = pc.unique(column)
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    values = values.take(pc.sort_indices(values))
+    codes = pc.index_in(column, value_set=values)
+    if isinstance(codes, pa.ChunkedArray):
+        codes = codes.combine_chunks()
+    return values, codes.to_numpy(zero_copy_only=False).astype(np.int64, copy=False)
+
+
+def grid_table(table: pa.Table, dimension_columns: Optional[Sequence[str]] = None) -> xr.Dataset:
+    """Pivot a long-format table into an :class:`xarray.Dataset` indexed by ``dimension_columns``.
+
+    The whole table is held next to the gridded arrays; use :func:`grid_batches`
+    when the coordinates are known in advance. Rows with a null dimension value are dropped. Without dimension columns the
+    result is one-dimensional along ``index``, like ``DataFrame.to_xarray()``.
+
+    Args:
+        table: Query results, one row per grid cell.
+        dimension_columns: Columns whose distinct values become the dataset coordinates.
+
+    Raises:
+        ValueError: If a dimension column is missing or several rows share one grid cell.
+    """
+    if not dimension_columns:
+        variables = {name: ("index", to_numpy(table[name])) for name in table.column_names}
+        return xr.Dataset(variables, coords={"index": np.arange(table.num_rows)})
+
+    dimension_columns = list(dimension_columns)
+    missing = [dim for dim in dimension_columns if dim not in table.column_names]
+    if missing:
+        raise ValueError(f"Dimension columns {missing} are not part of the query result")
+
+    valid = None
+    for dim in dimension_columns:
+        if table[dim].null_count:
+            mask = pc.is_valid(table[dim])
+            valid = mask if valid is None else pc.and_(valid, mask)
+    if valid is not None:
+        table = table.filter(valid)
+
+    coords = {}
+    codes = []
+    for dim in dimension_columns:
+        values, dim_codes = factorize(table[dim])
+        coords[dim] = to_numpy(values)
+        codes.append(dim_codes)
+    shape = tuple(len(values) for values in coords.values())
+    size = int(np.prod(shape, dtype=np.int64))
+    flat = np.ravel_multi_index(codes, shape) if table.num_rows else np.empty(0, dtype=np.int64)
+    del codes
+
+    # Rows that are already in grid order need neither a sort nor a scatter
+    order = None
+    if np.any(flat[1:] <= flat[:-1]):
+        order = np.argsort(flat, kind="stable")
+        flat = flat[order]
+        if np.any(flat[1:] == flat[:-1]):
+            raise ValueError(f"Several rows share the same {', '.join(dimension_columns)} cell; aggregate or add a dimension column")
+    dense = len(flat) == size
+    logger.debug("Gridding %d rows into %s (%s)", len(flat), shape, "dense" if dense else f"sparse, {len(flat) / max(size, 1):.1%} filled")
+
+    variables = {}
+    for name in table.column_names:
+        if name in coords:
+            continue
+        column = table[name]
+        if dense:
+            data = to_numpy(column)
+            data = (data if order is None else data[order]).reshape(shape)
+        else:
+            dtype, fill_value = fill_dtype(column.type)
+            data = np.full(shape, fill_value, dtype=dtype)
+            values = to_numpy(column, dtype)
+            data.reshape(-1)[flat] = values if order is None else values[order]
+        variables[name] = (dimension_columns, data)
+    return xr.Dataset(variables, coords=coords)
+
+
+def grid_batches(batches: Iterable[pa.RecordBatch], dimension_columns: Sequence[str], coords: Dict[str, pa.Array]) -> xr.Dataset:
+    """Scatter a stream of long-format record batches into a grid over the known ``coords``.
+
+    Arrays are allocated from the first batch's schema and filled batch by batch,
+    so peak memory is the grid plus one batch. Rows whose dimension values are null
+    or not among ``coords`` are dropped. Integer and boolean variables keep their
+    dtype when every cell was filled without nulls, as in the dense case of
+    :func:`grid_table`.
+
+    Args:
+        batches: Query results, one row per grid cell.
+        dimension_columns: Columns whose values index the grid.
+        coords: Sorted distinct values of every dimension column.
+
+    Raises:
+        ValueError: If a dimension column is missing or several rows share one grid cell.
+    """
+    dimension_columns = list(dimension_columns)
+    shape = tuple(len(coords[dim]) for dim in dimension_columns)
+    filled = np.zeros(shape, dtype=bool).reshape(-1)
+    variables: Dict[str, np.ndarray] = {}
+    fields: Dict[str, pa.Field] = {}
+    has_nulls: Dict[str, bool] = {}
+
+    for batch in batches:
+        if not fields:
+            missing = [dim for dim in dimension_columns if dim not in batch.schema.names]
+            if missing:
+                raise ValueError(f"Dimension columns {missing} are not part of the query result")
+            for field in batch.schema:
+                if field.name not in dimension_columns:
+                    dtype, fill_value = fill_dtype(field.type)
+                    variables[field.name] = np.full(shape, fill_value, dtype=dtype)
+                    fields[field.name] = field
+                    has_nulls[field.name] = False
+
+        positions = [pc.index_in(batch.column(dim), value_set=coords[dim]) for dim in dimension_columns]
+        valid = positions[0].is_valid()
+        for position in positions[1:]:
+            valid = pc.and_(valid, position.is_valid())
+        if valid.false_count:
+            batch = batch.filter(valid)
+            positions = [position.filter(valid) for position in positions]
+        codes = [position.to_numpy(zero_copy_only=False).astype(np.int64, copy=False) for position in positions]
+        flat = np.ravel_multi_index(codes, shape) if batch.num_rows else np.empty(0, dtype=np.int64)
+        if filled[flat].any() or len(np.unique(flat)) < len(flat):
+            raise ValueError(f"Several rows share the same {', '.join(dimension_columns)} cell; aggregate or add a dimension column")
+        filled[flat] = True
+
+        for name, data in variables.items():
+            column = batch.column(name)
+            has_nulls[name] = has_nulls[name] or column.null_count > 0
+            data.reshape(-1)[flat] = to_numpy(column, data.dtype)
+
+    dense = bool(filled.all())
+    logger.debug("Gridded %d rows into %s (%s)", int(filled.sum()), shape, "dense" if dense else f"sparse, {filled.mean() if filled.size else 0:.1%} filled")
+    if dense:
+        for name, field in fields.items():
+            if not has_nulls[name] and (pa.types.is_integer(field.type) or pa.types.is_boolean(field.type)):
+                variables[name] = variables[name].astype(field.type.to_pandas_dtype())
+
+    coordinates = {dim: to_numpy(coords[dim]) for dim in dimension_columns}
+    return xr.Dataset({name: (dimension_columns, data) for name, data in variables.items()}, coords=coordinates)
@@ -0,0 +1,204 @@
+"""Client-side evaluation of filter trees and filter containment checks.
+
+Used by :class:`beacon_api.cache.ContainmentCache` to answer a query from a
+cached superset: :func:`implies` proves that every row matching the new filters
+also matched the cached ones, and :func:`filter_table` re-applies the new filter
+tree to the cached Arrow table with vectorized ``pyarrow.compute`` kernels.
+"""
+
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ._parallel import flatten_and
+from .filter import (
+    AndFilter,
+    EqualsFilter,
+    ExclusiveRangeFilter,
+    Filter,
+    FilterIsNull,
+    IsNotNullFilter,
+    NotEqualsFilter,
+    OrFilter,
+    RangeFilter,
+)
+
+try:
+    from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+except ImportError:
+    from typing_extensions import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class UnsupportedFilter(Exception):
+    """Raised when a filter cannot be evaluated or reasoned about locally."""
+
+
+def _comparable(value: Any) -> Any:
+    """Normalize ISO timestamps to datetimes so bounds of mixed notation compare"""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    return value
+
+
+# An interval bound is (value, inclusive); None means unbounded on that side
+Bound = Optional[Tuple[Any, bool]]
+
+
+def _interval(f: Filter) -> Optional[Tuple[str, Bound, Bound]]:
+    """Return ``(column, lower, upper)`` for filters that restrict a column to an interval"""
+    if isinstance(f, RangeFilter):
+        lower = (_comparable(f.gt_eq), True) if f.gt_eq is not None else None
+        upper = (_comparable(f.lt_eq), True) if f.lt_eq is not None else None
+        return f.column, lower, upper
+    if isinstance(f, ExclusiveRangeFilter):
+        lower = (_comparable(f.gt), False) if f.gt is not None else None
+        upper = (_comparable(f.lt), False) if f.lt is not None else None
+        return f.column, lower, upper
+    if isinstance(f, EqualsFilter):
+        value = _comparable(f.eq)
+        return f.column, (value, True), (value, True)
+    return None
+
+
+def _tighter_lower(a: Bound, b: Bound) -> Bound:
+    if a is None or b is None:
+        return a or b
+    if a[0] != b[0]:
+        return a if a[0] > b[0] else b
+    return a if not a[1] else b
+
+
+def _tighter_upper(a: Bound, b: Bound) -> Bound:
+    if a is None or b is None:
+        return a or b
+    if a[0] != b[0]:
+        return a if a[0] < b[0] else b
+    return a if not a[1] else b
+
+
+def _lower_within(inner: Bound, outer: Bound) -> bool:
+    """Whether the lower bound ``inner`` is at least as restrictive as ``outer``"""
+    if outer is None:
+        return True
+    if inner is None:
+        return False
+    if inner[0] != outer[0]:
+        return inner[0] > outer[0]
+    return outer[1] or not inner[1]
+
+
+def _upper_within(inner: Bound, outer: Bound) -> bool:
+    """Whether the upper bound ``inner`` is at least as restrictive as ``outer``"""
+    if outer is None:
+        return True
+    if inner is None:
+        return False
+    if inner[0] != outer[0]:
+        return inner[0] < outer[0]
+    return outer[1] or not inner[1]
+
+
+def implies(filters: Iterable[Filter], cached_filters: Iterable[Filter]) -> bool:
+    """Return True when every row matching ``filters`` is guaranteed to match ``cached_filters``.
+
+    Both lists are read as conjunctions. Range, exclusive range and equality
+    filters (including bounding boxes expressed as ``AndFilter``) are compared as
+    per-column intervals; any other cached filter must reappear unchanged.
+    The check is conservative: False means "not proven", never a wrong answer.
+    """
+    conjuncts = list(flatten_and(filters))
+    intervals: Dict[str, Tuple[Bound, Bound]] = {}
+    try:
+        for f in conjuncts:
+            interval = _interval(f)
+            if interval is None:
+                continue
+            column, lower, upper = interval
+            current_lower, current_upper = intervals.get(column, (None, None))
+            intervals[column] = (_tighter_lower(current_lower, lower), _tighter_upper(current_upper, upper))
+
+        for cached in flatten_and(cached_filters):
+            interval = _interval(cached)
+            if interval is None:
+                if cached not in conjuncts:
+                    return False
+                continue
+            column, lower, upper = interval
+            new_lower, new_upper = intervals.get(column, (None, None))
+            if not (_lower_within(new_lower, lower) and _upper_within(new_upper, upper)):
+                return False
+    except TypeError:
+        # Bounds of incompatible types (e.g. a number against a string) cannot be compared
+        return False
+    return True
+
+
+def filter_columns(filters: Iterable[Filter]) -> Set[str]:
+    """Return the names of all columns referenced by a filter tree"""
+    columns: Set[str] = set()
+    for f in filters:
+        if isinstance(f, (AndFilter, OrFilter)):
+            columns |= filter_columns(f.filters)
+        elif hasattr(f, "column"):
+            columns.add(f.column)
+        else:
+            raise UnsupportedFilter(f"{type(f).__name__} cannot be evaluated locally")
+    return columns
+
+
+def _literal(value: Any, data_type: pa.DataType) -> pa.Scalar:
+    """Convert a filter value to a scalar comparable with a column of ``data_type``"""
+    if pa.types.is_timestamp(data_type) or pa.types.is_date(data_type):
+        if isinstance(value, str):
+            value = _comparable(value)
+            if isinstance(value, str):
+                raise UnsupportedFilter(f"Cannot compare {value!r} with a {data_type} column")
+        return pa.scalar(value).cast(data_type, safe=False)
+    return pa.scalar(value)
+
+
+def _combine(table: pa.Table, masks: List[Any], combine, identity: bool) -> Any:
+    """Fold boolean masks with a Kleene kernel; an empty fold yields the identity for every row"""
+    if not masks:
+        return pa.repeat(pa.scalar(identity), table.num_rows)
+    mask = masks[0]
+    for other in masks[1:]:
+        mask = combine(mask, other)
+    return mask
+
+
+def _mask(table: pa.Table, f: Filter) -> Any:
+    if isinstance(f, AndFilter):
+        return _combine(table, [_mask(table, child) for child in f.filters], pc.and_kleene, True)
+    if isinstance(f, OrFilter):
+        return _combine(table, [_mask(table, child) for child in f.filters], pc.or_kleene, False)
+    if isinstance(f, FilterIsNull):
+        return pc.is_null(table[f.column])
+    if isinstance(f, IsNotNullFilter):
+        return pc.is_valid(table[f.column])
+
+    if isinstance(f, RangeFilter):
+        comparisons = [(pc.greater_equal, f.gt_eq), (pc.less_equal, f.lt_eq)]
+    elif isinstance(f, ExclusiveRangeFilter):
+        comparisons = [(pc.greater, f.gt), (pc.less, f.lt)]
+    elif isinstance(f, EqualsFilter):
+        comparisons = [(pc.equal, f.eq)]
+    elif isinstance(f, NotEqualsFilter):
+        comparisons = [(pc.not_equal, f.neq)]
+    else:
+        raise UnsupportedFilter(f"{type(f).__name__} cannot be evaluated locally")
+
+    column = table[f.column]
+    masks = [compare(column, _literal(value, column.type)) for compare, value in comparisons if value is not None]
+    return _combine(table, masks, pc.and_kleene, True)
+
+
+def filter_table(table: pa.Table, filters: List[Filter]) -> pa.Table:
+    """Apply a conjunction of filters to an Arrow table; rows evaluating to null are dropped"""
+    if not filters:
+        return table
+    return table.filter(_mask(table, AndFilter(filters=filters)), null_selection_behavior="drop")
@@ -0,0 +1,200 @@
+"""Range partitioning and ordered concurrent execution helpers for queries."""
+
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+from .filter import AndFilter, ExclusiveRangeFilter, Filter, RangeFilter
+
+try:
+    from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+except ImportError:
+    from typing_extensions import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+Bound = Union[int, float, datetime]
+T = TypeVar("T")
+
+
+def coerce_bound(value: Union[str, int, float, datetime]) -> Bound:
+    """Convert a filter value into a bound that supports arithmetic (ISO strings become datetimes)"""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError as exc:
+            raise ValueError(f"Cannot partition on non-numeric, non-temporal bound {value!r}") from exc
+    if isinstance(value, bool) or not isinstance(value, (int, float, datetime)):
+        raise ValueError(f"Cannot partition on bound {value!r} of type {type(value).__name__}")
+    return value
+
+
+def flatten_and(filters: Iterable[Filter]) -> Iterator[Filter]:
+    """Yield the conjuncts of a filter list, descending into nested ``AndFilter`` nodes"""
+    for f in filters:
+        if isinstance(f, AndFilter):
+            yield from flatten_and(f.filters)
+        else:
+            yield f
+
+
+def infer_bounds(filters: Iterable[Filter], column: str) -> Optional[Tuple[Bound, Bound]]:
+    """Derive the tightest ``(lower, upper)`` bounds on ``column`` implied by the top-level filters"""
+    lower: Optional[Bound] = None
+    upper: Optional[Bound] = None
+    for f in flatten_and(filters):
+        if isinstance(f, RangeFilter) and f.column == column:
+            low, high = f.gt_eq, f.lt_eq
+        elif isinstance(f, ExclusiveRangeFilter) and f.column == column:
+            low, high = f.gt, f.lt
+        else:
+            continue
+        if low is not None:
+            low = coerce_bound(low)
+            lower = low if lower is None else max(lower, low)
+        if high is not None:
+            high = coerce_bound(high)
+            upper = high if upper is None else min(upper, high)
+    if lower is None or upper is None:
+        return None
+    return lower, upper
+
+
+def split_range(lower: Bound, upper: Bound, n_partitions: int) -> List[Bound]:
+    """Return strictly increasing edges splitting ``[lower, upper]`` into at most ``n_partitions`` ranges"""
+    if n_partitions <= 0:
+        raise ValueError("n_partitions must be a positive integer")
+    if upper < lower:
+        raise ValueError(f"Invalid partition bounds: {lower!r} > {upper!r}")
+
+    if isinstance(lower, int) and isinstance(upper, int):
+        edges = [lower + (upper - lower) * i // n_partitions for i in range(n_partitions + 1)]
+    else:
+        edges = [lower + (upper - lower) * i / n_partitions for i in range(n_partitions + 1)]
+    edges[-1] = upper
+
+    # Narrow ranges (e.g. few distinct integers) collapse into fewer partitions
+    unique_edges = [edges[0]]
+    for edge in edges[1:]:
+        if edge > unique_edges[-1]:
+            unique_edges.append(edge)
+    return unique_edges
+
+
+def range_partition_filters(column: str, edges: List[Bound]) -> List[Filter]:
+    """Build disjoint filters covering ``[edges[0], edges[-1]]``: half-open ranges and a closed last range"""
+    if len(edges) == 1:
+        return [RangeFilter(column=column, gt_eq=edges[0], lt_eq=edges[0])]
+
+    filters: List[Filter] = []
+    for i in range(len(edges) - 1):
+        if i == len(edges) - 2:
+            filters.append(RangeFilter(column=column, gt_eq=edges[i], lt_eq=edges[i + 1]))
+        else:
+            filters.append(AndFilter(filters=[
+                RangeFilter(column=column, gt_eq=edges[i]),
+                ExclusiveRangeFilter(column=column, lt=edges[i + 1]),
+            ]))
+    return filters
+
+
+def iter_in_order(tasks: Iterable[Callable[[], T]], max_workers: int) -> Iterator[T]:
+    """Run ``tasks`` on a thread pool and yield their results in submission order.
+
+    At most ``max_workers`` tasks are in flight, so only a bounded number of
+    results is held in memory while the consumer lags behind.
+    """
+    if max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer")
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    task_iter = iter(tasks)
+    pending: "deque[Future[T]]" = deque()
+    try:
+        for task in itertools.islice(task_iter, max_workers):
+            pending.append(pool.submit(task))
+        while pending:
+            result = pending.popleft().result()
+            next_task = next(task_iter, None)
+            if next_task is not None:
+                pending.append(pool.submit(next_task))
+            yield result
+    finally:
+        # Drop queued work when the consumer stops early or a task fails
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+_END = object()
+
+
+def _put(buffer: "queue.Queue", item: object, stop: threading.Event) -> bool:
+    """Put ``item`` into ``buffer``, waiting while it is full; False once ``stop`` is set"""
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain_into(stream: Callable[[], Iterable[T]], buffer: "queue.Queue", stop: threading.Event) -> None:
+    """Push the items of ``stream()`` into ``buffer``, then an end marker or the error raised"""
+    items: Iterator[T] = iter(())
+    try:
+        items = iter(stream())
+        for item in items:
+            if not _put(buffer, item, stop):
+                return
+        _put(buffer, _END, stop)
+    except Exception as exc:  # re-raised on the consumer thread
+        _put(buffer, exc, stop)
+    finally:
+        close = getattr(items, "close", None)
+        if close is not None:
+            close()
+
+
+def iter_streams_in_order(streams: Iterable[Callable[[], Iterable[T]]], max_workers: int, max_buffered: int) -> Iterator[T]:
+    """Run ``streams`` on a thread pool and yield their items stream by stream, in submission order.
+
+    At most ``max_workers`` streams are open at a time. Each one reads ahead into a
+    queue of ``max_buffered`` items and then blocks, which leaves the rest of its
+    response unread on the connection. Memory is therefore bounded by
+    ``max_workers * max_buffered`` items however large the streams are.
+    """
+    if max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer")
+    if max_buffered <= 0:
+        raise ValueError("max_buffered must be a positive integer")
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    stop = threading.Event()
+    stream_iter = iter(streams)
+    pending: "deque[queue.Queue]" = deque()
+
+    def submit(stream: Callable[[], Iterable[T]]) -> None:
+        buffer: "queue.Queue" = queue.Queue(maxsize=max_buffered)
+        pool.submit(_drain_into, stream, buffer, stop)
+        pending.append(buffer)
+
+    try:
+        for stream in itertools.islice(stream_iter, max_workers):
+            submit(stream)
+        while pending:
+            buffer = pending.popleft()
+            while True:
+                item = buffer.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            next_stream = next(stream_iter, None)
+            if next_stream is not None:
+                submit(next_stream)
+    finally:
+        # Unblock readers waiting on a full queue so they close their responses
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,340 @@
+"""Streaming writers that append Arrow record batches to array stores and files.
+
+Batches come from :meth:`BaseQuery.iter_batches` with a fixed number of rows, so
+each one fills whole chunks along the ``index`` dimension and is written as its
+own region. Zarr stores record their progress after every region, so an
+interrupted export can continue from the last completed one; NetCDF files grow
+along an unlimited dimension. Parquet datasets are handed the batches as they
+arrive and split them into hive partitions.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import warnings
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from ._gridding import fill_dtype, to_numpy
+
+if TYPE_CHECKING:
+    import xarray as xr
+
+logger = logging.getLogger(__name__)
+
+ROW_DIMENSION = "index"
+
+
+def query_fingerprint(query: Any) -> str:
+    """Return a digest of the compiled query, ignoring its output format"""
+    body = json.dumps(query.compile(), sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def column_dtypes(schema: pa.Schema) -> Dict[str, np.dtype]:
+    """Numpy dtypes every batch of ``schema`` is converted to, so that appended regions agree"""
+    return {field.name: fill_dtype(field.type)[0] for field in schema}
+
+
+def batch_to_dataset(batch: pa.RecordBatch, dtypes: Dict[str, np.dtype], start: int) -> "xr.Dataset":
+    """Turn one batch into a dataset along ``index``, numbered from ``start``"""
+    import xarray as xr
+
+    variables = {name: (ROW_DIMENSION, to_numpy(batch.column(name), dtypes[name])) for name in batch.schema.names}
+    return xr.Dataset(variables, coords={ROW_DIMENSION: np.arange(start, start + batch.num_rows)})
+
+
+def skip_rows(batches: Iterable[pa.RecordBatch], rows: int) -> Iterator[pa.RecordBatch]:
+    """Drop the first ``rows`` rows of a batch stream"""
+    for batch in batches:
+        if rows >= batch.num_rows:
+            rows -= batch.num_rows
+            continue
+        yield batch.slice(rows) if rows else batch
+        rows = 0
+
+
+def resumed_batches(query: Any, written: int, chunk_rows: int, force: bool = False) -> Iterator[pa.RecordBatch]:
+    """Stream the results of ``query`` after its first ``written`` rows, in batches of ``chunk_rows``"""
+    from . import _rechunk_batches
+
+    source, skip = query._resume_from(written)
+    batches = source.iter_batches(max_rows=chunk_rows, force=force)
+    if skip:
+        batches = _rechunk_batches(skip_rows(batches, skip), chunk_rows)
+    return batches
+
+
+def compressor_encoding(compressor: Any) -> Dict[str, Any]:
+    """Zarr encoding entry applying ``compressor``, for the installed zarr version.
+
+    zarr 2 takes a single numcodecs ``compressor``; zarr 3 takes a ``compressors``
+    list of bytes-to-bytes codecs such as ``zarr.codecs.BloscCodec``.
+    """
+    import zarr
+    from packaging.version import Version
+
+    if compressor is None:
+        return {}
+    if Version(zarr.__version__).major < 3:
+        return {"compressor": compressor}
+    return {"compressors": list(compressor) if isinstance(compressor, (list, tuple)) else [compressor]}
+
+
+def consolidate(store: str) -> None:
+    """Write the consolidated metadata readers such as ``xarray.open_zarr`` look for first"""
+    import zarr
+
+    with warnings.catch_warnings():
+        # zarr 3 warns that consolidated metadata is not part of the v3 spec yet;
+        # xarray and zarr-python still read it, and other readers fall back to the arrays
+        warnings.filterwarnings("ignore", message="Consolidated metadata", category=UserWarning)
+        zarr.consolidate_metadata(store)
+
+
+def write_zarr(
+    query: Any,
+    store: str,
+    chunk_rows: int = 65536,
+    compressor: Any = None,
+    encoding: Optional[Dict[str, Dict[str, Any]]] = None,
+    resume: bool = False,
+    force: bool = False,
+) -> int:
+    """Stream the results of ``query`` into a Zarr store, one chunk-aligned region per batch.
+
+    The store attributes record the query fingerprint, the chunk size and the
+    number of rows written. With ``resume`` an unfinished store of the same query
+    continues after its last completed region; anything written past it is cut off
+    first. Otherwise the store is overwritten.
+
+    Returns:
+        int: Number of rows in the store.
+    """
+    import zarr
+
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be a positive integer")
+
+    fingerprint = query_fingerprint(query)
+    written = 0
+    group = None
+    if resume and os.path.exists(store):
+        try:
+            group = zarr.open_group(store, mode="r+")
+        except Exception:
+            group = None
+        if group is not None and group.attrs.get("beacon_query") == fingerprint:
+            written = int(group.attrs.get("beacon_rows_written", 0))
+            if group.attrs.get("beacon_complete"):
+                logger.info("%s already holds the complete result (%d rows)", store, written)
+                return written
+            chunk_rows = int(group.attrs["beacon_chunk_rows"])
+            for _, array in group.arrays():
+                if array.shape and array.shape[0] > written:
+                    array.resize((written,) + tuple(array.shape[1:]))
+            logger.info("Resuming %s after %d rows", store, written)
+        else:
+            group = None
+            written = 0
+
+    dtypes = None
+    for batch in resumed_batches(query, written, chunk_rows, force=force):
+        if dtypes is None:
+            dtypes = column_dtypes(batch.schema)
+        ds = batch_to_dataset(batch, dtypes, written)
+        if group is None:
+            base = {"chunks": (chunk_rows,), **compressor_encoding(compressor)}
+            ds.to_zarr(store, mode="w", consolidated=False, encoding={name: {**base, **(encoding or {}).get(name, {})} for name in ds.variables})
+            group = zarr.open_group(store, mode="r+")
+            group.attrs.update({"beacon_query": fingerprint, "beacon_chunk_rows": chunk_rows, "beacon_complete": False})
+        else:
+            ds.to_zarr(store, append_dim=ROW_DIMENSION, consolidated=False)
+        written += batch.num_rows
+        group.attrs["beacon_rows_written"] = written
+
+    if group is None:
+        # Empty result: still leave a valid, complete store behind
+        import xarray as xr
+        xr.Dataset(coords={ROW_DIMENSION: np.arange(0)}).to_zarr(store, mode="w", consolidated=False)
+        group = zarr.open_group(store, mode="r+")
+        group.attrs.update({"beacon_query": fingerprint, "beacon_chunk_rows": chunk_rows, "beacon_rows_written": 0})
+    group.attrs["beacon_complete"] = True
+    consolidate(store)
+    return written
+
+
+_TIME_UNITS = {"s": "seconds", "ms": "milliseconds", "us": "microseconds", "ns": "nanoseconds"}
+
+# The NetCDF default fill value of string variables
+STRING_FILL_VALUE = ""
+
+
+def netcdf_variable(field: pa.Field, string_fill: str = STRING_FILL_VALUE) -> Tuple[Any, Dict[str, Any], Callable[[pa.Array], np.ndarray]]:
+    """Return the NetCDF4 type, attributes and batch converter storing ``field``.
+
+    Numeric, boolean and temporal columns keep an integer or float type and mark
+    nulls with the variable's fill value; strings become variable-length strings
+    whose nulls are written as ``string_fill``, the variable's ``_FillValue``.
+    """
+    data_type = field.type
+    if pa.types.is_timestamp(data_type):
+        attrs = {"units": f"{_TIME_UNITS[data_type.unit]} since 1970-01-01 00:00:00", "calendar": "standard"}
+        return np.dtype("int64"), attrs, lambda column: _masked(column.cast(pa.int64()))
+    if pa.types.is_date32(data_type):
+        return np.dtype("int32"), {"units": "days since 1970-01-01", "calendar": "standard"}, lambda column: _masked(column.cast(pa.int32()))
+    if pa.types.is_boolean(data_type):
+        return np.dtype("int8"), {"flag_values": [0, 1], "flag_meanings": "false true"}, lambda column: _masked(column.cast(pa.int8()))
+    if pa.types.is_integer(data_type) or pa.types.is_floating(data_type):
+        return np.dtype(data_type.to_pandas_dtype()), {}, _masked
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return str, {}, lambda column: np.asarray(column.fill_null(string_fill).to_pylist(), dtype=object)
+    raise ValueError(f"Column {field.name} of type {data_type} cannot be written to NetCDF")
+
+
+def _masked(column: pa.Array) -> np.ndarray:
+    """Convert a numeric column, masking its nulls"""
+    if column.null_count == 0:
+        return column.to_numpy(zero_copy_only=False)
+    values = column.fill_null(0).to_numpy(zero_copy_only=False)
+    return np.ma.masked_array(values, mask=column.is_null().to_numpy(zero_copy_only=False))
+
+
+def write_netcdf(
+    query: Any,
+    file_path: str,
+    batch_rows: int = 65536,
+    encoding: Optional[Dict[str, Dict[str, Any]]] = None,
+    force: bool = False,
+) -> int:
+    """Stream the results of ``query`` into a NetCDF4 file along an unlimited ``index`` dimension.
+
+    Every batch is appended to the variables as it arrives, so peak memory is about
+    one batch. Variables are zlib-compressed and chunked by ``batch_rows`` unless
+    ``encoding`` overrides the ``createVariable`` arguments of a column. Every
+    variable declares the ``_FillValue`` its nulls are written as, so readers see
+    them as missing: the NetCDF default of the type for numbers and ``""`` (or the
+    ``fill_value`` given in ``encoding``) for strings.
+    The file is written next to ``file_path`` and moved into place once complete.
+
+    Returns:
+        int: Number of rows written.
+    """
+    import netCDF4
+
+    if batch_rows <= 0:
+        raise ValueError("batch_rows must be a positive integer")
+
+    tmp_path = f"{file_path}.part"
+    written = 0
+    try:
+        with netCDF4.Dataset(tmp_path, mode="w", format="NETCDF4") as nc:
+            nc.createDimension(ROW_DIMENSION, None)
+            converters = None
+            for batch in query.iter_batches(max_rows=batch_rows, force=force):
+                if converters is None:
+                    converters = {}
+                    for field in batch.schema:
+                        custom = (encoding or {}).get(field.name, {})
+                        string_fill = custom.get("fill_value", STRING_FILL_VALUE)
+                        nc_type, attrs, converters[field.name] = netcdf_variable(field, string_fill)
+                        if nc_type is str:
+                            options = {"chunksizes": (batch_rows,), "fill_value": string_fill}
+                        else:
+                            # Declare the fill value that masked nulls are written as, so readers mask them again
+                            fill_value = netCDF4.default_fillvals[np.dtype(nc_type).str[1:]]
+                            options = {"zlib": True, "complevel": 4, "chunksizes": (batch_rows,), "fill_value": fill_value}
+                        options.update(custom)
+                        variable = nc.createVariable(field.name, nc_type, (ROW_DIMENSION,), **options)
+                        variable.setncatts(attrs)
+                for name, convert in converters.items():
+                    nc.variables[name][written:written + batch.num_rows] = convert(batch.column(name))
+                written += batch.num_rows
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    logger.debug("Wrote %d rows to %s", written, file_path)
+    return written
+
+
+_TIME_PARTS = {"year", "month", "day", "hour"}
+
+
+def with_time_parts(batch: pa.RecordBatch, time_column: str, time_parts: Sequence[str]) -> pa.RecordBatch:
+    """Append ``year``/``month``/``day``/``hour`` columns derived from ``time_column``"""
+    import pyarrow.compute as pc
+
+    for part in time_parts:
+        batch = batch.append_column(part, getattr(pc, part)(batch.column(time_column)))
+    return batch
+
+
+def write_parquet_dataset(
+    query: Any,
+    root: str,
+    partition_cols: Optional[Sequence[str]] = None,
+    time_column: Optional[str] = None,
+    time_parts: Sequence[str] = ("year", "month"),
+    row_group_size: int = 131072,
+    compression: str = "zstd",
+    max_open_files: int = 64,
+    max_rows_per_file: int = 0,
+    existing_data_behavior: str = "error",
+    batch_rows: int = 65536,
+    force: bool = False,
+) -> None:
+    """Stream the results of ``query`` into a hive-partitioned Parquet dataset under ``root``.
+
+    Batches are handed to ``pyarrow.dataset.write_dataset`` as they arrive. It keeps
+    at most ``max_open_files`` files open and buffers up to ``row_group_size`` rows
+    per open file, which bounds memory independently of the result size.
+    """
+    import pyarrow.dataset as ds
+
+    unknown = set(time_parts) - _TIME_PARTS
+    if time_column is not None and unknown:
+        raise ValueError(f"Unsupported time parts {sorted(unknown)}. Supported parts: {', '.join(sorted(_TIME_PARTS))}")
+    if row_group_size <= 0:
+        raise ValueError("row_group_size must be a positive integer")
+
+    batches = query.iter_batches(max_rows=batch_rows, force=force)
+    first = next(batches, None)
+    if first is None:
+        os.makedirs(root, exist_ok=True)
+        logger.info("Query returned no rows; nothing written to %s", root)
+        return
+
+    partitioning = list(partition_cols or [])
+    if time_column is not None:
+        clashes = [part for part in time_parts if part in first.schema.names]
+        if clashes:
+            raise ValueError(f"The query result already has columns named {clashes}; they cannot be derived from {time_column}")
+        partitioning = list(time_parts) + partitioning
+        batches = (with_time_parts(batch, time_column, time_parts) for batch in batches)
+        first = with_time_parts(first, time_column, time_parts)
+    missing = [name for name in partitioning if name not in first.schema.names]
+    if missing:
+        raise ValueError(f"Partition columns {missing} are not part of the query result")
+
+    def all_batches() -> Iterator[pa.RecordBatch]:
+        yield first
+        yield from batches
+
+    ds.write_dataset(
+        all_batches(),
+        root,
+        schema=first.schema,
+        format="parquet",
+        partitioning=partitioning or None,
+        partitioning_flavor="hive" if partitioning else None,
+        file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+        max_open_files=max_open_files,
+        max_rows_per_file=max_rows_per_file,
+        min_rows_per_group=row_group_size,
+        max_rows_per_group=row_group_size,
+        existing_data_behavior=existing_data_behavior,
+    )
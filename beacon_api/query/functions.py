@@ -66,7 +66,6 @@ class Functions:
             dtype = np.dtype(to_type)  # normalize everything into a np.dtype
             arrow_type = None
             if np.issubdtype(dtype, np.integer):
-                print("This is an integer dtype:", dtype)
                 arrow_type = "Int64"
             elif np.issubdtype(dtype, np.floating):
                 arrow_type = "Float64"
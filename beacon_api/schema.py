@@ -0,0 +1,54 @@
+"""Conversion of Beacon schema payloads into Arrow schemas.
+
+``/api/table-schema`` and ``/api/dataset-schema`` both describe columns as a
+list of ``{"name": ..., "data_type": ...}`` fields, where ``data_type`` is either
+an Arrow type name or a ``{"Timestamp": [unit, timezone]}`` object.
+"""
+
+from typing import Any, Callable
+
+import pyarrow as pa
+
+_TIMESTAMP_UNITS = {
+    "Second": "s",
+    "Millisecond": "ms",
+    "Microsecond": "us",
+    "Nanosecond": "ns",
+}
+
+
+def parse_arrow_schema(schema_data: dict) -> pa.Schema:
+    """Build a ``pyarrow.Schema`` from a Beacon schema payload.
+
+    Raises:
+        Exception: For unsupported field types surfaced by Beacon.
+    """
+    fields = []
+
+    for field in schema_data['fields']:
+        field_type = field['data_type']
+        timestamp = field_type.get("Timestamp") if isinstance(field_type, dict) else None
+
+        if isinstance(field_type, str):
+            fields.append(pa.field(field['name'], field_type))
+        elif isinstance(timestamp, list) and len(timestamp) == 2 and timestamp[0] in _TIMESTAMP_UNITS and timestamp[1] is None:
+            fields.append(pa.field(field['name'], pa.timestamp(_TIMESTAMP_UNITS[timestamp[0]])))
+        else:
+            raise Exception(f"Unsupported data type for field {field['name']}: {field_type}")
+
+    return pa.schema(fields)
+
+
+def fetch_schema(session, endpoint: str, params: dict, parse: Callable[[Any], pa.Schema]) -> pa.Schema:
+    """Request a schema through the session's :class:`~beacon_api.cache.SchemaCache`, if one is attached.
+
+    Args:
+        session: The Beacon session.
+        endpoint: The schema endpoint, e.g. ``"/api/table-schema"``.
+        params: Query parameters identifying the table or dataset.
+        parse: Turns a schema response into a ``pyarrow.Schema``, raising on failures.
+    """
+    cache = getattr(session, "schema_cache", None)
+    if cache is not None:
+        return cache.fetch(session, endpoint, params, parse)
+    return parse(session.get(endpoint, params=params))
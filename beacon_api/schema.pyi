@@ -0,0 +1,5 @@
+import pyarrow as pa
+from typing import Any, Callable
+
+def parse_arrow_schema(schema_data: dict) -> pa.Schema: ...
+def fetch_schema(session, endpoint: str, params: dict, parse: Callable[[Any], pa.Schema]) -> pa.Schema: ...
@@ -1,21 +1,40 @@
+import hashlib
 import requests
+from typing import Any, Callable
 from packaging.version import Version
 
 class BaseBeaconSession(requests.Session):
-    def __init__(self, base_url: str, proxy_headers: dict | None = None):
+    # Attributes restored when the session is pickled, e.g. onto Dask workers
+    __attrs__ = requests.Session.__attrs__ + ["base_url", "beacon_node_version", "server_info", "result_cache", "schema_cache", "_capabilities"]
+
+    def __init__(self, base_url: str, proxy_headers: dict | None = None, server_info: dict | None = None):
         super().__init__()
         # e.g. "https://api.example.com/"
         self.base_url = base_url.rstrip("/") + "/"
         if proxy_headers:
             self.headers.update(proxy_headers)
-        self.beacon_node_version = self.fetch_version()
+        # Optional beacon_api.cache.QueryCache consulted by every query materialization helper
+        self.result_cache = None
+        # Optional beacon_api.cache.ContainmentCache answering narrower JSON queries locally
+        self.containment_cache = None
+        # Optional beacon_api.cache.SchemaCache shared by table and dataset schema lookups
+        self.schema_cache = None
+        # Memoized capability probes (e.g. admin status), keyed on the credentials they were checked with
+        self._capabilities: dict[tuple[str, str], Any] = {}
+        # The /api/info payload; injecting it skips the handshake request entirely
+        if server_info is None:
+            self.beacon_node_version = self.fetch_version()
+        else:
+            self.server_info = server_info
+            self.beacon_node_version = Version(server_info['beacon_version'])
 
     def fetch_version(self) -> Version:
-        """Fetch the beacon node version from the server"""
+        """Fetch the beacon node version from the server and refresh ``server_info``"""
         response = self.get("/api/info")
         if response.status_code != 200:
             raise Exception(f"Failed to get server info: {response.text}. Failed to connect to beacon node: {self.base_url}.")
         info = response.json()
+        self.server_info = info
         version_str = info['beacon_version']
         return Version(version_str)
 
@@ -30,8 +49,37 @@ class BaseBeaconSession(requests.Session):
         required_version = Version(f"{major}.{minor}.{patch}")
         return self.beacon_node_version >= required_version
     
-    def is_admin(self) -> bool:
-        """Check if the session has admin privileges"""
+    def _credentials_fingerprint(self) -> str:
+        """Digest of the credentials sent with every request; changing them starts a fresh capability cache"""
+        credentials = f"{self.headers.get('Authorization', '')}\0{self.auth!r}"
+        return hashlib.sha256(credentials.encode()).hexdigest()
+
+    def capability(self, name: str, probe: Callable[[], Any], refresh: bool = False) -> Any:
+        """Return the memoized result of ``probe`` for the current credentials.
+
+        Args:
+            name: Name of the capability, e.g. ``"is_admin"``.
+            probe: Callable asking the server; only called on a miss or when ``refresh`` is set.
+            refresh: Ignore the memoized value and probe again. Defaults to False.
+        """
+        key = (name, self._credentials_fingerprint())
+        if refresh or key not in self._capabilities:
+            self._capabilities[key] = probe()
+        return self._capabilities[key]
+
+    def invalidate_capabilities(self) -> None:
+        """Forget every memoized capability, e.g. after permissions were changed server-side"""
+        self._capabilities.clear()
+
+    def is_admin(self, refresh: bool = False) -> bool:
+        """Check if the session has admin privileges.
+
+        The answer is cached per set of credentials; pass ``refresh=True`` or call
+        :meth:`invalidate_capabilities` to ask the server again.
+        """
+        return self.capability("is_admin", self._fetch_is_admin, refresh=refresh)
+
+    def _fetch_is_admin(self) -> bool:
         response = self.get("/api/admin/check")
         if response.status_code == 401:
             return False
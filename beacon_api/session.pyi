@@ -1,12 +1,19 @@
 import requests
+from typing import Any, Callable
 from _typeshed import Incomplete
 from packaging.version import Version
 
 class BaseBeaconSession(requests.Session):
     base_url: Incomplete
+    result_cache: Incomplete
+    containment_cache: Incomplete
+    schema_cache: Incomplete
     beacon_node_version: Incomplete
-    def __init__(self, base_url: str, proxy_headers: dict | None = None) -> None: ...
+    server_info: dict
+    def __init__(self, base_url: str, proxy_headers: dict | None = None, server_info: dict | None = None) -> None: ...
     def fetch_version(self) -> Version: ...
     def request(self, method, url, *args, **kwargs): ...
     def version_at_least(self, major: int, minor: int = 0, patch: int = 0) -> bool: ...
-    def is_admin(self) -> bool: ...
+    def capability(self, name: str, probe: Callable[[], Any], refresh: bool = False) -> Any: ...
+    def invalidate_capabilities(self) -> None: ...
+    def is_admin(self, refresh: bool = False) -> bool: ...
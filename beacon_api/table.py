@@ -4,6 +4,7 @@ from typing import Optional, Union
 import pyarrow as pa
 
 from .session import BaseBeaconSession
+from .schema import fetch_schema, parse_arrow_schema
 from .query import JSONQuery, RangeFilter, AndFilter
 from .query._from import FromTable
 
@@ -36,18 +37,29 @@ class DataTable:
     """Represents a data table available on the Beacon Node."""
     
     # Constructor for DataTable
-    def __init__(self, http_session: BaseBeaconSession, table_name: str):
+    def __init__(self, http_session: BaseBeaconSession, table_name: str, table_config: Optional[dict] = None):
         self.http_session = http_session
         self.table_name = table_name
-        
-        # Now query the server for the table type and description
-        # api/table-config?table_name={table_name}
-        response = self.http_session.get("/api/table-config", params={"table_name": table_name})
-        if response.status_code != 200:
-            raise Exception(f"Failed to get table config: {response.text}")
-        table_config = response.json()
-        self.table_type = table_config.get("table_type", "unknown")
-        self.description = table_config.get("description", None)
+        # The table config is fetched on first access so listing tables stays a single request
+        self._table_config = table_config
+
+    def load_config(self) -> dict:
+        """Fetch the table type and description from the Beacon Node, once per table"""
+        if self._table_config is None:
+            # api/table-config?table_name={table_name}
+            response = self.http_session.get("/api/table-config", params={"table_name": self.table_name})
+            if response.status_code != 200:
+                raise Exception(f"Failed to get table config: {response.text}")
+            self._table_config = response.json()
+        return self._table_config
+
+    @property
+    def table_type(self) -> Union[dict, str]:
+        return self.load_config().get("table_type", "unknown")
+
+    @property
+    def description(self) -> Optional[str]:
+        return self.load_config().get("description", None)
 
     def get_table_description(self) -> str:
         """Get the description of the table"""
@@ -64,33 +76,15 @@ class DataTable:
 
     def get_table_schema_arrow(self) -> pa.Schema:
         """Get the schema of the table in Arrow format"""
-        response = self.http_session.get("/api/table-schema", params={"table_name": self.table_name})
-        
+        return fetch_schema(self.http_session, "/api/table-schema", {"table_name": self.table_name}, self._parse_schema_response)
+
+    @staticmethod
+    def _parse_schema_response(response) -> pa.Schema:
         if response.status_code != 200:
             raise Exception(f"Failed to get table schema: {response.text}")
         
         schema_data = response.json()
-        fields = []
-        
-        for field in schema_data['fields']:
-            field_type = field['data_type']
-            
-            if isinstance(field_type, str):
-                fields.append(pa.field(field['name'], field_type))
-            
-            elif isinstance(field_type, dict) and field_type.get("Timestamp") == ["Second", None]:
-                fields.append(pa.field(field['name'], pa.timestamp('s')))
-            elif isinstance(field_type, dict) and field_type.get("Timestamp") == ["Millisecond", None]:
-                fields.append(pa.field(field['name'], pa.timestamp('ms')))
-            elif isinstance(field_type, dict) and field_type.get("Timestamp") == ["Microsecond", None]:
-                fields.append(pa.field(field['name'], pa.timestamp('us')))
-            elif isinstance(field_type, dict) and field_type.get("Timestamp") == ["Nanosecond", None]:
-                fields.append(pa.field(field['name'], pa.timestamp('ns')))
-            
-            else:
-                raise Exception(f"Unsupported data type for field {field['name']}: {field_type}")
-        
-        return pa.schema(fields)
+        return parse_arrow_schema(schema_data)
     
     def get_table_type(self) -> Union[dict, str]:
         """Get the type of the table"""
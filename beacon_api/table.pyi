@@ -10,9 +10,12 @@ arrow_py_type: Incomplete
 class DataTable:
     http_session: Incomplete
     table_name: Incomplete
-    table_type: Incomplete
-    description: Incomplete
-    def __init__(self, http_session: BaseBeaconSession, table_name: str) -> None: ...
+    def __init__(self, http_session: BaseBeaconSession, table_name: str, table_config: dict | None = None) -> None: ...
+    def load_config(self) -> dict: ...
+    @property
+    def table_type(self) -> dict | str: ...
+    @property
+    def description(self) -> str | None: ...
     def get_table_description(self) -> str: ...
     def get_table_schema(self) -> dict[str, type]: ...
     def get_table_schema_arrow(self) -> pa.Schema: ...
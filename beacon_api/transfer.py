@@ -0,0 +1,331 @@
+"""Bulk dataset transfers between a local file system and a Beacon Node.
+
+Used by :meth:`Client.upload_datasets <beacon_api.client.Client.upload_datasets>`
+and :meth:`Client.download_datasets <beacon_api.client.Client.download_datasets>`.
+Files are sent as streamed ``multipart/form-data`` bodies over the client's pooled
+session, so memory use does not depend on the file size and connections are
+reused across files. A local JSON manifest remembers the size and SHA-256 of
+every uploaded file so unchanged files are skipped on the next run. Downloads
+are written to ``.part`` files that are resumed with HTTP ``Range`` requests
+and only renamed into place once their size has been verified.
+"""
+
+from __future__ import annotations
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from urllib3.fields import format_multipart_header_param
+except ImportError:  # urllib3 < 2
+    from urllib3.fields import format_header_param_html5 as format_multipart_header_param
+
+from .session import BaseBeaconSession
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class TransferResult:
+    """Outcome of transferring a single dataset file."""
+
+    local_path: str
+    remote_path: str
+    size: int = 0
+    seconds: float = 0.0
+    skipped: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file was transferred or skipped without error."""
+        return self.error is None
+
+    @property
+    def throughput(self) -> float:
+        """Transfer rate in bytes per second; 0 for skipped or failed files."""
+        if self.skipped or self.error is not None or self.seconds <= 0:
+            return 0.0
+        return self.size / self.seconds
+
+
+class MultipartFileBody:
+    """Streamed ``multipart/form-data`` body holding form fields followed by one file.
+
+    The body knows its length up front, so ``requests`` sends a ``Content-Length``
+    header instead of chunked encoding, and the file is read in chunks while the
+    request is sent and closed afterwards.
+    """
+
+    def __init__(self, fields: dict[str, str], file_field: str, file_name: str, file_path: str, chunk_size: int = _CHUNK_SIZE):
+        self.boundary = uuid.uuid4().hex
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        # Quotes and line breaks in names are percent-encoded, as browsers and urllib3 do
+        head = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; {format_multipart_header_param("name", name)}\r\n\r\n{value}\r\n'.encode()
+            for name, value in fields.items()
+        )
+        disposition = f'{format_multipart_header_param("name", file_field)}; {format_multipart_header_param("filename", file_name)}'
+        head += (
+            f"--{self.boundary}\r\nContent-Disposition: form-data; {disposition}\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        self._head = head
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self._file_size = os.path.getsize(file_path)
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self._head) + self._file_size + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        with open(self.file_path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        yield self._tail
+
+
+def upload_file(session: BaseBeaconSession, file_path: str, destination_path: str) -> None:
+    """Upload one local file to ``destination_path`` on the Beacon Node.
+
+    Raises:
+        Exception: If the upload fails.
+    """
+    # The first part is the prefix of the destination path, e.g. /data/datasets of /data/datasets/myfile.parquet
+    prefix = '/'.join(destination_path.split('/')[:-1])
+    file_name = destination_path.split('/')[-1]
+    body = MultipartFileBody({"prefix": prefix}, "file", file_name, file_path)
+    response = session.post("/api/admin/upload-file", data=body, headers={"Content-Type": body.content_type})
+    if response.status_code != 200:
+        raise Exception(f"Failed to upload dataset: {response.text}")
+
+
+def file_sha256(file_path: str, chunk_size: int = _CHUNK_SIZE) -> str:
+    """Return the hex SHA-256 digest of a local file."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _glob_root(pattern: str) -> str:
+    """Return the directory part of ``pattern`` before its first wildcard"""
+    parts = []
+    for part in os.path.normpath(pattern).split(os.sep):
+        if any(c in part for c in "*?["):
+            break
+        parts.append(part)
+    return os.sep.join(parts) or "."
+
+
+def collect_files(local_dir_or_glob: str) -> list[tuple[str, str]]:
+    """Resolve a directory (walked recursively) or glob into sorted ``(path, relative_path)`` pairs.
+
+    Relative paths use ``/`` separators and are relative to the directory, or to
+    the part of the glob before its first wildcard.
+    """
+    if os.path.isdir(local_dir_or_glob):
+        root = local_dir_or_glob
+        paths = [os.path.join(dirpath, name) for dirpath, _, names in os.walk(root) for name in names]
+    else:
+        root = _glob_root(local_dir_or_glob)
+        paths = [path for path in glob.glob(local_dir_or_glob, recursive=True) if os.path.isfile(path)]
+    return sorted((path, os.path.relpath(path, root).replace(os.sep, "/")) for path in paths)
+
+
+def default_manifest_path(local_dir_or_glob: str) -> str:
+    """Return the default manifest location: inside the directory, or the glob's root directory"""
+    root = local_dir_or_glob if os.path.isdir(local_dir_or_glob) else _glob_root(local_dir_or_glob)
+    return os.path.join(root, ".beacon_upload_manifest.json")
+
+
+class UploadManifest:
+    """JSON record of the size and SHA-256 of every file uploaded to a Beacon Node."""
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries: dict[str, dict] = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+
+    @staticmethod
+    def key(base_url: str, remote_path: str) -> str:
+        return f"{base_url}{remote_path.lstrip('/')}"
+
+    def unchanged(self, key: str, size: int, sha256: str) -> bool:
+        entry = self.entries.get(key)
+        return entry is not None and entry.get("size") == size and entry.get("sha256") == sha256
+
+    def record(self, key: str, size: int, sha256: str) -> None:
+        self.entries[key] = {"size": size, "sha256": sha256, "uploaded_at": time.time()}
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def ensure_pool_size(session: BaseBeaconSession, max_workers: int) -> None:
+    """Make sure the session keeps enough pooled connections to the node for ``max_workers`` threads"""
+    adapter = session.get_adapter(session.base_url)
+    if isinstance(adapter, HTTPAdapter) and adapter._pool_maxsize >= max_workers:  # type: ignore[attr-defined]
+        return
+    session.mount(session.base_url, HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
+
+
+def upload_with_manifest(session: BaseBeaconSession, manifest: Optional[UploadManifest], local_path: str, remote_path: str) -> TransferResult:
+    """Upload one file unless the manifest shows an identical copy was uploaded before"""
+    result = TransferResult(local_path=local_path, remote_path=remote_path)
+    try:
+        result.size = os.path.getsize(local_path)
+        checksum = None
+        if manifest is not None:
+            key = UploadManifest.key(session.base_url, remote_path)
+            checksum = file_sha256(local_path)
+            if manifest.unchanged(key, result.size, checksum):
+                result.skipped = True
+                return result
+
+        start = time.perf_counter()
+        upload_file(session, local_path, remote_path)
+        result.seconds = time.perf_counter() - start
+
+        if manifest is not None and checksum is not None:
+            manifest.record(key, result.size, checksum)
+        logger.info("Uploaded %s -> %s (%d bytes, %.1f MB/s)", local_path, remote_path, result.size, result.throughput / 2**20)
+    except Exception as exc:
+        result.error = str(exc)
+        logger.warning("Failed to upload %s -> %s: %s", local_path, remote_path, exc)
+    return result
+
+
+def _expected_size(response, offset: int) -> Optional[int]:
+    """Total size of the remote file according to ``Content-Range`` or ``Content-Length``"""
+    content_range = response.headers.get("Content-Range")
+    if content_range and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit():
+        return offset + int(content_length)
+    return None
+
+
+def download_file(session: BaseBeaconSession, dataset_path: str, local_path: str, chunk_size: int = _CHUNK_SIZE, retries: int = 3) -> int:
+    """Download one dataset to ``local_path`` through a resumable ``.part`` file.
+
+    An existing ``.part`` file is resumed with a ``Range`` request. Servers that
+    ignore the range answer with the full body, which then replaces the partial
+    file. Broken connections are resumed up to ``retries`` times.
+
+    Returns:
+        int: The size of the downloaded file in bytes.
+
+    Raises:
+        Exception: If the download fails or the file size does not match the size announced by the server.
+    """
+    part_path = f"{local_path}.part"
+    directory = os.path.dirname(os.path.abspath(local_path))
+    os.makedirs(directory, exist_ok=True)
+
+    attempt = 0
+    while True:
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        # Sizes and ranges refer to the stored bytes, so opt out of transparent compression
+        headers = {"Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        try:
+            with session.get("/api/admin/download-file", params={"file_path": dataset_path}, headers=headers, stream=True) as response:
+                if response.status_code == 416 and offset:
+                    # Nothing left to fetch when the partial file already holds the complete body
+                    expected = _expected_size(response, 0)
+                    if expected != offset:
+                        os.remove(part_path)
+                        continue
+                elif response.status_code in (200, 206):
+                    if response.status_code == 200:
+                        offset = 0
+                    expected = _expected_size(response, offset)
+                    with open(part_path, "ab" if offset else "wb") as f:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+                else:
+                    raise Exception(f"Failed to download dataset: {response.text}")
+        except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as exc:
+            attempt += 1
+            if attempt > retries:
+                raise Exception(f"Failed to download dataset {dataset_path}: {exc}") from exc
+            logger.info("Resuming download of %s after: %s", dataset_path, exc)
+            continue
+
+        size = os.path.getsize(part_path)
+        if expected is not None and size != expected:
+            attempt += 1
+            if size > expected or attempt > retries:
+                raise Exception(f"Downloaded size of {dataset_path} ({size} bytes) does not match the expected {expected} bytes")
+            continue
+        os.replace(part_path, local_path)
+        return size
+
+
+def local_target(dataset_path: str, local_dir: str, relative_to: Optional[str] = None) -> str:
+    """Map a dataset path on the node to a path below ``local_dir``, keeping its directory structure"""
+    relative = dataset_path
+    if relative_to is not None:
+        prefix = relative_to.rstrip("/") + "/"
+        if not dataset_path.startswith(prefix):
+            raise ValueError(f"Dataset path {dataset_path} is not below {relative_to}")
+        relative = dataset_path[len(prefix):]
+    parts = [part for part in relative.split("/") if part not in ("", ".")]
+    if ".." in parts:
+        raise ValueError(f"Refusing to download {dataset_path} outside of {local_dir}")
+    return os.path.join(local_dir, *parts)
+
+
+def download_to(session: BaseBeaconSession, dataset_path: str, local_path: str, chunk_size: int, skip_existing: bool) -> TransferResult:
+    """Download one file and record the outcome instead of raising"""
+    result = TransferResult(local_path=local_path, remote_path=dataset_path)
+    try:
+        if skip_existing and os.path.exists(local_path):
+            result.size = os.path.getsize(local_path)
+            result.skipped = True
+            return result
+        start = time.perf_counter()
+        result.size = download_file(session, dataset_path, local_path, chunk_size=chunk_size)
+        result.seconds = time.perf_counter() - start
+        logger.info("Downloaded %s -> %s (%d bytes, %.1f MB/s)", dataset_path, local_path, result.size, result.throughput / 2**20)
+    except Exception as exc:
+        result.error = str(exc)
+        logger.warning("Failed to download %s -> %s: %s", dataset_path, local_path, exc)
+    return result
@@ -0,0 +1,50 @@
+from .session import BaseBeaconSession as BaseBeaconSession
+from _typeshed import Incomplete
+from dataclasses import dataclass
+from typing import Iterator
+
+logger: Incomplete
+
+@dataclass
+class TransferResult:
+    local_path: str
+    remote_path: str
+    size: int = 0
+    seconds: float = 0.0
+    skipped: bool = False
+    error: str | None = None
+    @property
+    def ok(self) -> bool: ...
+    @property
+    def throughput(self) -> float: ...
+
+class MultipartFileBody:
+    boundary: str
+    file_path: str
+    chunk_size: int
+    def __init__(self, fields: dict[str, str], file_field: str, file_name: str, file_path: str, chunk_size: int = ...) -> None: ...
+    @property
+    def content_type(self) -> str: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[bytes]: ...
+
+def upload_file(session: BaseBeaconSession, file_path: str, destination_path: str) -> None: ...
+def file_sha256(file_path: str, chunk_size: int = ...) -> str: ...
+def collect_files(local_dir_or_glob: str) -> list[tuple[str, str]]: ...
+def default_manifest_path(local_dir_or_glob: str) -> str: ...
+
+class UploadManifest:
+    path: str
+    entries: dict[str, dict]
+    def __init__(self, path: str) -> None: ...
+    @staticmethod
+    def key(base_url: str, remote_path: str) -> str: ...
+    def unchanged(self, key: str, size: int, sha256: str) -> bool: ...
+    def record(self, key: str, size: int, sha256: str) -> None: ...
+    def save(self) -> None: ...
+
+def ensure_pool_size(session: BaseBeaconSession, max_workers: int) -> None: ...
+def upload_with_manifest(session: BaseBeaconSession, manifest: UploadManifest | None, local_path: str, remote_path: str) -> TransferResult: ...
+def download_file(session: BaseBeaconSession, dataset_path: str, local_path: str, chunk_size: int = ..., retries: int = 3) -> int: ...
+def local_target(dataset_path: str, local_dir: str, relative_to: str | None = None) -> str: ...
+def download_to(session: BaseBeaconSession, dataset_path: str, local_path: str, chunk_size: int, skip_existing: bool) -> TransferResult: ...
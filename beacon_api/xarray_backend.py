@@ -0,0 +1,175 @@
+"""xarray backend that reads Beacon queries lazily, one chunk at a time.
+
+Registered as the ``"beacon"`` engine, so a :class:`~beacon_api.query.JSONQuery`
+can be opened like a file::
+
+    ds = xr.open_dataset(query, engine="beacon", dimension_columns=["TIME", "DEPTH"], chunks={})
+    window = ds["TEMP"].sel(DEPTH=slice(0, 50)).isel(TIME=slice(0, 100)).compute()
+
+Opening the dataset only fetches the sorted distinct values of every dimension
+column and the result schema. Each access to the data, e.g. a dask chunk, runs
+the query again with range filters on the dimension columns. The rows that come
+back are pivoted into the requested window, so slicing a small window of a huge
+cube only transfers that window.
+"""
+
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import xarray as xr
+from xarray.backends import BackendArray, BackendEntrypoint
+from xarray.core import indexing
+
+from .query import JSONQuery, RangeFilter, SelectColumn
+from .query._gridding import fill_dtype, to_numpy
+
+_CACHED_WINDOWS = 4
+
+
+class BeaconWindowReader:
+    """Runs the window sub-queries shared by all variables of one opened dataset.
+
+    The most recently fetched windows are kept, so reading several variables of the
+    same chunk costs one request.
+    """
+
+    def __init__(self, query: JSONQuery, dimension_columns: Sequence[str], coords: dict[str, pa.Array], force: bool = False):
+        self.query = query
+        self.dimension_columns = list(dimension_columns)
+        self.sources = _source_columns(query, dimension_columns)
+        self.coords = coords
+        self.force = force
+        self._windows: "OrderedDict[tuple, pa.Table]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def window(self, key: tuple[slice, ...]) -> pa.Table:
+        """Return the rows whose dimension values fall inside the slices of ``key``"""
+        cache_key = tuple((s.start, s.stop, s.step) for s in key)
+        with self._lock:
+            table = self._windows.get(cache_key)
+            if table is not None:
+                self._windows.move_to_end(cache_key)
+                return table
+
+        query = self.query._copy()
+        for dim, selection in zip(self.dimension_columns, key):
+            values = self.coords[dim][selection]
+            if len(values) == 0:
+                continue
+            # Coordinates are sorted, so the window is the closed range of its first and last value
+            query.filters.append(RangeFilter(column=self.sources[dim], gt_eq=values[0].as_py(), lt_eq=values[-1].as_py()))
+        table = query._read_arrow_table(force=self.force)
+
+        with self._lock:
+            self._windows[cache_key] = table
+            while len(self._windows) > _CACHED_WINDOWS:
+                self._windows.popitem(last=False)
+        return table
+
+
+class BeaconBackendArray(BackendArray):
+    """Lazily indexed data variable backed by window sub-queries."""
+
+    def __init__(self, reader: BeaconWindowReader, variable: str, data_type: pa.DataType):
+        self.reader = reader
+        self.variable = variable
+        self.shape = tuple(len(reader.coords[dim]) for dim in reader.dimension_columns)
+        self.dtype, self.fill_value = fill_dtype(data_type)
+
+    def __getitem__(self, key: indexing.ExplicitIndexer) -> np.ndarray:
+        return indexing.explicit_indexing_adapter(key, self.shape, indexing.IndexingSupport.BASIC, self._raw_indexing_method)
+
+    def _raw_indexing_method(self, key: tuple) -> np.ndarray:
+        slices = tuple(k if isinstance(k, slice) else slice(k, k + 1) for k in key)
+        table = self.reader.window(slices)
+
+        out_shape = tuple(len(range(*s.indices(n))) for s, n in zip(slices, self.shape))
+        out = np.full(out_shape, self.fill_value, dtype=self.dtype)
+        if table.num_rows and all(out_shape):
+            positions = []
+            valid = None
+            for dim, selection in zip(self.reader.dimension_columns, slices):
+                # Position of every row along this dimension of the window; -1 outside it
+                position = pc.index_in(table[dim], value_set=self.reader.coords[dim][selection])
+                positions.append(position)
+                mask = pc.is_valid(position)
+                valid = mask if valid is None else pc.and_(valid, mask)
+            rows = table.filter(valid)
+            index = tuple(position.filter(valid).to_numpy(zero_copy_only=False) for position in positions)
+            out[index] = to_numpy(rows[self.variable], self.dtype)
+
+        # Integer keys drop their dimension, as in numpy
+        squeeze = tuple(i for i, k in enumerate(key) if not isinstance(k, slice))
+        return out.squeeze(axis=squeeze) if squeeze else out
+
+
+def _source_columns(query: JSONQuery, dimension_columns: Iterable[str]) -> dict[str, str]:
+    """Map every dimension column, which may be a select alias, to the column it reads"""
+    aliases = {select.alias: select.column for select in query.selects if isinstance(select, SelectColumn) and select.alias}
+    return {dim: aliases.get(dim, dim) for dim in dimension_columns}
+
+
+def fetch_coordinates(query: JSONQuery, dimension_columns: Sequence[str], force: bool = False) -> dict[str, pa.Array]:
+    """Return the sorted distinct non-null values of every dimension column under the query's filters"""
+    coords = {}
+    for dim, source in _source_columns(query, dimension_columns).items():
+        probe = query._copy()
+        probe.selects = [SelectColumn(column=source)]
+        probe.set_distinct([source])
+        probe.sorts = []
+        probe.add_sort(source)
+        probe.limit = None
+        probe.offset = None
+        values = probe._read_arrow_table(force=force).column(0).combine_chunks()
+        coords[dim] = pc.drop_null(values)
+    return coords
+
+
+def open_beacon_dataset(query: JSONQuery, dimension_columns: Sequence[str], drop_variables: Optional[Iterable[str]] = None, force: bool = False) -> xr.Dataset:
+    """Open ``query`` as a lazily loaded :class:`xarray.Dataset` indexed by ``dimension_columns``."""
+    if not dimension_columns:
+        raise ValueError("dimension_columns must name at least one column")
+    if query.distinct is not None or query.limit is not None or query.offset is not None:
+        raise ValueError("Queries with distinct, limit or offset cannot be opened lazily")
+    for select in query.selects:
+        if not isinstance(select, SelectColumn):
+            raise ValueError("Only plain column selects can be opened lazily; use to_xarray_dataset() for computed columns")
+
+    schema = query._arrow_schema(force=force)
+    missing = [dim for dim in dimension_columns if schema.get_field_index(dim) < 0]
+    if missing:
+        raise ValueError(f"Dimension columns {missing} are not part of the query result")
+
+    coords = fetch_coordinates(query, dimension_columns, force=force)
+    reader = BeaconWindowReader(query, dimension_columns, coords, force=force)
+    drop = set(drop_variables or ())
+    variables = {}
+    for field in schema:
+        if field.name in dimension_columns or field.name in drop:
+            continue
+        data = indexing.LazilyIndexedArray(BeaconBackendArray(reader, field.name, field.type))
+        variables[field.name] = xr.Variable(list(dimension_columns), data)
+
+    coordinates = {dim: to_numpy(coords[dim]) for dim in dimension_columns}
+    return xr.Dataset(variables, coords=coordinates)
+
+
+class BeaconBackendEntrypoint(BackendEntrypoint):
+    """xarray engine ``"beacon"`` opening :class:`~beacon_api.query.JSONQuery` objects lazily."""
+
+    description = "Lazily read Beacon Node queries, fetching only the accessed windows"
+    url = "https://maris-development.github.io/beacon-py/"
+    open_dataset_parameters = ("filename_or_obj", "drop_variables", "dimension_columns", "force")
+
+    def open_dataset(self, filename_or_obj: Any, *, drop_variables: Optional[Iterable[str]] = None, dimension_columns: Optional[Sequence[str]] = None, force: bool = False) -> xr.Dataset:  # type: ignore[override]
+        if not isinstance(filename_or_obj, JSONQuery):
+            raise TypeError("The beacon engine opens JSONQuery objects, e.g. xr.open_dataset(table.query()..., engine='beacon')")
+        return open_beacon_dataset(filename_or_obj, dimension_columns or [], drop_variables=drop_variables, force=force)
+
+    def guess_can_open(self, filename_or_obj: Any) -> bool:
+        return isinstance(filename_or_obj, JSONQuery)
@@ -0,0 +1,35 @@
+import numpy as np
+import pyarrow as pa
+import xarray as xr
+from .query import JSONQuery as JSONQuery
+from typing import Any, Iterable, Sequence
+from xarray.backends import BackendArray, BackendEntrypoint
+from xarray.core import indexing
+
+class BeaconWindowReader:
+    query: JSONQuery
+    dimension_columns: list[str]
+    sources: dict[str, str]
+    coords: dict[str, pa.Array]
+    force: bool
+    def __init__(self, query: JSONQuery, dimension_columns: Sequence[str], coords: dict[str, pa.Array], force: bool = False) -> None: ...
+    def window(self, key: tuple[slice, ...]) -> pa.Table: ...
+
+class BeaconBackendArray(BackendArray):
+    reader: BeaconWindowReader
+    variable: str
+    shape: tuple[int, ...]
+    dtype: np.dtype
+    fill_value: Any
+    def __init__(self, reader: BeaconWindowReader, variable: str, data_type: pa.DataType) -> None: ...
+    def __getitem__(self, key: indexing.ExplicitIndexer) -> np.ndarray: ...
+
+def fetch_coordinates(query: JSONQuery, dimension_columns: Sequence[str], force: bool = False) -> dict[str, pa.Array]: ...
+def open_beacon_dataset(query: JSONQuery, dimension_columns: Sequence[str], drop_variables: Iterable[str] | None = None, force: bool = False) -> xr.Dataset: ...
+
+class BeaconBackendEntrypoint(BackendEntrypoint):
+    description: str
+    url: str
+    open_dataset_parameters: tuple[str, ...]
+    def open_dataset(self, filename_or_obj: Any, *, drop_variables: Iterable[str] | None = None, dimension_columns: Sequence[str] | None = None, force: bool = False) -> xr.Dataset: ...
+    def guess_can_open(self, filename_or_obj: Any) -> bool: ...
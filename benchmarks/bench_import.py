@@ -0,0 +1,75 @@
+"""Measure the cost of ``import beacon_api`` and guard against heavy eager imports.
+
+Every run uses a fresh interpreter, so nothing is shared through ``sys.modules``.
+The script fails with a non-zero exit code when a module that should only load on
+demand (pandas, geopandas, xarray, dask, ...) is imported eagerly, or when the
+median import time exceeds ``--max-seconds``. Example::
+
+    python benchmarks/bench_import.py --runs 10 --max-seconds 1.0
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Modules that must only be imported by the helpers that need them
+LAZY_MODULES = [
+    "pandas",
+    "geopandas",
+    "xarray",
+    "dask",
+    "dask.dataframe",
+    "fsspec",
+    "pyarrow.parquet",
+    "netCDF4",
+    "zarr",
+]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import beacon_api
+elapsed = time.perf_counter() - start
+scale = 1 if sys.platform == "darwin" else 1024
+print(json.dumps({
+    "seconds": elapsed,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def measure() -> dict:
+    """Import beacon_api in a fresh interpreter and report time, peak RSS and eagerly loaded modules"""
+    child = subprocess.run([sys.executable, "-c", PROBE], check=True, capture_output=True, text=True)
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to time")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Fail when the median import time exceeds this")
+    args = parser.parse_args()
+
+    results = [measure() for _ in range(args.runs)]
+    seconds = statistics.median(r["seconds"] for r in results)
+    peak_rss = statistics.median(r["peak_rss_mb"] for r in results)
+    loaded = sorted({name for r in results for name in r["loaded"]})
+
+    print(f"import beacon_api: median {seconds:.3f}s over {args.runs} runs, peak RSS {peak_rss:.1f} MB")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: imported eagerly: {', '.join(loaded)}")
+        failed = True
+    if args.max_seconds is not None and seconds > args.max_seconds:
+        print(f"FAIL: median import time {seconds:.3f}s exceeds {args.max_seconds:.3f}s")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
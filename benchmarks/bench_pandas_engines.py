@@ -0,0 +1,87 @@
+"""Compare the ``to_pandas_dataframe`` engines against a live Beacon Node.
+
+Every engine runs in a fresh interpreter so the reported peak RSS only covers
+that code path. Example::
+
+    python benchmarks/bench_pandas_engines.py https://beacon.example.com \\
+        --table default --columns LONGITUDE LATITUDE JULD TEMP --limit 5000000
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+ENGINES = [
+    ("parquet", "numpy"),
+    ("arrow", "numpy"),
+    ("arrow", "pyarrow"),
+]
+
+
+def measure(args: argparse.Namespace) -> dict:
+    """Run a single engine in this process and report wall time and peak RSS"""
+    from beacon_api import Client
+
+    client = Client(args.url, jwt_token=args.jwt_token)
+    query = client.list_tables()[args.table].query()
+    for column in args.columns:
+        query.add_select_column(column)
+    if args.limit:
+        query.set_limit(args.limit)
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    df = query.to_pandas_dataframe(engine=args.engine, dtype_backend=args.dtype_backend)
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+
+    return {
+        "engine": args.engine,
+        "dtype_backend": args.dtype_backend,
+        "rows": len(df),
+        "seconds": round(elapsed, 3),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1),
+        "peak_rss_delta_mb": round((peak_rss - baseline_rss) * scale / 2**20, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url", help="Base URL of the Beacon Node")
+    parser.add_argument("--table", default="default", help="Table to query")
+    parser.add_argument("--columns", nargs="+", required=True, help="Columns to select")
+    parser.add_argument("--limit", type=int, default=None, help="Optional row limit")
+    parser.add_argument("--jwt-token", default=None, help="Optional bearer token")
+    parser.add_argument("--engine", help=argparse.SUPPRESS)
+    parser.add_argument("--dtype-backend", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.engine:
+        print(json.dumps(measure(args)))
+        return
+
+    results = []
+    for engine, dtype_backend in ENGINES:
+        child = subprocess.run(
+            [sys.executable, __file__, *sys.argv[1:], "--engine", engine, "--dtype-backend", dtype_backend],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+
+    header = f"{'engine':<10}{'dtypes':<10}{'rows':>12}{'seconds':>10}{'frame MB':>11}{'peak RSS MB':>13}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['engine']:<10}{r['dtype_backend']:<10}{r['rows']:>12}{r['seconds']:>10}{r['frame_mb']:>11}{r['peak_rss_delta_mb']:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Shared fixtures: an in-process Beacon Node that answers ``/api/query`` from an Arrow table."""
+
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import pytest
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+from beacon_api.query import FromTable, JSONQuery, SQLQuery
+from beacon_api.query._local import _literal
+from beacon_api.session import BaseBeaconSession
+
+BASE_URL = "http://beacon.test/"
+
+
+def _mask(table: pa.Table, node: dict):
+    if "and" in node:
+        masks = [_mask(table, child) for child in node["and"]]
+        mask = masks[0]
+        for other in masks[1:]:
+            mask = pc.and_kleene(mask, other)
+        return mask
+    if "or" in node:
+        masks = [_mask(table, child) for child in node["or"]]
+        mask = masks[0]
+        for other in masks[1:]:
+            mask = pc.or_kleene(mask, other)
+        return mask
+    if "is_null" in node:
+        return pc.is_null(table[node["is_null"]["column"]])
+    if "is_not_null" in node:
+        return pc.is_valid(table[node["is_not_null"]["column"]])
+
+    column = table[node["column"]]
+    kernels = {"gt_eq": pc.greater_equal, "lt_eq": pc.less_equal, "gt": pc.greater, "lt": pc.less, "eq": pc.equal, "neq": pc.not_equal}
+    mask = pa.repeat(pa.scalar(True), table.num_rows)
+    for name, kernel in kernels.items():
+        if node.get(name) is not None:
+            mask = pc.and_kleene(mask, kernel(column, _literal(node[name], column.type)))
+    return mask
+
+
+def evaluate(table: pa.Table, body: dict) -> pa.Table:
+    """Run a compiled JSON query against ``table`` the way a Beacon Node would"""
+    if body.get("filters"):
+        table = table.filter(_mask(table, {"and": body["filters"]}), null_selection_behavior="drop")
+    if body.get("select"):
+        table = pa.table({select.get("alias") or select["column"]: table[select["column"]] for select in body["select"]})
+    if body.get("distinct"):
+        columns = body["distinct"]["distinct"]["on"]
+        table = table.group_by(columns, use_threads=False).aggregate([]).select(columns)
+    if body.get("sort_by"):
+        table = table.sort_by([(column, "ascending" if order == "Asc" else "descending") for sort in body["sort_by"] for order, column in sort.items()])
+    offset = body.get("offset") or 0
+    if body.get("limit") is not None:
+        return table.slice(offset, body["limit"])
+    return table.slice(offset)
+
+
+def encode(table: pa.Table, output) -> bytes:
+    """Encode a result in the requested output format"""
+    fmt = output["format"] if output else "arrow"
+    sink = io.BytesIO()
+    if fmt == "arrow":
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif fmt == "parquet":
+        pq.write_table(table, sink)
+    else:
+        # Text formats (CSV, ODV, ...) are all served as CSV here
+        pacsv.write_csv(table, sink)
+    return sink.getvalue()
+
+
+class MockBeaconNode:
+    """Answers Beacon API requests from in-memory tables and records every query body."""
+
+    def __init__(self, table: pa.Table, version: str = "1.5.0"):
+        self.table = table
+        self.version = version
+        self.queries: list[dict] = []
+
+    def handle(self, request) -> tuple[int, bytes]:
+        path = request.path_url.split("?")[0]
+        if path == "/api/info":
+            return 200, json.dumps({"beacon_version": self.version}).encode()
+        if path == "/api/health":
+            return 200, b"ok"
+        if path == "/api/query":
+            body = json.loads(request.body)
+            self.queries.append(body)
+            if "sql" in body:
+                result = self.table.slice(0, 0) if body["sql"].rstrip().endswith("LIMIT 0") else self.table
+            else:
+                result = evaluate(self.table, body)
+            return 200, encode(result, body.get("output"))
+        return 404, b"not found"
+
+
+class MockAdapter(HTTPAdapter):
+    def __init__(self, node: MockBeaconNode):
+        super().__init__()
+        self.node = node
+
+    def send(self, request, stream=False, **kwargs):
+        status, content = self.node.handle(request)
+        raw = HTTPResponse(body=io.BytesIO(content), status=status, preload_content=False, decode_content=False)
+        return self.build_response(request, raw)
+
+
+@pytest.fixture
+def observations() -> pa.Table:
+    return pa.table({
+        "STATION": pa.array(["A", "A", "B", "B", "B", "C", None], pa.string()),
+        "TIME": pa.array([1, 2, 1, 2, 3, 1, 4], pa.int64()),
+        "DEPTH": pa.array([0.0, 10.0, 0.0, 10.0, 20.0, 0.0, 5.0]),
+        "TEMP": pa.array([10.5, 9.5, 11.0, None, 8.0, 12.5, 7.0]),
+    })
+
+
+@pytest.fixture
+def node(observations) -> MockBeaconNode:
+    return MockBeaconNode(observations)
+
+
+@pytest.fixture
+def session(node) -> BaseBeaconSession:
+    session = BaseBeaconSession(BASE_URL, server_info={"beacon_version": node.version})
+    session.mount(BASE_URL, MockAdapter(node))
+    return session
+
+
+@pytest.fixture
+def query(session) -> JSONQuery:
+    return JSONQuery(http_session=session, _from=FromTable(table="observations"))
+
+
+@pytest.fixture
+def sql_query(session) -> SQLQuery:
+    return SQLQuery(http_session=session, query="SELECT * FROM observations")
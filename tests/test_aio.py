@@ -0,0 +1,99 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from beacon_api.aio import AsyncClient
+from beacon_api.query import FromTable, JSONQuery, Parquet
+
+from conftest import BASE_URL
+
+
+def mock_transport(node) -> "httpx.MockTransport":
+    def handler(request: "httpx.Request") -> "httpx.Response":
+        # MockBeaconNode reads the requests-style attributes
+        status, content = node.handle(SimpleNamespace(path_url=request.url.raw_path.decode(), body=request.content))
+        return httpx.Response(status, content=content)
+
+    return httpx.MockTransport(handler)
+
+
+def collect(node, query, **kwargs):
+    async def run():
+        async with AsyncClient(BASE_URL, transport=mock_transport(node)) as client:
+            query.http_session = client.session
+            return [batch async for batch in client.iter_batches(query, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_iter_batches_yields_fixed_size_batches(node, observations):
+    query = JSONQuery(http_session=None, _from=FromTable(table="observations"))
+    batches = collect(node, query, max_rows=3)
+
+    assert [batch.num_rows for batch in batches] == [3, 3, 1]
+    assert pa.Table.from_batches(batches).equals(observations)
+
+
+def test_iter_batches_requests_arrow(node, observations):
+    query = JSONQuery(http_session=None, _from=FromTable(table="observations"))
+    query.set_output(Parquet())
+
+    assert pa.Table.from_batches(collect(node, query)).equals(observations)
+    assert node.queries[-1]["output"] == {"format": "arrow"}
+    assert isinstance(query.output_format, Parquet)
+
+
+def test_iter_batches_stops_early_with_aclosing(node):
+    query = JSONQuery(http_session=None, _from=FromTable(table="observations"))
+
+    async def run():
+        async with AsyncClient(BASE_URL, transport=mock_transport(node)) as client:
+            query.http_session = client.session
+            async with contextlib.aclosing(client.iter_batches(query, max_rows=2)) as batches:
+                async for batch in batches:
+                    break
+            return batch, batches.ag_running, batches.ag_frame
+
+    batch, running, frame = asyncio.run(run())
+
+    assert batch.num_rows == 2
+    assert not running and frame is None
+
+
+@pytest.mark.parametrize("engine", ["parquet", "arrow"])
+def test_to_pandas_dataframe_leaves_the_query_output_alone(node, observations, engine):
+    query = JSONQuery(http_session=None, _from=FromTable(table="observations"))
+
+    async def run():
+        async with AsyncClient(BASE_URL, transport=mock_transport(node)) as client:
+            query.http_session = client.session
+            return await client.to_pandas_dataframe(query, engine=engine)
+
+    df = asyncio.run(run())
+
+    assert df.equals(observations.to_pandas())
+    assert node.queries[-1]["output"] == {"format": engine}
+    assert query.output_format is None
+
+
+def test_to_parquet_leaves_the_query_output_alone(node, observations, tmp_path):
+    import pyarrow.parquet as pq
+
+    query = JSONQuery(http_session=None, _from=FromTable(table="observations"))
+    query.set_output(Parquet())
+
+    async def run():
+        async with AsyncClient(BASE_URL, transport=mock_transport(node)) as client:
+            query.http_session = client.session
+            await client.to_csv(query, str(tmp_path / "out.csv"))
+            await client.to_parquet(query, str(tmp_path / "out.parquet"))
+
+    asyncio.run(run())
+
+    assert isinstance(query.output_format, Parquet)
+    assert pq.read_table(tmp_path / "out.parquet").equals(observations)
@@ -0,0 +1,97 @@
+import json
+import os
+import time
+
+import pyarrow as pa
+import pytest
+
+from beacon_api.cache import QueryCache
+
+from conftest import BASE_URL, MockAdapter, MockBeaconNode
+
+
+@pytest.fixture
+def cache(session, tmp_path):
+    session.result_cache = QueryCache(str(tmp_path / "results"))
+    return session.result_cache
+
+
+def test_repeated_query_is_served_from_disk(query, node, cache, observations):
+    first = pa.Table.from_batches(query.iter_batches())
+    second = pa.Table.from_batches(query.iter_batches())
+
+    assert first.equals(observations) and second.equals(observations)
+    assert len(node.queries) == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_output_format_is_part_of_the_key(query, node, cache):
+    query.iter_batches().close()
+    list(query.iter_batches())
+    query.to_pandas_dataframe()
+
+    # Arrow and Parquet bodies of the same query are cached separately
+    assert len(node.queries) == 2
+    assert cache.stats().entries == 2
+
+
+def test_abandoned_stream_is_not_committed(session, query, cache):
+    # Large enough that closing early leaves more than the drained tail unread
+    table = pa.table({"VALUE": pa.array(range(200_000), pa.float64())})
+    table = pa.Table.from_batches(table.to_batches(max_chunksize=1000))
+    node = MockBeaconNode(table)
+    session.mount(BASE_URL, MockAdapter(node))
+
+    batches = query.iter_batches(max_rows=1000)
+    next(batches)
+    batches.close()
+
+    assert cache.stats().entries == 0
+    assert pa.Table.from_batches(query.iter_batches()).num_rows == table.num_rows
+    assert len(node.queries) == 2
+    assert cache.stats().entries == 1
+
+
+def test_small_body_drained_on_close_is_committed(query, node, cache, observations):
+    batches = query.iter_batches(max_rows=1)
+    next(batches)
+    batches.close()
+
+    # Closing read the short remainder of the body, so the entry is complete
+    assert cache.stats().entries == 1
+    assert pa.Table.from_batches(query.iter_batches()).equals(observations)
+    assert len(node.queries) == 1
+
+
+def test_entries_expire_after_ttl(cache):
+    cache.ttl = 60
+    key = QueryCache.key("{}", "1.5.0")
+    cache.put(key, "{}", b"body")
+    assert cache.get(key) is not None
+
+    meta_path = os.path.join(cache.directory, f"{key}.json")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta["created_at"] -= 120
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+
+    assert cache.get(key) is None
+    assert cache.stats().entries == 0
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.max_bytes = 10
+    keys = [QueryCache.key(str(i), "1.5.0") for i in range(3)]
+    cache.put(keys[0], "0", b"aaaa")
+    cache.put(keys[1], "1", b"bbbb")
+    past = time.time() - 100
+    os.utime(os.path.join(cache.directory, f"{keys[1]}.body"), (past, past))
+    cache.get(keys[0])
+
+    cache.put(keys[2], "2", b"cccc")
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    assert cache.stats().evictions == 1
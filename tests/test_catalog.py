@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pytest
+
+from beacon_api import catalog as catalog_module
+from beacon_api.catalog import DatasetCatalog
+
+
+class FakeNode:
+    """Dataset listing and schemas served from dictionaries"""
+
+    def __init__(self):
+        self.formats = {"a.nc": "netcdf", "b.parquet": "parquet"}
+        self.schemas = {
+            "a.nc": pa.schema([("TEMP", pa.float64()), ("TIME", pa.int64())]),
+            "b.parquet": pa.schema([("PSAL", pa.float32())]),
+        }
+        self.fetched = []
+
+    def iter_datasets(self, pattern=None, page_size=1000, as_arrow=False):
+        return pa.table({"file_path": list(self.formats), "format": list(self.formats.values())})
+
+    def dataset(self, session, file_path, file_format):
+        node = self
+
+        class FakeDataset:
+            def get_schema(self):
+                node.fetched.append(file_path)
+                return node.schemas[file_path]
+
+        return FakeDataset()
+
+
+@pytest.fixture
+def fake_node(monkeypatch):
+    node = FakeNode()
+    monkeypatch.setattr(catalog_module, "Dataset", node.dataset)
+    return node
+
+
+@pytest.fixture
+def catalog(fake_node, tmp_path):
+    client = SimpleNamespace(session=SimpleNamespace(base_url="http://beacon.test/"), iter_datasets=fake_node.iter_datasets)
+    return DatasetCatalog(client, str(tmp_path / "catalog.parquet"))
+
+
+def test_incremental_refresh_only_fetches_new_datasets(catalog, fake_node):
+    assert catalog.refresh().added == 2
+    fake_node.formats["c.nc"] = "netcdf"
+    fake_node.schemas["c.nc"] = pa.schema([("TEMP", pa.float64())])
+    fake_node.fetched.clear()
+
+    summary = catalog.refresh()
+
+    assert (summary.added, summary.unchanged) == (1, 2)
+    assert fake_node.fetched == ["c.nc"]
+    assert catalog.find("TEMP")["file_path"].to_pylist() == ["a.nc", "c.nc"]
+
+
+def test_full_refresh_reindexes_changed_schemas(catalog, fake_node):
+    catalog.refresh()
+    fake_node.schemas["a.nc"] = pa.schema([("TEMP", pa.float64()), ("PSAL", pa.float64())])
+
+    summary = catalog.refresh(full=True)
+
+    assert (summary.added, summary.changed, summary.unchanged) == (0, 1, 1)
+    assert catalog.find("PSAL")["file_path"].to_pylist() == ["a.nc", "b.parquet"]
+
+
+def test_removed_datasets_are_dropped(catalog, fake_node):
+    catalog.refresh()
+    del fake_node.formats["b.parquet"]
+
+    assert catalog.refresh().removed == 1
+    assert catalog.table["file_path"].to_pylist() == ["a.nc"]
@@ -0,0 +1,18 @@
+from beacon_api.query import RangeFilter
+
+
+def test_sql_dask_dataframe_is_lazy(sql_query, node, observations):
+    ddf = sql_query.to_dask_dataframe()
+
+    # Only the zero-row schema probe runs when the collection is built
+    assert [body["sql"].endswith("LIMIT 0") for body in node.queries] == [True]
+    assert list(ddf.columns) == observations.column_names
+    assert len(ddf.compute()) == observations.num_rows
+
+
+def test_partitions_cover_the_result(query, observations):
+    query.add_filter(RangeFilter(column="TIME", gt_eq=1, lt_eq=4))
+    ddf = query.to_dask_dataframe(partition_by="TIME", npartitions=3, meta=observations.schema)
+
+    assert ddf.npartitions == 3
+    assert sorted(ddf.compute()["TIME"]) == sorted(observations["TIME"].to_pylist())
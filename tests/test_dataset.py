@@ -0,0 +1,47 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from beacon_api.dataset import MultiDatasetQuery, dataset_from
+from beacon_api.query import JSONQuery
+
+
+@pytest.fixture
+def multi(session) -> MultiDatasetQuery:
+    # Two "formats" whose results share STATION but differ in their other column
+    first = JSONQuery(http_session=session, _from=dataset_from("parquet", ["a.parquet"], {})).add_select_column("STATION").add_select_column("TEMP")
+    second = JSONQuery(http_session=session, _from=dataset_from("csv", ["b.csv"], {})).add_select_column("STATION").add_select_column("DEPTH")
+    return MultiDatasetQuery([first, second])
+
+
+def test_iter_batches_merges_streams_under_one_schema(multi, observations):
+    batches = list(multi.iter_batches(max_rows=4, max_workers=1, max_buffered=1))
+
+    table = pa.Table.from_batches(batches)
+    assert [batch.num_rows for batch in batches] == [4, 4, 4, 2]
+    assert table.column_names == ["STATION", "TEMP", "DEPTH"]
+    assert table["TEMP"].to_pylist() == observations["TEMP"].to_pylist() + [None] * 7
+    assert table["DEPTH"].to_pylist() == [None] * 7 + observations["DEPTH"].to_pylist()
+
+
+def test_limit_applies_to_the_merged_result(multi):
+    multi.set_limit(5)
+
+    assert sum(batch.num_rows for batch in multi.iter_batches()) == 5
+
+
+def test_to_parquet_and_to_arrow_write_the_merged_stream(multi, tmp_path):
+    multi.to_parquet(str(tmp_path / "merged.parquet"), max_rows=3)
+    multi.to_arrow(str(tmp_path / "merged.arrow"), max_rows=3)
+
+    expected = multi.to_arrow_table()
+    assert pq.read_table(tmp_path / "merged.parquet").equals(expected)
+    with pa.ipc.open_stream(str(tmp_path / "merged.arrow")) as reader:
+        assert reader.read_all().equals(expected)
+
+
+def test_unsupported_attributes_are_rejected(multi):
+    with pytest.raises(ValueError):
+        multi.set_offset(2)
+    with pytest.raises(AttributeError):
+        multi.set_output
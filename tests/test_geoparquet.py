@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+import pyarrow as pa
+
+from beacon_api.query import _geoparquet
+
+
+def test_point_columns_encode_wkb():
+    geometry, bbox = _geoparquet.point_columns(pa.chunked_array([[1.5, None]]), pa.chunked_array([[-2.0, 3.0]]))
+
+    assert geometry.type == pa.binary()
+    point = np.frombuffer(geometry[0].as_py(), dtype=_geoparquet._WKB_POINT)[0]
+    assert (point["byte_order"], point["geometry_type"], point["x"], point["y"]) == (1, 1, 1.5, -2.0)
+    assert geometry[1].as_py() is None
+    assert bbox.field("xmin").to_pylist() == [1.5, None]
+
+
+def test_point_columns_switch_to_64_bit_offsets(monkeypatch):
+    # Pretend the 32-bit offset range ends after two points
+    monkeypatch.setattr(_geoparquet, "_MAX_BINARY_BYTES", 2 * _geoparquet._WKB_POINT.itemsize)
+    lon = pa.chunked_array([[0.0, 1.0, 2.0]])
+
+    geometry, _ = _geoparquet.point_columns(lon, lon)
+
+    assert geometry.type == pa.large_binary()
+    assert [np.frombuffer(value, dtype=_geoparquet._WKB_POINT)[0]["x"] for value in geometry.to_pylist()] == [0.0, 1.0, 2.0]
+
+
+def _points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lon = rng.uniform(-180, 180, n)
+    lat = rng.uniform(-90, 90, n)
+    lon[::7] = np.nan
+    return pa.table({"id": np.arange(n), "lon": pa.array(lon, from_pandas=True), "lat": lat})
+
+
+def test_write_sorted_geoparquet_matches_in_memory_order(tmp_path):
+    from pyarrow import parquet as pq
+
+    table = _points(1000)
+    path = str(tmp_path / "sorted.parquet")
+
+    # Small buckets force the out-of-core path with many spill files
+    _geoparquet.write_sorted_geoparquet(table.schema, table.to_batches(max_chunksize=64), path, "lon", "lat", max_sort_rows=100, row_group_size=128)
+
+    result = pq.read_table(path)
+    expected = _geoparquet.spatial_order(table["lon"], table["lat"])
+    assert result["id"].to_numpy().tolist() == expected.tolist()
+    assert result["lon"].null_count == len(range(0, 1000, 7))
+    assert result["lon"].to_pandas().iloc[-result["lon"].null_count:].isna().all()
+
+    metadata = pq.ParquetFile(path).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [128] * 7 + [104]
+    geo = json.loads(metadata.metadata[b"geo"])
+    assert geo["columns"]["geometry"]["covering"]["bbox"]["xmin"] == ["bbox", "xmin"]
+    assert list(tmp_path.iterdir()) == [tmp_path / "sorted.parquet"]
+
+
+def test_write_sorted_geoparquet_without_points(tmp_path):
+    from pyarrow import parquet as pq
+
+    table = pa.table({"lon": pa.array([None, None], pa.float64()), "lat": [1.0, 2.0]})
+    path = str(tmp_path / "empty.parquet")
+
+    _geoparquet.write_sorted_geoparquet(table.schema, table.to_batches(), path, "lon", "lat", max_sort_rows=1)
+
+    result = pq.read_table(path)
+    assert result["lat"].to_pylist() == [1.0, 2.0]
+    assert "bbox" not in json.loads(result.schema.metadata[b"geo"])["columns"]["geometry"]
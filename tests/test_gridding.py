@@ -0,0 +1,87 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from beacon_api.query._gridding import factorize, grid_batches, grid_table
+
+DIMS = ["STATION", "TIME"]
+
+
+@pytest.fixture
+def dense_table():
+    return pa.table({
+        "STATION": ["B", "A", "B", "A"],
+        "TIME": pa.array([2, 1, 1, 2], pa.int64()),
+        "COUNT": pa.array([4, 1, 3, 2], pa.int32()),
+    })
+
+
+def coordinates(table):
+    return {dim: factorize(table[dim])[0] for dim in DIMS}
+
+
+def test_factorize_sorts_values():
+    values, codes = factorize(pa.chunked_array([["b", "a"], ["c", "a"]]))
+
+    assert values.to_pylist() == ["a", "b", "c"]
+    assert codes.tolist() == [1, 0, 2, 0]
+
+
+def test_dense_grid_keeps_dtypes(dense_table):
+    ds = grid_table(dense_table, DIMS)
+
+    assert ds["COUNT"].dtype == np.int32
+    assert ds["STATION"].values.tolist() == ["A", "B"]
+    assert ds["COUNT"].values.tolist() == [[1, 2], [3, 4]]
+
+
+def test_sparse_grid_fills_missing_cells(observations):
+    ds = grid_table(observations, DIMS)
+
+    # The row without a station is dropped; C only has TIME 1
+    assert ds.sizes == {"STATION": 3, "TIME": 3}
+    assert ds["DEPTH"].dtype == np.float64
+    assert np.isnan(ds["TEMP"].sel(STATION="C", TIME=2))
+    assert ds["TEMP"].sel(STATION="B", TIME=3) == 8.0
+
+
+def test_duplicate_cells_are_rejected(dense_table):
+    with pytest.raises(ValueError, match="share the same"):
+        grid_table(pa.concat_tables([dense_table, dense_table]), DIMS)
+
+
+def test_grid_batches_matches_grid_table(observations):
+    table = observations.filter(pa.compute.is_valid(observations["STATION"]))
+    coords = coordinates(table)
+
+    streamed = grid_batches(observations.to_batches(max_chunksize=2), DIMS, coords)
+
+    assert streamed.identical(grid_table(observations, DIMS))
+
+
+def test_grid_batches_dense_keeps_dtypes(dense_table):
+    ds = grid_batches(dense_table.to_batches(max_chunksize=1), DIMS, coordinates(dense_table))
+
+    assert ds.identical(grid_table(dense_table, DIMS))
+
+
+def test_grid_batches_rejects_duplicates_across_batches(dense_table):
+    batches = dense_table.to_batches() + dense_table.slice(0, 1).to_batches()
+
+    with pytest.raises(ValueError, match="share the same"):
+        grid_batches(batches, DIMS, coordinates(dense_table))
+
+
+def test_arrow_engine_streams_json_queries(query, node, observations):
+    ds = query.to_xarray_dataset(DIMS, engine="arrow")
+
+    # One distinct probe per dimension, then the streamed result
+    assert [body.get("distinct") is not None for body in node.queries] == [True, True, False]
+    assert ds.identical(grid_table(observations, DIMS))
+
+
+def test_arrow_engine_reads_sql_results_whole(sql_query, node, observations):
+    ds = sql_query.to_xarray_dataset(DIMS, engine="arrow")
+
+    assert len(node.queries) == 1
+    assert ds.identical(grid_table(observations, DIMS))
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pyarrow as pa
+import pytest
+
+from beacon_api.cache import ContainmentCache
+from beacon_api.query import (
+    AndFilter,
+    EqualsFilter,
+    ExclusiveRangeFilter,
+    FilterIsNull,
+    IsNotNullFilter,
+    OrFilter,
+    RangeFilter,
+)
+from beacon_api.query._local import filter_table, implies
+
+
+@pytest.mark.parametrize("filters, cached, expected", [
+    ([RangeFilter("TIME", gt_eq=2, lt_eq=3)], [RangeFilter("TIME", gt_eq=1, lt_eq=4)], True),
+    ([RangeFilter("TIME", gt_eq=0, lt_eq=3)], [RangeFilter("TIME", gt_eq=1, lt_eq=4)], False),
+    ([EqualsFilter("TIME", eq=4)], [RangeFilter("TIME", gt_eq=1, lt_eq=4)], True),
+    ([RangeFilter("TIME", gt_eq=1, lt_eq=4)], [ExclusiveRangeFilter("TIME", gt=1, lt=5)], False),
+    ([ExclusiveRangeFilter("TIME", gt=1, lt=4)], [RangeFilter("TIME", gt_eq=1, lt_eq=4)], True),
+    ([RangeFilter("TIME", gt_eq=1)], [RangeFilter("TIME", gt_eq=1, lt_eq=4)], False),
+    # Bounding boxes written as nested AndFilters
+    ([AndFilter([RangeFilter("LON", gt_eq=0, lt_eq=5), RangeFilter("LAT", gt_eq=50, lt_eq=55)])],
+     [AndFilter([RangeFilter("LON", gt_eq=-10, lt_eq=10), RangeFilter("LAT", gt_eq=40, lt_eq=60)])], True),
+    # ISO strings and datetimes compare as times, unless one is naive and the other not
+    ([RangeFilter("TIME", gt_eq=datetime(2020, 6, 1), lt_eq=datetime(2020, 7, 1))],
+     [RangeFilter("TIME", gt_eq="2020-01-01T00:00:00", lt_eq="2021-01-01T00:00:00")], True),
+    ([RangeFilter("TIME", gt_eq=datetime(2020, 6, 1), lt_eq=datetime(2020, 7, 1))],
+     [RangeFilter("TIME", gt_eq="2020-01-01T00:00:00Z", lt_eq="2021-01-01T00:00:00Z")], False),
+    # Other filters must reappear unchanged
+    ([IsNotNullFilter("TEMP"), RangeFilter("TIME", gt_eq=2)], [IsNotNullFilter("TEMP")], True),
+    ([RangeFilter("TIME", gt_eq=2)], [IsNotNullFilter("TEMP")], False),
+    ([RangeFilter("TIME", gt_eq="a")], [RangeFilter("TIME", gt_eq=1)], False),
+    ([RangeFilter("TIME", gt_eq=2)], [], True),
+])
+def test_implies(filters, cached, expected):
+    assert implies(filters, cached) is expected
+
+
+def test_filter_table_evaluates_filter_trees(observations):
+    filters = [OrFilter([EqualsFilter("STATION", eq="A"), FilterIsNull("STATION")]), RangeFilter("TIME", gt_eq=2)]
+
+    result = filter_table(observations, filters)
+
+    assert result["TIME"].to_pylist() == [2, 4]
+
+
+def test_filter_table_drops_null_comparisons(observations):
+    assert filter_table(observations, [RangeFilter("TEMP", lt_eq=10.0)])["TEMP"].to_pylist() == [9.5, 8.0, 7.0]
+
+
+@pytest.fixture
+def containment(session):
+    session.containment_cache = ContainmentCache()
+    return session.containment_cache
+
+
+def test_narrower_query_is_answered_locally(query, node, containment, observations):
+    wide = query._copy()
+    wide.add_filter(RangeFilter("TIME", gt_eq=1, lt_eq=4))
+    wide.to_pandas_dataframe()
+    narrow = query._copy()
+    narrow.add_filter(RangeFilter("TIME", gt_eq=2, lt_eq=3))
+
+    df = narrow.to_pandas_dataframe()
+
+    assert len(node.queries) == 1
+    assert sorted(df["TIME"]) == [2, 2, 3]
+    assert (containment.stats().hits, containment.stats().misses) == (1, 1)
+
+
+def test_wider_or_distinct_queries_go_to_the_server(query, node, containment):
+    narrow = query._copy()
+    narrow.add_filter(RangeFilter("TIME", gt_eq=2, lt_eq=3))
+    narrow.to_pandas_dataframe()
+    wide = query._copy()
+    wide.add_filter(RangeFilter("TIME", gt_eq=1, lt_eq=4))
+    wide.to_pandas_dataframe()
+    distinct = narrow._copy()
+    distinct.set_distinct(["STATION"])
+    distinct.to_pandas_dataframe()
+
+    assert len(node.queries) == 3
+    assert containment.stats().hits == 0
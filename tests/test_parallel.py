@@ -0,0 +1,65 @@
+import time
+
+import pyarrow as pa
+import pytest
+
+from beacon_api.query import RangeFilter, _parallel
+
+
+def counting_stream(name, size, produced, closed):
+    def stream():
+        try:
+            for i in range(size):
+                produced[name] = i + 1
+                yield name, i
+        finally:
+            closed.add(name)
+
+    return stream
+
+
+def test_streams_are_yielded_in_submission_order():
+    produced, closed = {}, set()
+    streams = [counting_stream(name, 5, produced, closed) for name in "abc"]
+
+    items = list(_parallel.iter_streams_in_order(streams, max_workers=2, max_buffered=2))
+
+    assert items == [(name, i) for name in "abc" for i in range(5)]
+    assert closed == {"a", "b", "c"}
+
+
+def test_read_ahead_is_bounded():
+    produced, closed = {}, set()
+    streams = [counting_stream(name, 100, produced, closed) for name in "ab"]
+
+    items = _parallel.iter_streams_in_order(streams, max_workers=2, max_buffered=3)
+    assert next(items) == ("a", 0)
+    time.sleep(0.3)
+
+    # Each stream holds at most max_buffered items plus the one waiting to be queued
+    assert produced["a"] <= 5 and produced["b"] <= 4
+    items.close()
+    deadline = time.monotonic() + 2
+    while closed != {"a", "b"} and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert closed == {"a", "b"}
+
+
+def test_stream_errors_reach_the_consumer():
+    def failing():
+        yield 1
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        list(_parallel.iter_streams_in_order([failing], max_workers=1, max_buffered=1))
+
+
+def test_execute_partitioned_streams_all_rows(query, observations):
+    query.add_filter(RangeFilter(column="TIME", gt_eq=1, lt_eq=4))
+
+    batches = list(query.execute_partitioned("TIME", n_partitions=3, max_workers=2, max_rows=2, max_buffered=1))
+
+    assert all(batch.num_rows <= 2 for batch in batches)
+    times = pa.Table.from_batches(batches)["TIME"].to_pylist()
+    assert times == sorted(times)
+    assert sorted(times) == sorted(observations["TIME"].to_pylist())
@@ -0,0 +1,52 @@
+import pyarrow as pa
+import pytest
+
+from beacon_api.query import Parquet
+
+
+def test_iter_batches_yields_fixed_size_batches(query, observations):
+    batches = list(query.iter_batches(max_rows=3))
+
+    assert [batch.num_rows for batch in batches] == [3, 3, 1]
+    assert pa.Table.from_batches(batches).equals(observations)
+
+
+def test_iter_batches_selects_columns(query):
+    batch = next(query.iter_batches(max_rows=10, columns=["TEMP", "TIME"]))
+
+    assert batch.schema.names == ["TEMP", "TIME"]
+
+
+def test_arrow_helpers_ignore_previous_output_format(query, node, observations):
+    # A Parquet export first used to leave the query asking for Parquet
+    query.to_pandas_dataframe()
+    assert isinstance(query.output_format, Parquet)
+
+    assert pa.Table.from_batches(query.iter_batches()).equals(observations)
+    assert query.to_pandas_dataframe(engine="arrow").shape == (observations.num_rows, observations.num_columns)
+    assert node.queries[-1]["output"] == {"format": "arrow"}
+    # The caller's output format is left alone
+    assert isinstance(query.output_format, Parquet)
+
+
+def test_sql_query_streams_arrow(sql_query, observations):
+    sql_query.set_output(Parquet())
+
+    assert sql_query.to_pandas_dataframe(engine="arrow").shape == (observations.num_rows, observations.num_columns)
+
+
+def test_iter_batches_rejects_non_positive_batch_size(query):
+    with pytest.raises(ValueError):
+        next(query.iter_batches(max_rows=0))
+
+
+def test_to_geoparquet_sorts_the_stream(sql_query, tmp_path):
+    from pyarrow import parquet as pq
+
+    path = tmp_path / "sorted.parquet"
+    sql_query.to_geoparquet(str(path), "DEPTH", "TEMP", spatial_sort="hilbert", max_sort_rows=2)
+
+    result = pq.read_table(path)
+    assert result.num_rows == 7
+    assert result["TEMP"][6].as_py() is None
+    assert result.column_names[-2:] == ["geometry", "bbox"]
@@ -0,0 +1,48 @@
+import pyarrow as pa
+import pytest
+
+from beacon_api.query import FilterIsNull
+
+
+def describe(parts):
+    out = []
+    for part in parts:
+        split = part.filters[-1]
+        out.append(None if isinstance(split, FilterIsNull) else (split.gt_eq, split.lt_eq))
+    return out
+
+
+def covered_rows(parts):
+    return pa.concat_tables(part._read_arrow_table() for part in parts)
+
+
+def test_split_into_n_files_balances_keys(query, node, observations):
+    parts = query._split_by_key("STATION", n_files=2)
+
+    assert describe(parts) == [("A", "B"), ("C", "C"), None]
+    # Only the sorted distinct keys were fetched
+    assert node.queries[0]["distinct"] is not None and node.queries[0]["sort_by"]
+    assert covered_rows(parts).sort_by("TIME").equals(observations.sort_by("TIME"))
+
+
+def test_split_by_rows_per_file_keeps_keys_whole(query, observations):
+    parts = query._split_by_key("STATION", rows_per_file=3)
+
+    assert describe(parts) == [("A", "B"), ("C", "C"), None]
+    assert [part._read_arrow_table().num_rows for part in parts] == [5, 1, 1]
+
+
+def test_split_probe_ignores_the_query_distinct(query, node):
+    query.set_distinct(["STATION", "TIME"])
+
+    query._split_by_key("STATION", n_files=3)
+    query._split_by_key("STATION", rows_per_file=2)
+
+    assert node.queries[0]["distinct"]["distinct"]["on"] == ["STATION"]
+    assert node.queries[1]["distinct"] is None
+    assert query.distinct.columns == ["STATION", "TIME"]
+
+
+def test_split_rejects_both_targets(query):
+    with pytest.raises(ValueError):
+        query._split_by_key("STATION", n_files=2, rows_per_file=3)
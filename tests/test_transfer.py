@@ -0,0 +1,14 @@
+from beacon_api.transfer import MultipartFileBody
+
+
+def test_multipart_body_escapes_the_file_name(tmp_path):
+    path = tmp_path / "data.nc"
+    path.write_bytes(b"payload")
+
+    body = MultipartFileBody({"prefix": "/data"}, "file", 'a"b\r\nContent-Type: text/html.nc', str(path))
+    content = b"".join(body)
+
+    assert len(content) == len(body)
+    assert b'filename="a%22b%0D%0AContent-Type: text/html.nc"\r\n' in content
+    assert content.count(b"\r\nContent-Type: ") == 1
+    assert content.endswith(b"payload\r\n--" + body.boundary.encode() + b"--\r\n")
@@ -0,0 +1,115 @@
+import itertools
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+from beacon_api.query import FromTable, JSONQuery, _writers
+
+from conftest import BASE_URL, MockAdapter, MockBeaconNode
+
+xr = pytest.importorskip("xarray")
+zarr = pytest.importorskip("zarr")
+
+
+@pytest.fixture
+def numeric_query(query):
+    return query.add_select_column("TIME").add_select_column("DEPTH").add_select_column("TEMP").add_sort("TIME")
+
+
+def interrupted_after(batches: int):
+    """Make the next Zarr export fail once ``batches`` regions are written"""
+    original = _writers.resumed_batches
+
+    def resumed_batches(*args, **kwargs):
+        yield from itertools.islice(original(*args, **kwargs), batches)
+        raise ConnectionError("connection lost")
+
+    return resumed_batches
+
+
+def test_zarr_store_round_trips(numeric_query, observations, tmp_path):
+    store = str(tmp_path / "out.zarr")
+
+    assert numeric_query.to_zarr(store, chunk_rows=3) == observations.num_rows
+
+    ds = xr.open_zarr(store)
+    expected = observations.sort_by("TIME")
+    np.testing.assert_array_equal(ds["TIME"].values, expected["TIME"].to_numpy())
+    np.testing.assert_array_equal(ds["TEMP"].values, expected["TEMP"].to_numpy(zero_copy_only=False))
+    assert ds.attrs["beacon_complete"] and ds["TEMP"].encoding["chunks"] == (3,)
+
+
+def test_zarr_accepts_a_compressor(numeric_query, tmp_path):
+    if int(zarr.__version__.split(".")[0]) >= 3:
+        compressor = zarr.codecs.BloscCodec(cname="zstd")
+    else:
+        compressor = pytest.importorskip("numcodecs").Blosc(cname="zstd")
+    store = str(tmp_path / "out.zarr")
+
+    numeric_query.to_zarr(store, chunk_rows=3, compressor=compressor)
+
+    assert xr.open_zarr(store)["TEMP"].size == 7
+
+
+def test_zarr_resume_continues_after_last_region(numeric_query, node, observations, tmp_path, monkeypatch):
+    store = str(tmp_path / "out.zarr")
+    with monkeypatch.context() as patch:
+        patch.setattr(_writers, "resumed_batches", interrupted_after(1))
+        with pytest.raises(ConnectionError):
+            numeric_query.to_zarr(store, chunk_rows=3)
+    assert zarr.open_group(store).attrs["beacon_rows_written"] == 3
+
+    assert numeric_query.to_zarr(store, chunk_rows=3, resume=True) == observations.num_rows
+
+    # The server skipped the region that was already written
+    assert node.queries[-1]["offset"] == 3
+    ds = xr.open_zarr(store)
+    np.testing.assert_array_equal(ds["TIME"].values, observations.sort_by("TIME")["TIME"].to_numpy())
+    np.testing.assert_array_equal(ds["index"].values, np.arange(observations.num_rows))
+
+
+def test_zarr_resume_of_a_complete_store_is_a_no_op(numeric_query, node, tmp_path):
+    store = str(tmp_path / "out.zarr")
+    numeric_query.to_zarr(store, chunk_rows=3)
+    requests = len(node.queries)
+
+    assert numeric_query.to_zarr(store, chunk_rows=3, resume=True) == 7
+    assert len(node.queries) == requests
+
+
+def test_netcdf_strings_mark_nulls_with_fill_value(query, observations, tmp_path):
+    path = str(tmp_path / "out.nc")
+
+    query.to_netcdf(path, stream=True, batch_rows=3)
+
+    ds = xr.open_dataset(path)
+    assert ds["STATION"].encoding["_FillValue"] == ""
+    assert ds["STATION"].isnull().values.tolist() == observations["STATION"].is_null().to_pylist()
+    assert np.isnan(ds["TEMP"].values[3])
+
+
+def test_netcdf_string_fill_value_can_be_overridden(query, tmp_path):
+    netCDF4 = pytest.importorskip("netCDF4")
+    path = str(tmp_path / "out.nc")
+
+    query.to_netcdf(path, stream=True, encoding={"STATION": {"fill_value": "N/A"}})
+
+    with netCDF4.Dataset(path) as nc:
+        assert nc["STATION"].getncattr("_FillValue") == "N/A"
+        assert nc["STATION"][:].tolist()[-1] == "N/A"
+
+
+def test_parquet_dataset_partitions_by_time_parts(session, tmp_path):
+    table = pa.table({"TIME": pa.array([0, 40 * 86400, 400 * 86400], pa.timestamp("s")), "TEMP": [1.0, 2.0, 3.0]})
+    session.mount(BASE_URL, MockAdapter(MockBeaconNode(table)))
+    query = JSONQuery(http_session=session, _from=FromTable(table="observations"))
+    root = tmp_path / "dataset"
+
+    query.to_parquet_dataset(str(root), time_column="TIME")
+
+    assert sorted(path.relative_to(root).parent.as_posix() for path in root.rglob("*.parquet")) == [
+        "year=1970/month=1", "year=1970/month=2", "year=1971/month=2",
+    ]
+    assert ds.dataset(str(root), partitioning="hive").to_table().num_rows == 3